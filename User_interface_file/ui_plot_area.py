@@ -1,17 +1,61 @@
 from tkinter import ttk
+import queue
+import threading
 import tkinter as tk
-import pandas as pd
-import openpyxl
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from calculation_file_module.calculation_plot_file import plot_ellingham_diagram
+import tkinter.messagebox
+
+# openpyxl, matplotlib and the calculation modules are imported on first use so the
+# window can appear before any of them is loaded.
+
+# How often the window checks for finished reactions, and how many it draws per check
+POLL_INTERVAL_MS = 50
+MESSAGES_PER_POLL = 20
+
+SPECIES_DATABASE_PATH = 'chemical_species_data_base.json'  # Update with your file path for delta G calculation
+
+# Species suggested at most while typing a reaction
+SUGGESTION_ROWS = 8
+
+# Delta G = 0 temperatures listed at most under the temperature inputs
+EQUILIBRIUM_READOUT_LINES = 4
+
+# Formats offered by the Export button; CSV, Parquet and NPZ are written in chunks
+EXPORT_FILE_TYPES = [
+    ("Excel workbook", "*.xlsx"),
+    ("CSV", "*.csv"),
+    ("Parquet (needs pyarrow)", "*.parquet"),
+    ("NumPy archive", "*.npz"),
+]
 
 
 def create_ui(root):
 
+    plot_areas = {}
+
+    # The running CalculationJob and the Ellingham plot its curves are drawn on
+    calculation = {}
+    # The SessionResultStore holding the latest calculation's results
+    session = {}
+    # The SpeciesSearchIndex behind the suggestions, once the loader thread has built it
+    species_search = {}
+    # Suggestions on show and the (start, end) of the species text they would replace
+    suggestions = {"items": [], "span": (0, 0)}
+
+    def get_result_store():
+        if "store" not in session:
+            from calculation_file_module.result_store import SessionResultStore
+
+            session["store"] = SessionResultStore()
+        return session["store"]
 
     def calculate():
         try:
+            from calculation_file_module.background_calculation import CalculationJob
+            from calculation_file_module.calculation_plot_file import ellingham_plot
+            import numpy as np
+
+            canvas_1, canvas_2 = create_plot_areas()
+
             reaction_equations = (
                 reaction_entry.get().strip().split(",")
             )  # Split by commas
@@ -19,57 +63,316 @@ def create_ui(root):
             temperature_to = float(to_temp_entry.get().strip())
             temperature_step = int(step_temp_entry.get().strip())
 
-            file_path = (
-                'chemical_species_data_base.json'  # Update with your file path for delta G calculation
-            )
-            
-            s = plot_ellingham_diagram(
-                file_path,
-                reaction_equations,
-                temperature_from,
-                temperature_to,
-                temperature_step,
-                canvas_2
-            )
-
-            plot_data('Heat Capacity')
-
-            path = "data_from_calculation.xlsx"
-            workbook = openpyxl.load_workbook(path)
-            sheet = workbook.active
-            list_values = list(sheet.values)
-            print(list_values)
+            file_path = SPECIES_DATABASE_PATH
+
+            # Species the database lacks would be skipped; offer the closest ones instead
+            if not confirm_species(reaction_equations):
+                return
+
+            # A new calculation replaces one still running
+            if calculation.get("job") is not None:
+                calculation["job"].cancel()
+
+            temperatures = np.linspace(temperature_from, temperature_to, temperature_step)
+            # Adaptive sampling uses Step as the most points a curve may have
+            job = CalculationJob(file_path, reaction_equations, temperatures, adaptive=adaptive_var.get())
+            get_result_store().clear()
+            # Reactions calculated again keep their curves, which are updated in place
+            plot = ellingham_plot(canvas_2)
+            plot.retain(job.reaction_equations)
+            plot.set_overlay()
+            plot.redraw()
+            calculation.update(job=job, plot=plot, equilibria={}, points=[], index=None)
+            equilibrium_label.configure(text="")
+            stable_label.configure(text="")
+
+            progress_bar.configure(maximum=max(len(job), 1), value=0)
+            progress_label.configure(text=f"0 / {len(job)}")
+            calculate_button.state(["disabled"])
+            cancel_button.state(["!disabled"])
+
+            job.start()
+            frame.after(POLL_INTERVAL_MS, poll_calculation, job)
         except ValueError:
             tk.messagebox.showerror("Input Error", "Please enter valid numerical values for temperature.")
         except Exception as e:
             tk.messagebox.showerror("Error", str(e))
 
+    def poll_calculation(job):
+        from calculation_file_module.background_calculation import EQUILIBRIUM, REACTION, FINISHED
+        from calculation_file_module.calculation_plot_file import plot_reaction_curve
+
+        if calculation.get("job") is not job:
+            return  # Replaced by a newer calculation
+
+        plot = calculation["plot"]
+        plotted = False
+        # Handle a bounded number of messages per tick so the window stays responsive
+        for _ in range(MESSAGES_PER_POLL):
+            try:
+                kind, position, payload = job.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == REACTION:
+                get_result_store().add_batch(payload)
+                plot_reaction_curve(plot, payload, 0)
+                plotted = True
+                progress_bar.configure(value=position + 1)
+                progress_label.configure(text=f"{position + 1} / {len(job)}")
+                if job.adaptive and payload.labels[0] is not None:
+                    calculation["points"].append(payload.temperatures.size)
+                continue
+            if kind == EQUILIBRIUM:
+                calculation["equilibria"][job.reaction_equations[position]] = payload
+                show_equilibria()
+                continue
+
+            end_calculation(kind == FINISHED, payload)
+            return
+
+        if plotted:
+            plot.redraw()
+        frame.after(POLL_INTERVAL_MS, poll_calculation, job)
+
+    def end_calculation(finished, error_message):
+        calculation["job"] = None
+        # Drop curves left from an earlier calculation that this one did not reach
+        plot = calculation["plot"]
+        plot.retain(result.equation for result in get_result_store().results())
+        annotate_crossings(plot)
+        plot.redraw()
+
+        calculate_button.state(["!disabled"])
+        cancel_button.state(["disabled"])
+
+        if error_message is not None:
+            progress_label.configure(text="Failed")
+            tk.messagebox.showerror("Error", error_message)
+            return
+        if not finished:
+            progress_label.configure(text="Cancelled")
+            return
+
+        points = calculation["points"]
+        if points:
+            progress_label.configure(text=f"Done, {min(points)}-{max(points)} points per curve")
+        else:
+            progress_label.configure(text="Done")
+        if len(get_result_store()):
+            plot_data('Heat Capacity')
+
+    def show_equilibria():
+        lines = [
+            f"{equation}: ΔG = 0 at {root.temperature:.3f} K "
+            f"(spontaneous {'above' if root.spontaneous_above else 'below'})"
+            for equation, roots in calculation["equilibria"].items()
+            for root in roots
+        ]
+        if not lines:
+            lines = ["ΔG does not cross 0 in the temperature range"]
+        if len(lines) > EQUILIBRIUM_READOUT_LINES:
+            hidden = len(lines) - EQUILIBRIUM_READOUT_LINES + 1
+            lines = lines[:EQUILIBRIUM_READOUT_LINES - 1] + [f"... and {hidden} more"]
+        equilibrium_label.configure(text="\n".join(lines))
+
+    def annotate_crossings(plot):
+        from calculation_file_module.calculation_plot_file import annotate_ellingham
+        from calculation_file_module.ellingham_analysis import EllinghamIndex
+
+        # Whatever was calculated, also after a cancel or failure
+        index = EllinghamIndex.from_results(get_result_store().results())
+        calculation["index"] = index
+        annotate_ellingham(plot, index)
+        if len(index) > 1:
+            stable_label.configure(
+                text=f"{len(index.crossings)} crossing(s); point at the diagram for the most stable reaction"
+            )
+
+    def show_most_stable(event):
+        index = calculation.get("index")
+        if index is None or event.inaxes is None or event.xdata is None:
+            return
+        equation = index.most_stable(event.xdata)
+        if equation is None:
+            return
+        stable_label.configure(
+            text=f"Most stable at {event.xdata:.0f} K: {index.label(equation)} "
+                 f"(ΔG = {index.delta_G(equation, event.xdata):.1f})"
+        )
+
+    def cancel_calculation():
+        if calculation.get("job") is not None:
+            calculation["job"].cancel()
+            progress_label.configure(text="Cancelling after the current reaction...")
+            cancel_button.state(["disabled"])
+
     def plot_data(data_column):
-         # Read the data
-        df = pd.read_excel("data_from_calculation.xlsx")
-
-        # Optional: Generate a standalone plot and save it (if needed)
-        plt.figure(figsize=(7, 8.2))
-        plt.plot(df['Temperature (K)'], df[data_column], linestyle='-')
-        plt.xlabel('Temperature (K)')
-        plt.ylabel(data_column)
-        plt.title(f'Plot of {data_column} vs Temperature')
-        #plt.savefig(f"{data_column}_plot.png")  # Save if required
-        plt.close()  # Close the standalone plot
-
-        # Calculate min and max values for y-axis limits
-        min_value = df[data_column].min()
-        max_value = df[data_column].max()
-
-        # Clear the previous plot on canvas_1
-        canvas_1.figure.clf()  # Clear previous figure from canvas
-        ax = canvas_1.figure.add_subplot(111)  # Add a new subplot
-        ax.plot(df['Temperature (K)'], df[data_column], linestyle='-')  # Plot on canvas
-        ax.set_xlabel('Temperature (K)')
-        ax.set_ylabel(data_column)
-        ax.set_title(f'Plot of {data_column} vs Temperature')
-        ax.set_ylim(min_value - 50, max_value + 50)  # Set y-axis limits
-        canvas_1.draw()  # Update the canvas with the new plot
+        from calculation_file_module.plot_manager import curve_plot_for
+
+        canvas_1, canvas_2 = create_plot_areas()
+
+        # Results come straight from memory; nothing is read back from disk
+        results = get_result_store().results()
+        if not results:
+            tk.messagebox.showinfo("No results", "Calculate a reaction first.")
+            return
+
+        # Curves keep their artists between buttons; only their data and the titles change
+        plot = curve_plot_for(canvas_1, data_column, f'Plot of {data_column} vs Temperature', label_curves=False)
+        plot.retain(result.equation for result in results)
+        for result in results:
+            plot.set_curve(result.equation, result.temperatures, result.column(data_column), result.label)
+        plot.redraw()
+
+    def export_results():
+        from tkinter import filedialog
+        from calculation_file_module.result_store import DEFAULT_EXPORT_PATH, export_results_async
+
+        if not len(get_result_store()):
+            tk.messagebox.showinfo("No results", "Calculate a reaction first.")
+            return
+
+        path = filedialog.asksaveasfilename(
+            parent=root,
+            initialfile=DEFAULT_EXPORT_PATH,
+            defaultextension=".xlsx",
+            filetypes=EXPORT_FILE_TYPES,
+        )
+        if not path:
+            return
+
+        # The file is written on a background thread; the window only checks when it is done
+        export_button.state(["disabled"])
+        future = export_results_async(get_result_store(), path)
+        frame.after(POLL_INTERVAL_MS, poll_export, future)
+
+    def poll_export(future):
+        if not future.done():
+            frame.after(POLL_INTERVAL_MS, poll_export, future)
+            return
+        export_button.state(["!disabled"])
+        try:
+            path = future.result()
+        except Exception as e:
+            tk.messagebox.showerror("Export Error", str(e))
+            return
+        tk.messagebox.showinfo("Export", f"Results written to {path}")
+
+    def load_species_search():
+        # The database is parsed and indexed off the Tk thread; suggestions start once it is ready
+        def load():
+            from data_process_file.species_repository import get_species_repository
+            from data_process_file.species_search import search_index_for
+
+            repository = get_species_repository(SPECIES_DATABASE_PATH)
+            if repository is not None:
+                species_search["search"] = search_index_for(repository.index)
+
+        if "loader" not in species_search:
+            species_search["loader"] = threading.Thread(target=load, daemon=True)
+            species_search["loader"].start()
+
+    def confirm_species(reaction_equations):
+        if "search" not in species_search:
+            return True  # Still loading; the engine reports missing species itself
+        from data_process_file.species_repository import get_species_repository
+        from data_process_file.species_search import format_suggestions, missing_species
+
+        repository = get_species_repository(SPECIES_DATABASE_PATH)
+        missing = missing_species(repository.index, reaction_equations) if repository is not None else []
+        if not missing:
+            return True
+        lines = [
+            f"{formula}({phase}) is not in the database.{format_suggestions(candidates)}"
+            for formula, phase, candidates in missing
+        ]
+        return tk.messagebox.askyesno(
+            "Species not found", "\n".join(lines) + "\n\nCalculate anyway? Reactions with missing species are skipped."
+        )
+
+    def species_span():
+        # The species under the cursor: from the last "+", "=" or "," before it, past any
+        # spaces and coefficient, up to the cursor (typed) and to the next separator (replaced)
+        text = reaction_entry.get()
+        cursor = reaction_entry.index(tk.INSERT)
+        start = max(text.rfind(separator, 0, cursor) for separator in "+=,") + 1
+        while start < cursor and (text[start].isspace() or text[start].isdigit()):
+            start += 1
+        following = [text.find(separator, cursor) for separator in "+=,"]
+        end = min([position for position in following if position != -1], default=len(text))
+        while end > cursor and text[end - 1].isspace():
+            end -= 1
+        return text[start:cursor], start, end
+
+    def update_suggestions(event):
+        search = species_search.get("search")
+        if search is None or event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        typed, start, end = species_span()
+        items = []
+        if typed.strip():
+            items = [f"{formula}({phase})" for formula, phase in search.complete(typed, SUGGESTION_ROWS)]
+            if not items and "(" not in typed:
+                # Nothing starts with what was typed: offer formulas one typo away
+                items = [
+                    f"{formula}({phase})"
+                    for _, formula in search.similar(typed, SUGGESTION_ROWS, max_distance=1)
+                    for phase in search.phases(formula)
+                ][:SUGGESTION_ROWS]
+        if not items or items == [typed.strip()]:
+            hide_suggestions()
+            return
+
+        suggestions.update(items=items, span=(start, end))
+        suggestion_list.delete(0, tk.END)
+        suggestion_list.insert(tk.END, *items)
+        suggestion_list.configure(height=len(items))
+        # Line the popup up with the start of the species being typed
+        box = reaction_entry.bbox(start)
+        x = reaction_entry.winfo_rootx() + (box[0] if box else 0)
+        y = reaction_entry.winfo_rooty() + reaction_entry.winfo_height()
+        suggestion_popup.geometry(f"+{x}+{y}")
+        suggestion_popup.deiconify()
+        suggestion_popup.lift()
+
+    def hide_suggestions(event=None):
+        suggestions["items"] = []
+        suggestion_popup.withdraw()
+
+    def focus_suggestions(event):
+        if not suggestions["items"]:
+            return None
+        suggestion_list.focus_set()
+        suggestion_list.selection_clear(0, tk.END)
+        suggestion_list.selection_set(0)
+        suggestion_list.activate(0)
+        return "break"
+
+    def accept_suggestion(event=None):
+        selection = suggestion_list.curselection()
+        if selection:
+            value = suggestion_list.get(selection[0])
+            start, end = suggestions["span"]
+            reaction_entry.delete(start, end)
+            reaction_entry.insert(start, value)
+            reaction_entry.icursor(start + len(value))
+        hide_suggestions()
+        reaction_entry.focus_set()
+        return "break"
+
+    def dismiss_suggestions(event):
+        hide_suggestions()
+        reaction_entry.focus_set()
+        return "break"
+
+    def hide_suggestions_unless_focused(event=None):
+        try:
+            focused = root.focus_get()
+        except KeyError:
+            focused = None
+        if focused not in (reaction_entry, suggestion_list):
+            hide_suggestions()
 
     frame = ttk.Frame(root)
     frame.pack()
@@ -81,6 +384,23 @@ def create_ui(root):
     reaction_entry.insert(0, "H2O(g) = H2(g) + O2(g)")
     reaction_entry.grid(row=0, column=0, padx=5, pady=(0, 5), columnspan=3, sticky="ew")
 
+    # Species suggestions pop up under the entry while typing; Down moves into them and
+    # Return or a double click puts the chosen species in place of the typed one
+    suggestion_popup = tk.Toplevel(root)
+    suggestion_popup.withdraw()
+    suggestion_popup.overrideredirect(True)
+    suggestion_list = tk.Listbox(suggestion_popup, width=30, exportselection=False)
+    suggestion_list.pack(fill=tk.BOTH, expand=True)
+
+    reaction_entry.bind("<KeyRelease>", update_suggestions)
+    reaction_entry.bind("<Down>", focus_suggestions)
+    reaction_entry.bind("<Escape>", hide_suggestions)
+    reaction_entry.bind("<FocusOut>", lambda event: frame.after(100, hide_suggestions_unless_focused))
+    suggestion_list.bind("<Return>", accept_suggestion)
+    suggestion_list.bind("<Double-Button-1>", accept_suggestion)
+    suggestion_list.bind("<Escape>", dismiss_suggestions)
+    suggestion_list.bind("<FocusOut>", lambda event: frame.after(100, hide_suggestions_unless_focused))
+
     # Temperature Frame
     temperature_frame = ttk.LabelFrame(frame, text="Temperature")
     temperature_frame.grid(row=0, column=1, padx=(5, 10), pady=5, sticky='nwes')
@@ -109,6 +429,30 @@ def create_ui(root):
     calculate_button = ttk.Button(temperature_frame, text="Calculate", command=calculate, width= 20)
     calculate_button.grid(row=0, column=6, padx=(20 , 1))
 
+    # Sample each curve densely only where it bends; Step becomes the most points per curve
+    adaptive_var = tk.BooleanVar(value=False)
+    adaptive_check = ttk.Checkbutton(temperature_frame, text="Adaptive", variable=adaptive_var)
+    adaptive_check.grid(row=0, column=7, padx=(10, 5))
+
+    # Progress of the running calculation
+    progress_bar = ttk.Progressbar(temperature_frame, mode="determinate")
+    progress_bar.grid(row=1, column=0, columnspan=4, padx=7, pady=(0, 5), sticky="ew")
+
+    progress_label = ttk.Label(temperature_frame, text="", font=("Helvetica", 11))
+    progress_label.grid(row=1, column=4, columnspan=2, padx=5, pady=(0, 5))
+
+    cancel_button = ttk.Button(temperature_frame, text="Cancel", command=cancel_calculation, width= 20)
+    cancel_button.grid(row=1, column=6, padx=(20 , 1), pady=(0, 5))
+    cancel_button.state(["disabled"])
+
+    # Temperatures where each calculated reaction's Delta G crosses zero
+    equilibrium_label = ttk.Label(temperature_frame, text="", font=("Helvetica", 10), justify="left")
+    equilibrium_label.grid(row=2, column=0, columnspan=7, padx=7, pady=(0, 5), sticky="w")
+
+    # The reaction lowest on the Ellingham diagram at the temperature under the pointer
+    stable_label = ttk.Label(temperature_frame, text="", font=("Helvetica", 10), justify="left")
+    stable_label.grid(row=3, column=0, columnspan=7, padx=7, pady=(0, 5), sticky="w")
+
     # Button Plot Area frame
     cmean_frame = ttk.LabelFrame(frame, text="Plot Buttons", padding=1)
     cmean_frame.grid(row=1, column=0, padx=(0, 4), pady=5 )
@@ -119,12 +463,15 @@ def create_ui(root):
     calculate_button_h = ttk.Button(cmean_frame, text="Cp(J/(mol*K))", command=lambda: plot_data('Heat Capacity'), width=18)
     calculate_button_h.grid(row=0, column=1, padx=20, pady=(1, 1))
 
-    calculate_button_s = ttk.Button(cmean_frame, text="S°298", command=lambda: plot_data('S°298'), width=18)
+    calculate_button_s = ttk.Button(cmean_frame, text="S°298", command=lambda: plot_data('Entropy'), width=18)
     calculate_button_s.grid(row=0, column=2, padx=20, pady=(1, 1))
 
-    calculate_button_cp = ttk.Button(cmean_frame, text="H°298", command=lambda: plot_data('H°298'), width=18)
+    calculate_button_cp = ttk.Button(cmean_frame, text="H°298", command=lambda: plot_data('Enthalpy'), width=18)
     calculate_button_cp.grid(row=0, column=3, padx=20, pady=(1, 1))
 
+    export_button = ttk.Button(cmean_frame, text="Export", command=export_results, width=10)
+    export_button.grid(row=0, column=4, padx=(0, 10), pady=(1, 1))
+
     # Graph area frame 1
     graph_area_frame_1 = ttk.LabelFrame(frame, text="Cp , S , H plot Area", padding=2)
     graph_area_frame_1.grid(row=2, column=0, ipadx=1, pady=5, padx=(5, 10), sticky='nswe')
@@ -138,16 +485,6 @@ def create_ui(root):
     graph_area_frame_1.rowconfigure(0, weight=1)
     graph_area_frame_1.columnconfigure(0, weight=10)
 
-    fig_1, ax = plt.subplots(figsize=(7, 8.1))
-    canvas_1 = FigureCanvasTkAgg(fig_1, master=graph_frame_1)
-    canvas_1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-    # Pre-label the plot
-    plt.xlabel("Temperature (K)")
-    plt.ylabel("Heat Capacity")
-    plt.title("Plot of Heat Capacity vs Temperature")
-    plt.axhline(y=0, color="k", linestyle="-", linewidth=0.5)
-
     # Graph area frame 2
     graph_area_frame_2 = ttk.LabelFrame(frame, text="Ellingham Diagram Plot", padding=2)
     graph_area_frame_2.grid(row=1, column=1, rowspan=200, padx=(1, 5), pady=(5, 10), sticky="nswe")
@@ -155,11 +492,36 @@ def create_ui(root):
     graph_frame_2 = tk.Frame(graph_area_frame_2)
     graph_frame_2.grid(row=0, column=0, padx=(1, 5), pady=1, sticky="nswe")
 
-    fig_2, ax = plt.subplots(figsize=(7, 8.2))
-    canvas_2 = FigureCanvasTkAgg(fig_2, master=graph_frame_2)
-    canvas_2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-    plt.xlabel("Temperature (K)")
-    plt.ylabel("Delta G (kJ/mol)")
-    plt.title("Plot of Delta G vs Temperature")
-    plt.axhline(y=0, color="k", linestyle="-", linewidth=0.5)
\ No newline at end of file
+    def create_plot_areas():
+        # matplotlib (and numpy with it) is imported here, once the window is already on screen
+        if not plot_areas:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            from calculation_file_module.calculation_plot_file import ellingham_plot
+            from calculation_file_module.plot_manager import curve_plot_for
+
+            fig_1 = Figure(figsize=(7, 8.1))
+            canvas_1 = FigureCanvasTkAgg(fig_1, master=graph_frame_1)
+            canvas_1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+            fig_2 = Figure(figsize=(7, 8.2))
+            canvas_2 = FigureCanvasTkAgg(fig_2, master=graph_frame_2)
+            canvas_2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+            # Pre-label the plots; their curves are added and updated in place later
+            curve_plot_for(canvas_1, "Heat Capacity", "Plot of Heat Capacity vs Temperature", label_curves=False)
+            ellingham_plot(canvas_2)
+            # Reading the lowest curve is one binary search, cheap enough for every mouse move
+            canvas_2.mpl_connect("motion_notify_event", show_most_stable)
+
+            plot_areas["canvas_1"] = canvas_1
+            plot_areas["canvas_2"] = canvas_2
+        return plot_areas["canvas_1"], plot_areas["canvas_2"]
+
+    def on_first_map(event):
+        if event.widget is frame and not plot_areas:
+            # Let Tk paint the window before the plotting stack is imported
+            frame.after_idle(create_plot_areas)
+            frame.after_idle(load_species_search)
+
+    frame.bind("<Map>", on_first_map, add="+")
@@ -0,0 +1,164 @@
+"""
+Benchmark adaptive temperature sampling against uniform grids of Ellingham curves.
+
+Run from the repository root:
+
+    python benchmarks/benchmark_adaptive_sampling.py --reactions 50 --tolerance 0.01
+
+Every synthetic reaction is sampled with sample_reaction and its curve compared, by
+linear interpolation, with a --reference-points sweep. For the error that reached, the
+smallest uniform grid doing as well is found by bisection. Reported are the points and
+time of both and the largest error of each. The metal of every oxidation is written
+"M(*)" and given a liquid and a gas that take over inside the range, so the curves have
+the kinks of a real Ellingham diagram; --no-phase-changes keeps the solid-only curves,
+which bend only where a heat capacity range ends.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic_data import generate_reactions, synthetic_species_rows, write_species_database  # noqa: E402
+from calculation_file_module.adaptive_sampling import (  # noqa: E402
+    DEFAULT_INITIAL_POINTS,
+    DEFAULT_MAX_POINTS,
+    sample_reaction,
+)
+from calculation_file_module.equilibrium_solver import reaction_evaluator  # noqa: E402
+from data_process_file.species_repository import get_species_repository  # noqa: E402
+
+
+def with_phase_changes(reactions, rows, temperature_from, temperature_to, seed=0):
+    """
+    Make the metal of every oxidation "M(*)" and add a liquid and a gas for it.
+
+    Returns:
+        tuple: (reactions, rows) with melting and boiling points drawn inside the range.
+    """
+    rng = random.Random(seed)
+    metals = set()
+    changed = []
+    for reaction in reactions:
+        match = re.match(r"(\w+)\(s\) \+ O2\(g\) = ", reaction)
+        if match:
+            metals.add(match.group(1))
+            reaction = f"{match.group(1)}(*)" + reaction[len(match.group(1)) + 3:]
+        changed.append(reaction)
+
+    rows = list(rows)
+    span = temperature_to - temperature_from
+    for row in list(rows):
+        if row["Formula"] in metals and row["Phase"] == "s":
+            melting = temperature_from + span * rng.uniform(0.1, 0.5)
+            boiling = melting + span * rng.uniform(0.1, 0.4)
+            # Each phase is stable above the temperature where its Gibbs energy crosses the
+            # last one's, i.e. where the added enthalpy in cal equals T times the added entropy
+            rows.append({**row, "Phase": "l", "H 298 (kcal/mol)": row["H 298 (kcal/mol)"] + melting / 1000,
+                         "S 298 (cal/mol*K)": row["S 298 (cal/mol*K)"] + 1})
+            rows.append({**row, "Phase": "g",
+                         "H 298 (kcal/mol)": row["H 298 (kcal/mol)"] + (melting + 2 * boiling) / 1000,
+                         "S 298 (cal/mol*K)": row["S 298 (cal/mol*K)"] + 3})
+    return changed, rows
+
+
+def interpolation_error(evaluate, temperatures, reference_temperatures, reference):
+    """Largest difference between reference and the curve through evaluate at temperatures."""
+    values = np.broadcast_to(evaluate(temperatures)[0], temperatures.shape)
+    return float(np.abs(np.interp(reference_temperatures, temperatures, values) - reference).max())
+
+
+def uniform_points_for(evaluate, temperature_from, temperature_to, error, reference_temperatures, reference):
+    """Return the fewest points of a uniform grid whose interpolation error is at most error."""
+    def error_of(points):
+        return interpolation_error(
+            evaluate, np.linspace(temperature_from, temperature_to, points), reference_temperatures, reference
+        )
+
+    low, high = 2, 4
+    while error_of(high) > error and high < reference_temperatures.size:
+        low, high = high, high * 2
+    high = min(high, reference_temperatures.size)
+    while high - low > 1:
+        middle = (low + high) // 2
+        if error_of(middle) > error:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reactions", type=int, default=50, help="synthetic reactions (default: 50)")
+    parser.add_argument("--from", dest="temperature_from", type=float, default=298, help="range start in K (default: 298)")
+    parser.add_argument("--to", dest="temperature_to", type=float, default=3000, help="range end in K (default: 3000)")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="Delta G tolerance (default: a share of each curve's range)")
+    parser.add_argument("--initial-points", type=int, default=DEFAULT_INITIAL_POINTS,
+                        help=f"starting grid (default: {DEFAULT_INITIAL_POINTS})")
+    parser.add_argument("--max-points", type=int, default=DEFAULT_MAX_POINTS,
+                        help=f"most points per curve (default: {DEFAULT_MAX_POINTS})")
+    parser.add_argument("--reference-points", type=int, default=200_000,
+                        help="points of the reference sweep (default: 200000)")
+    parser.add_argument("--no-phase-changes", dest="phase_changes", action="store_false",
+                        help="keep the metals solid over the whole range")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    reactions = generate_reactions(args.reactions, args.seed)
+    rows = synthetic_species_rows(reactions, seed=args.seed)
+    if args.phase_changes:
+        reactions, rows = with_phase_changes(reactions, rows, args.temperature_from, args.temperature_to, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_species_database(os.path.join(directory, "species.json"), rows)
+        species_index = get_species_repository(path).index
+
+    reference_temperatures = np.linspace(args.temperature_from, args.temperature_to, args.reference_points)
+    adaptive_points = uniform_points = 0
+    adaptive_time = uniform_time = 0.0
+    adaptive_error = uniform_error = 0.0
+    for reaction in reactions:
+        evaluate = reaction_evaluator(species_index, reaction)
+        reference = np.broadcast_to(evaluate(reference_temperatures)[0], reference_temperatures.shape)
+
+        start = time.perf_counter()
+        results = sample_reaction(
+            species_index, reaction, args.temperature_from, args.temperature_to,
+            args.tolerance, args.initial_points, args.max_points,
+        )
+        adaptive_time += time.perf_counter() - start
+        error = float(np.abs(
+            np.interp(reference_temperatures, results.temperatures, results.delta_G[0]) - reference
+        ).max())
+        adaptive_points += results.temperatures.size
+        adaptive_error = max(adaptive_error, error)
+
+        points = uniform_points_for(
+            evaluate, args.temperature_from, args.temperature_to, error, reference_temperatures, reference
+        )
+        temperatures = np.linspace(args.temperature_from, args.temperature_to, points)
+        start = time.perf_counter()
+        evaluate(temperatures)
+        uniform_time += time.perf_counter() - start
+        uniform_points += points
+        uniform_error = max(uniform_error, interpolation_error(evaluate, temperatures, reference_temperatures, reference))
+
+    print(f"{len(reactions)} reactions from {args.temperature_from:g} to {args.temperature_to:g} K")
+    print(f"{'sampling':<10} {'points':>10} {'per curve':>10} {'time ms':>10} {'max error':>12}")
+    for name, points, elapsed, error in (
+        ("adaptive", adaptive_points, adaptive_time, adaptive_error),
+        ("uniform", uniform_points, uniform_time, uniform_error),
+    ):
+        print(f"{name:<10} {points:10d} {points / len(reactions):10.1f} {elapsed * 1000:10.1f} {error:12.4g}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
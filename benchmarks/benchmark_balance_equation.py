@@ -0,0 +1,104 @@
+"""
+Benchmark the integer stoichiometry balancer against the former sympy nullspace path.
+
+Run from the repository root:
+
+    python benchmarks/benchmark_balance_equation.py --count 500
+
+sympy is only needed for the comparison; without it the integer balancer is timed alone.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import generate_reactions  # noqa: E402
+from data_process_file.equation_processor import (  # noqa: E402
+    BalanceError,
+    balance_equation,
+    build_element_matrix,
+    solve_stoichiometry,
+)
+
+
+def _split(reaction):
+    reactants, products = reaction.split("=")
+    return reactants.replace(" ", "").split("+"), products.replace(" ", "").split("+")
+
+
+def sympy_coefficients(element_matrix):
+    """The former balance_equation path: nullspace()[0] scaled by the lcm of its denominators."""
+    from sympy import Matrix
+
+    solution = Matrix(element_matrix).transpose().nullspace()[0]
+    solution = math.lcm(*[int(value.q) for value in solution]) * solution
+    return [int(value) for value in solution]
+
+
+def _time(function, items):
+    start = time.perf_counter()
+    results = [function(item) for item in items]
+    return time.perf_counter() - start, results
+
+
+def _balance_or_none(reaction):
+    try:
+        return balance_equation(reaction)
+    except BalanceError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=500, help="number of reactions (default: 500)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    reactions = generate_reactions(args.count, args.seed)
+    matrices = [build_element_matrix(*_split(reaction)) for reaction in reactions]
+
+    def integer_path(matrix):
+        try:
+            return solve_stoichiometry(matrix)
+        except BalanceError:
+            return None
+
+    integer_time, integer_results = _time(integer_path, matrices)
+    full_time, _ = _time(lambda reaction: _balance_or_none(reaction), reactions)
+    balanced = sum(result is not None for result in integer_results)
+
+    print(f"{len(reactions)} reactions, {balanced} uniquely balanceable")
+    print(f"integer balancer (matrix only):   {integer_time * 1000:9.2f} ms")
+    print(f"balance_equation (parse + solve): {full_time * 1000:9.2f} ms")
+
+    try:
+        import sympy  # noqa: F401
+    except ImportError:
+        print("sympy is not installed; skipping the comparison")
+        return 0
+
+    def sympy_path(matrix):
+        try:
+            return sympy_coefficients(matrix)
+        except IndexError:
+            return None
+
+    sympy_time, sympy_results = _time(sympy_path, matrices)
+    print(f"sympy nullspace (matrix only):    {sympy_time * 1000:9.2f} ms  ({sympy_time / integer_time:.0f}x slower)")
+
+    mismatches = [
+        reaction
+        for reaction, ours, theirs in zip(reactions, integer_results, sympy_results)
+        if ours is not None and [abs(value) for value in theirs] != ours
+    ]
+    print(f"coefficient mismatches against sympy: {len(mismatches)}")
+    for reaction in mismatches[:10]:
+        print(f"  {reaction}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
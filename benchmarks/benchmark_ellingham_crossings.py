@@ -0,0 +1,131 @@
+"""
+Benchmark the Ellingham crossing sweep against testing every pair of curves.
+
+Run from the repository root:
+
+    python benchmarks/benchmark_ellingham_crossings.py --reactions 200 --points 500
+
+The Delta G curves of up to --reactions synthetic reactions are calculated on one uniform
+grid and, with --adaptive, on each curve's own adaptive grid. EllinghamIndex finds their
+crossings with its sweep; the pairwise search interpolates every pair of curves onto
+their merged temperatures and looks for sign changes of the difference, in numpy.
+Reported are the time of each, the crossings found, the largest difference between
+their temperatures and the time of 10000 most_stable queries.
+"""
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic_data import generate_reactions, synthetic_species_rows, write_species_database  # noqa: E402
+from calculation_file_module.adaptive_sampling import sample_reaction  # noqa: E402
+from calculation_file_module.batch_engine import calculate_reactions_batch_with_index  # noqa: E402
+from calculation_file_module.ellingham_analysis import COINCIDENT_TOLERANCE, EllinghamIndex  # noqa: E402
+from data_process_file.species_repository import get_species_repository  # noqa: E402
+
+QUERIES = 10_000
+
+
+def pairwise_crossings(curves):
+    """Return the sorted crossing temperatures of every pair of (equation, temperatures, delta_G) curves."""
+    tolerance = COINCIDENT_TOLERANCE * max(float(np.abs(values).max()) for _, _, values in curves)
+    temperatures_found = []
+    for (_, first_temperatures, first_values), (_, second_temperatures, second_values) in itertools.combinations(curves, 2):
+        low = max(first_temperatures[0], second_temperatures[0])
+        high = min(first_temperatures[-1], second_temperatures[-1])
+        temperatures = np.union1d(first_temperatures, second_temperatures)
+        temperatures = temperatures[(temperatures >= low) & (temperatures <= high)]
+        gap = np.interp(temperatures, first_temperatures, first_values) - np.interp(
+            temperatures, second_temperatures, second_values
+        )
+        # Sign changes between neighbouring points, skipping points where the curves touch
+        gap[np.abs(gap) <= tolerance] = 0
+        nonzero = np.flatnonzero(gap != 0)
+        changes = nonzero[:-1][np.sign(gap[nonzero[:-1]]) != np.sign(gap[nonzero[1:]])]
+        for position in changes:
+            following = position + 1
+            if gap[following] == 0:
+                temperatures_found.append(float(temperatures[following]))
+            else:
+                fraction = gap[position] / (gap[position] - gap[following])
+                temperatures_found.append(float(
+                    temperatures[position] + fraction * (temperatures[following] - temperatures[position])
+                ))
+    return sorted(temperatures_found)
+
+
+def run(name, curves, temperature_from, temperature_to):
+    start = time.perf_counter()
+    # Both searches get the curves as they are, double displacements included
+    index = EllinghamIndex(curves, normalize=False)
+    sweep_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairwise = pairwise_crossings(curves)
+    pairwise_time = time.perf_counter() - start
+
+    swept = sorted(crossing.temperature for crossing in index.crossings)
+    difference = (
+        max((abs(a - b) for a, b in zip(swept, pairwise)), default=0.0) if len(swept) == len(pairwise) else float("nan")
+    )
+
+    queries = np.random.default_rng(0).uniform(temperature_from, temperature_to, QUERIES).tolist()
+    start = time.perf_counter()
+    for temperature in queries:
+        index.most_stable(temperature)
+    query_time = time.perf_counter() - start
+
+    points = sum(temperatures.size for _, temperatures, _ in curves)
+    print(
+        f"{name:<10} {points:9d} {sweep_time * 1000:10.1f} {pairwise_time * 1000:12.1f} "
+        f"{len(swept):10d} {len(pairwise):10d} {difference:10.2g} {query_time / QUERIES * 1e6:10.2f}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reactions", type=int, default=200, help="synthetic reactions (default: 200)")
+    parser.add_argument("--points", type=int, default=500, help="points of the uniform grid (default: 500)")
+    parser.add_argument("--from", dest="temperature_from", type=float, default=298, help="range start in K (default: 298)")
+    parser.add_argument("--to", dest="temperature_to", type=float, default=3000, help="range end in K (default: 3000)")
+    parser.add_argument("--adaptive", action="store_true", help="also sample every curve adaptively")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    # Curves are keyed by equation, so a reaction drawn twice would be one curve
+    reactions = list(dict.fromkeys(generate_reactions(args.reactions, args.seed)))
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_species_database(os.path.join(directory, "species.json"), synthetic_species_rows(reactions, seed=args.seed))
+        species_index = get_species_repository(path).index
+
+    temperatures = np.linspace(args.temperature_from, args.temperature_to, args.points)
+    results = calculate_reactions_batch_with_index(species_index, reactions, temperatures)
+    grids = {"uniform": [
+        (equation, results.temperatures, results.delta_G[row])
+        for row, equation in enumerate(results.equations) if results.labels[row] is not None
+    ]}
+    if args.adaptive:
+        grids["adaptive"] = []
+        for reaction in reactions:
+            sampled = sample_reaction(species_index, reaction, args.temperature_from, args.temperature_to)
+            if sampled.labels[0] is not None:
+                grids["adaptive"].append((reaction, sampled.temperatures, sampled.delta_G[0]))
+
+    print(f"{len(grids['uniform'])} curves from {args.temperature_from:g} to {args.temperature_to:g} K")
+    print(
+        f"{'grid':<10} {'points':>9} {'sweep ms':>10} {'pairwise ms':>12} {'sweep':>10} {'pairwise':>10} "
+        f"{'max |dT|':>10} {'query us':>10}"
+    )
+    for name, curves in grids.items():
+        run(name, curves, args.temperature_from, args.temperature_to)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Benchmark finding Delta G = 0 temperatures with the root solver against a dense sweep.
+
+Run from the repository root:
+
+    python benchmarks/benchmark_equilibrium_solver.py --reactions 100 --sweep-points 1000000
+
+Every synthetic reaction is solved with find_equilibrium_temperatures (Brent and Newton)
+and swept on an --sweep-points grid from --from to --to, reading roots off the sweep by
+linear interpolation between sign changes. Reported are the time of each, the Delta G
+evaluations the solver spent refining, and the largest difference between the roots.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic_data import generate_reactions, synthetic_species_rows, write_species_database  # noqa: E402
+from calculation_file_module.equilibrium_solver import (  # noqa: E402
+    DEFAULT_GRID_POINTS,
+    SOLVER_METHODS,
+    find_equilibrium_temperatures,
+    reaction_evaluator,
+)
+from data_process_file.species_repository import get_species_repository  # noqa: E402
+
+
+def sweep_roots(evaluate, temperatures):
+    """Return the Delta G = 0 temperatures of a sweep, interpolated between sign changes."""
+    delta_G = np.broadcast_to(evaluate(temperatures)[0], temperatures.shape)
+    signs = np.sign(delta_G)
+    low = np.flatnonzero(signs[:-1] * signs[1:] < 0)
+    fraction = delta_G[low] / (delta_G[low] - delta_G[low + 1])
+    return list(temperatures[low] + fraction * (temperatures[low + 1] - temperatures[low]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reactions", type=int, default=500, help="synthetic reactions (default: 500)")
+    parser.add_argument("--from", dest="temperature_from", type=float, default=298, help="range start in K (default: 298)")
+    parser.add_argument("--to", dest="temperature_to", type=float, default=3000, help="range end in K (default: 3000)")
+    parser.add_argument("--grid-points", type=int, default=DEFAULT_GRID_POINTS,
+                        help=f"solver bracketing grid (default: {DEFAULT_GRID_POINTS})")
+    parser.add_argument("--sweep-points", type=int, default=100_000, help="points of the dense sweep (default: 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    reactions = generate_reactions(args.reactions, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_species_database(os.path.join(directory, "species.json"), synthetic_species_rows(reactions, seed=args.seed))
+        species_index = get_species_repository(path).index
+
+    solved = {}
+    for method in SOLVER_METHODS:
+        start = time.perf_counter()
+        roots = [
+            find_equilibrium_temperatures(
+                species_index, reaction, args.temperature_from, args.temperature_to, args.grid_points, method=method
+            ) or []
+            for reaction in reactions
+        ]
+        solved[method] = (time.perf_counter() - start, roots)
+
+    temperatures = np.linspace(args.temperature_from, args.temperature_to, args.sweep_points)
+    start = time.perf_counter()
+    swept = [sweep_roots(reaction_evaluator(species_index, reaction), temperatures) for reaction in reactions]
+    sweep_time = time.perf_counter() - start
+
+    print(f"{len(reactions)} reactions, {sum(len(roots) for roots in swept)} roots in the sweep")
+    print(f"{'method':<18} {'time ms':>10} {'refining evals':>15} {'max |diff| mK':>14}")
+    print(f"{f'sweep {args.sweep_points}':<18} {sweep_time * 1000:10.1f} {'-':>15} {'-':>14}")
+    for method, (elapsed, roots) in solved.items():
+        evaluations = sum(root.evaluations for reaction_roots in roots for root in reaction_roots)
+        differences = [
+            abs(root.temperature - swept_root) * 1000
+            for reaction_roots, swept_roots in zip(roots, swept)
+            if len(reaction_roots) == len(swept_roots)
+            for root, swept_root in zip(reaction_roots, swept_roots)
+        ]
+        mismatched = sum(len(reaction_roots) != len(swept_roots) for reaction_roots, swept_roots in zip(roots, swept))
+        note = f"  ({mismatched} reactions with a different root count)" if mismatched else ""
+        print(f"{method:<18} {elapsed * 1000:10.1f} {evaluations:15d} {max(differences, default=0):14.3f}{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Benchmark process-pool evaluation of a reaction list over 1, 2, 4 and 8 workers.
+
+Run from the repository root:
+
+    python benchmarks/benchmark_parallel_engine.py --count 1000 --points 500
+
+A synthetic species database covering every generated reaction is written to a temporary
+directory, so no real database is needed. Every worker count must give the same numbers
+as one worker, up to rounding.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic_data import generate_reactions, synthetic_species_rows, write_species_database  # noqa: E402
+from calculation_file_module.parallel_engine import calculate_reactions_parallel  # noqa: E402
+from calculation_file_module.reaction_compiler import clear_compiled_reactions  # noqa: E402
+from calculation_file_module.species_cache import default_species_cache  # noqa: E402
+from data_process_file.species_repository import clear_species_repositories  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=1000, help="number of reactions (default: 1000)")
+    parser.add_argument("--points", type=int, default=500, help="temperature points (default: 500)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="worker counts (default: 1 2 4 8)")
+    parser.add_argument("--chunk-size", type=int, help="reactions per task (default: chosen per worker count)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    reactions = generate_reactions(args.count, args.seed)
+    temperatures = np.linspace(298, 2500, args.points)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = write_species_database(
+            os.path.join(directory, "species.json"), synthetic_species_rows(reactions, seed=args.seed)
+        )
+
+        print(f"{len(reactions)} reactions x {args.points} temperatures, {os.cpu_count()} CPUs")
+        reference = None
+        baseline_time = None
+        mismatches = 0
+        for workers in args.workers:
+            # Every run starts cold; forked workers would otherwise inherit this process' caches
+            clear_species_repositories()
+            clear_compiled_reactions()
+            default_species_cache.clear()
+            start = time.perf_counter()
+            results = calculate_reactions_parallel(database, reactions, temperatures, workers, args.chunk_size)
+            elapsed = time.perf_counter() - start
+            if results is None:
+                print("Error: the synthetic database could not be loaded")
+                return 1
+
+            if reference is None:
+                reference = results
+                baseline_time = elapsed
+            # Chunk sizes change the order species are summed in, so allow rounding-level differences
+            elif results.labels != reference.labels or not np.allclose(
+                results.delta_G, reference.delta_G, rtol=1e-9,
+                atol=1e-12 * np.nanmax(np.abs(reference.delta_G)), equal_nan=True,
+            ):
+                mismatches += 1
+            evaluated = sum(label is not None for label in results.labels)
+            print(
+                f"{workers:2d} workers: {elapsed * 1000:9.1f} ms  "
+                f"speedup {baseline_time / elapsed:5.2f}x  ({evaluated} evaluated)"
+            )
+
+    print(f"results differing from the first worker count: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
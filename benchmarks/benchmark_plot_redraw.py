@@ -0,0 +1,89 @@
+"""
+Benchmark redrawing the Ellingham canvas as curves are added.
+
+Run from the repository root:
+
+    python benchmarks/benchmark_plot_redraw.py --curves 200 --points 5000
+
+Times the CurvePlot of plot_manager.py adding one curve (blitted over the cached
+composite) and changing one curve in place (set_data, every curve blitted over the
+background), against clearing the figure and plotting every curve again, as the window
+did before. Rendering uses the Agg canvas, so no display is needed.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from calculation_file_module.plot_manager import CurvePlot  # noqa: E402
+
+
+def synthetic_curves(count, points, seed=0):
+    """Return (temperatures, rows) with one roughly linear Delta G row per curve."""
+    rng = np.random.default_rng(seed)
+    temperatures = np.linspace(298, 2500, points)
+    intercepts = rng.uniform(-1200, 0, count)[:, None]
+    slopes = rng.uniform(0.05, 0.3, count)[:, None]
+    return temperatures, intercepts + slopes * temperatures + rng.normal(0, 2, (count, points))
+
+
+def redraw_from_scratch(canvas, temperatures, rows, labels):
+    canvas.figure.clf()
+    ax = canvas.figure.add_subplot(111)
+    ax.axhline(y=0, color="k", linestyle="-", linewidth=0.5)
+    for row, label in zip(rows, labels):
+        ax.plot(temperatures, row, label=label)
+        ax.text(temperatures[0], row[0], label, fontsize=8, fontweight="bold")
+    ax.legend(fontsize=8)
+    canvas.draw()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--curves", type=int, default=200, help="curves on the canvas at the end (default: 200)")
+    parser.add_argument("--points", type=int, default=5000, help="temperatures per curve (default: 5000)")
+    parser.add_argument("--every", type=int, default=50, help="report every N curves (default: 50)")
+    args = parser.parse_args(argv)
+
+    temperatures, rows = synthetic_curves(args.curves, args.points)
+    labels = [f"reaction {number}" for number in range(args.curves)]
+
+    plot = CurvePlot(FigureCanvasAgg(Figure(figsize=(7, 8.2))), "Delta G", "Ellingham Diagram")
+    scratch_canvas = FigureCanvasAgg(Figure(figsize=(7, 8.2)))
+
+    print(f"{args.points} points per curve; time per redraw")
+    print(f"{'curves':>7} {'add one':>11} {'change one':>12} {'from scratch':>14}")
+    for count in range(args.every, args.curves + 1, args.every):
+        for row, label in zip(rows[count - args.every:count - 1], labels[count - args.every:count - 1]):
+            plot.set_curve(label, temperatures, row, label)
+        plot.redraw()
+
+        start = time.perf_counter()
+        plot.set_curve(labels[count - 1], temperatures, rows[count - 1], labels[count - 1])
+        plot.redraw()
+        added = time.perf_counter() - start
+
+        start = time.perf_counter()
+        plot.set_curve(labels[0], temperatures, rows[0] + 1, labels[0])
+        plot.redraw()
+        changed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        redraw_from_scratch(scratch_canvas, temperatures, rows[:count], labels[:count])
+        from_scratch = time.perf_counter() - start
+        print(f"{count:7d} {added * 1000:8.1f} ms {changed * 1000:9.1f} ms {from_scratch * 1000:11.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
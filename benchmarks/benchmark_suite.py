@@ -0,0 +1,266 @@
+"""
+Time the calculation pipeline on synthetic data and compare runs against a baseline.
+
+Run from the repository root:
+
+    python benchmarks/benchmark_suite.py --output baseline.json
+    python benchmarks/benchmark_suite.py --baseline baseline.json --output latest.json
+
+Covers balance_equation, parse_reaction_equation, parse_database_chemical_speacies (one
+case per --db-rows size, 1,000 to 1,000,000), perform_calculations and
+plot_ellingham_diagram on the Agg backend. The databases and reactions come from
+synthetic_data.py, so every run with the same settings measures the same work.
+
+Each case runs --repeat times and the best and median wall times are kept. --output
+writes them as JSON; --baseline reads such a file and flags every case whose best time
+grew by more than --tolerance, exiting with status 1 if any did.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from benchmarks.synthetic_data import generate_reactions, synthetic_species_rows, write_species_database  # noqa: E402
+from calculation_file_module.calculation_engine_properties import perform_calculations  # noqa: E402
+from calculation_file_module.calculation_plot_file import plot_ellingham_diagram  # noqa: E402
+from calculation_file_module.reaction_compiler import clear_compiled_reactions  # noqa: E402
+from calculation_file_module.species_cache import default_species_cache  # noqa: E402
+from data_process_file.data_processor_module import parse_database_chemical_speacies  # noqa: E402
+from data_process_file.equation_processor import balance_equation, parse_reaction_equation  # noqa: E402
+from data_process_file.species_repository import get_species_repository  # noqa: E402
+
+BASELINE_FORMAT = 1
+
+# Settings that change the measured work; baselines taken with other values are not comparable
+COMPARED_SETTINGS = ["reactions", "plot_reactions", "points", "seed"]
+
+
+class Case:
+    """
+    One benchmark: run() is timed, prepare() is called untimed before every run.
+
+    Args:
+        name (str): Case name, with its size, e.g. "parse_database_chemical_speacies[rows=1000]".
+        run (callable): The work to time.
+        prepare (callable, optional): Resets caches so every run does the same work.
+        items (int): Units of work per run, for the per-item time.
+    """
+
+    def __init__(self, name, run, prepare=None, items=1):
+        self.name = name
+        self.run = run
+        self.prepare = prepare
+        self.items = items
+
+
+def _clear_calculation_caches():
+    # The species database stays loaded; its parsing is timed by its own case
+    clear_compiled_reactions()
+    default_species_cache.clear()
+
+
+def build_cases(directory, args):
+    """Write the synthetic databases into directory and return the cases to run."""
+    reactions = generate_reactions(args.reactions, args.seed)
+    plot_reactions = reactions[:args.plot_reactions]
+    temperatures = np.linspace(298, 2500, args.points)
+
+    databases = {}
+    for rows in sorted(args.db_rows):
+        databases[rows] = write_species_database(
+            os.path.join(directory, f"species_{rows}.json"),
+            synthetic_species_rows(reactions, rows=rows, seed=args.seed),
+        )
+    # The calculation cases look species up in the smallest database
+    calculation_database = databases[min(databases)]
+
+    def balance_all():
+        for reaction in reactions:
+            balance_equation(reaction)
+
+    def parse_all():
+        for reaction in reactions:
+            parse_reaction_equation(reaction)
+
+    def calculate_all():
+        for reaction in reactions:
+            perform_calculations(calculation_database, temperatures, reaction)
+
+    def plot_all():
+        canvas = FigureCanvasAgg(Figure(figsize=(7, 8.2)))
+        plot_ellingham_diagram(calculation_database, plot_reactions, 298, 2500, args.points, canvas)
+
+    def prepare_calculation():
+        _clear_calculation_caches()
+        get_species_repository(calculation_database)
+
+    cases = [
+        Case(f"balance_equation[reactions={len(reactions)}]", balance_all, items=len(reactions)),
+        Case(f"parse_reaction_equation[reactions={len(reactions)}]", parse_all, items=len(reactions)),
+    ]
+    for rows, path in databases.items():
+        cases.append(Case(
+            f"parse_database_chemical_speacies[rows={rows}]",
+            lambda path=path: parse_database_chemical_speacies(path),
+            items=rows,
+        ))
+    cases.append(Case(
+        f"perform_calculations[reactions={len(reactions)},points={args.points}]",
+        calculate_all, prepare_calculation, items=len(reactions),
+    ))
+    cases.append(Case(
+        f"plot_ellingham_diagram[reactions={len(plot_reactions)},points={args.points}]",
+        plot_all, prepare_calculation, items=len(plot_reactions),
+    ))
+    return cases
+
+
+def time_case(case, repeat):
+    """Run a case repeat times and return its timing record."""
+    times = []
+    for _ in range(repeat):
+        if case.prepare is not None:
+            case.prepare()
+        start = time.perf_counter()
+        case.run()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        "best_s": best,
+        "median_s": statistics.median(times),
+        "per_item_s": best / max(case.items, 1),
+        "items": case.items,
+        "repeat": repeat,
+    }
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare_results(results, baseline, tolerance):
+    """
+    Compare this run's cases against a baseline's.
+
+    Returns:
+        list: (name, baseline best_s or None, best_s or None, ratio or None, status) rows,
+        where status is "regression", "faster", "ok", "new" or "missing".
+    """
+    rows = []
+    for name, record in results["cases"].items():
+        previous = baseline["cases"].get(name)
+        if previous is None:
+            rows.append((name, None, record["best_s"], None, "new"))
+            continue
+        ratio = record["best_s"] / previous["best_s"]
+        if ratio > 1 + tolerance:
+            status = "regression"
+        elif ratio < 1 / (1 + tolerance):
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, previous["best_s"], record["best_s"], ratio, status))
+    for name, previous in baseline["cases"].items():
+        if name not in results["cases"]:
+            rows.append((name, previous["best_s"], None, None, "missing"))
+    return rows
+
+
+def _milliseconds(seconds):
+    return f"{seconds * 1000:10.2f}" if seconds is not None else f"{'-':>10}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db-rows", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="species database sizes to parse (default: 1000 10000 100000)")
+    parser.add_argument("--reactions", type=int, default=200, help="reactions to balance and calculate (default: 200)")
+    parser.add_argument("--plot-reactions", type=int, default=20, help="reactions to plot (default: 20)")
+    parser.add_argument("--points", type=int, default=500, help="temperature points (default: 500)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--output", help="write this run's results to a JSON file")
+    parser.add_argument("--baseline", help="compare against results written earlier with --output")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="slowdown of the best time flagged as a regression (default: 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("format") != BASELINE_FORMAT:
+            print(f"Error: {args.baseline} is not a benchmark_suite results file of format {BASELINE_FORMAT}")
+            return 2
+
+    results = {
+        "format": BASELINE_FORMAT,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "settings": {setting: getattr(args, setting) for setting in COMPARED_SETTINGS},
+        "cases": {},
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("Generating synthetic data...")
+        cases = [case for case in build_cases(directory, args) if args.only is None or args.only in case.name]
+        width = max((len(case.name) for case in cases), default=10)
+        print(f"{'case':<{width}} {'best ms':>10} {'median ms':>10} {'per item us':>12}")
+        for case in cases:
+            record = time_case(case, args.repeat)
+            results["cases"][case.name] = record
+            print(
+                f"{case.name:<{width}} {_milliseconds(record['best_s'])} {_milliseconds(record['median_s'])} "
+                f"{record['per_item_s'] * 1e6:12.2f}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"Results written to {args.output}")
+
+    if baseline is None:
+        return 0
+
+    if baseline.get("settings") != results["settings"]:
+        print(f"Warning: baseline settings {baseline.get('settings')} differ from {results['settings']}")
+    if baseline.get("environment") != results["environment"]:
+        print("Warning: the baseline was taken in a different environment; timings may not be comparable")
+
+    rows = compare_results(results, baseline, args.tolerance)
+    width = max(len(row[0]) for row in rows)
+    print(f"\n{'case':<{width}} {'baseline ms':>11} {'now ms':>10} {'ratio':>7}  status")
+    for name, previous, current, ratio, status in rows:
+        ratio_text = f"{ratio:7.2f}" if ratio is not None else f"{'-':>7}"
+        print(f"{name:<{width}} {_milliseconds(previous):>11} {_milliseconds(current)} {ratio_text}  {status}")
+    regressions = [row for row in rows if row[4] == "regression"]
+    print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Synthetic reactions and species databases for the benchmarks.
+
+generate_reactions returns balanceable reactions with phases, and synthetic_species_rows
+returns database rows covering them, padded with filler species to any size:
+
+    reactions = generate_reactions(100)
+    write_species_database("species.json", synthetic_species_rows(reactions, rows=100_000))
+
+Everything is drawn from a seeded generator, so the same arguments give the same data.
+"""
+import itertools
+import json
+import random
+
+import numpy as np
+
+METALS = ["Al", "Fe", "Cu", "Cr", "Ca", "Mg", "Ti", "Zn", "Ni", "Mn", "Si", "Cd"]
+NON_METALS = ["O", "S", "Cl", "N", "F"]
+
+# Filler species have three elements, so they never clash with a reaction's species
+FILLER_ELEMENTS = ["H", "C", "B", "P", "K", "Na", "Li", "Ba"]
+PHASES = ["s", "l", "g"]
+
+# Share of species given a second heat capacity range
+SEGMENTED_FRACTION = 0.2
+
+
+def _formula(parts):
+    return "".join(element if count == 1 else f"{element}{count}" for element, count in parts)
+
+
+def generate_reactions(count, seed=0):
+    """Generate random oxidation and double displacement reactions with phases."""
+    rng = random.Random(seed)
+    reactions = []
+    while len(reactions) < count:
+        if rng.random() < 0.5:
+            metal = rng.choice(METALS)
+            oxide = _formula([(metal, rng.randint(1, 3)), ("O", rng.randint(1, 5))])
+            reactions.append(f"{metal}(s) + O2(g) = {oxide}(s)")
+        else:
+            # AX + BY = AY + BX always balances
+            a, b = rng.sample(METALS, 2)
+            x, y = rng.sample(NON_METALS, 2)
+            atoms = rng.randint(1, 3)
+            left = [_formula([(a, 1), (x, atoms)]), _formula([(b, 1), (y, atoms)])]
+            right = [_formula([(a, 1), (y, atoms)]), _formula([(b, 1), (x, atoms)])]
+            reactions.append(" + ".join(f"{s}(s)" for s in left) + " = " + " + ".join(f"{s}(s)" for s in right))
+    return reactions
+
+
+def reaction_species(reactions):
+    """Return the sorted (formula, phase) pairs used by reactions."""
+    species = set()
+    for reaction in reactions:
+        for side in reaction.split("="):
+            for substance in side.split("+"):
+                formula, phase = substance.strip().rstrip(")").split("(")
+                species.add((formula, phase))
+    return sorted(species)
+
+
+def _filler_species():
+    """Yield distinct three-element (formula, phase) pairs, e.g. ("AlO2H3", "s")."""
+    for count in itertools.count(1):
+        for metal, non_metal, filler, phase in itertools.product(METALS, NON_METALS, FILLER_ELEMENTS, PHASES):
+            yield _formula([(metal, 1), (non_metal, count), (filler, count)]), phase
+
+
+def synthetic_species_rows(reactions=(), rows=None, seed=0):
+    """
+    Return database rows for every species in reactions, padded with filler species.
+
+    About SEGMENTED_FRACTION of the species get two heat capacity ranges (298-1000 K and
+    1000-3000 K), so segment lookups are part of what is measured.
+
+    Args:
+        reactions (list): Reaction equations whose species must be present.
+        rows (int, optional): Rows to return, at least one per reaction species.
+        seed (int): Random seed.
+
+    Returns:
+        list: Row dicts in the species database schema.
+    """
+    species = reaction_species(reactions)
+    if rows is not None and rows > len(species):
+        species += itertools.islice(_filler_species(), rows - len(species))
+
+    rng = np.random.default_rng(seed)
+    count = len(species)
+    segmented = rng.random(count) < SEGMENTED_FRACTION
+    values = {
+        "MW (g/mol)": rng.uniform(10, 300, count),
+        "H 298 (kcal/mol)": rng.uniform(-400, 0, count),
+        "S 298 (cal/mol*K)": rng.uniform(5, 60, count),
+        "A": rng.uniform(3, 30, count),
+        "B": rng.uniform(0, 10, count),
+        "C": rng.uniform(-5, 1, count),
+        "Density (g/cm3)": rng.uniform(1, 10, count),
+    }
+    result = []
+    for position, (formula, phase) in enumerate(species):
+        row = {
+            "Formula": formula,
+            "MW (g/mol)": float(values["MW (g/mol)"][position]),
+            "Melting P. (K)": 0,
+            "Boiling P. (K)": 0,
+            "T1 (K)": 298,
+            "T2 (K)": 1000 if segmented[position] else 3000,
+            "Phase": phase,
+            "H 298 (kcal/mol)": float(values["H 298 (kcal/mol)"][position]),
+            "S 298 (cal/mol*K)": float(values["S 298 (cal/mol*K)"][position]),
+            "A": float(values["A"][position]),
+            "B": float(values["B"][position]),
+            "C": float(values["C"][position]),
+            "D": 0.0,
+            "Density (g/cm3)": float(values["Density (g/cm3)"][position]),
+        }
+        result.append(row)
+        if segmented[position] and (rows is None or len(result) < rows):
+            result.append(dict(row, **{"T1 (K)": 1000, "T2 (K)": 3000, "A": row["A"] * 1.1, "B": row["B"] * 0.9}))
+    return result[:rows] if rows is not None else result
+
+
+def write_species_database(path, rows):
+    """Write rows as a JSON species database and return the path."""
+    with open(path, "w", encoding="utf-8") as database_file:
+        # One dumps call is several times faster than json.dump's chunked writes
+        database_file.write(json.dumps(rows))
+    return path
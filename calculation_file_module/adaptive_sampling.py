@@ -0,0 +1,178 @@
+"""
+Sample a reaction's Delta G curve with points only where the curve needs them.
+
+A uniform grid spends as many points on a straight stretch of an Ellingham line as on
+the kink where a species melts or its heat capacity range ends. adaptive_temperatures
+starts from a coarse grid instead and evaluates the midpoint of every interval; an
+interval is split again only while its midpoint is further than the tolerance from the
+straight line between its ends. All midpoints of one pass are evaluated in a single
+call, so the engine still works on arrays:
+
+    results = sample_reaction(repository.index, "2Zn(*) + O2(g) = 2ZnO(s)", 298, 3000)
+    print(results.temperatures.size, "points")
+
+The tolerance is in Delta G units and defaults to DEFAULT_RELATIVE_TOLERANCE of the
+curve's range on the coarse grid, about a pixel of a plot that shows the whole curve.
+Features narrower than a coarse interval whose midpoint happens to lie on the line
+can be missed; raise initial_points for such curves.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from calculation_file_module.batch_engine import BatchResults, calculate_reactions_batch_with_index
+from calculation_file_module.calculation_engine_properties import find_phase_transitions
+from calculation_file_module.reaction_compiler import compile_reaction
+from calculation_file_module.species_cache import SpeciesFunctionCache
+from data_process_file.instrumentation import instrumented
+from data_process_file.species_repository import PhaseChoice
+
+DEFAULT_INITIAL_POINTS = 17
+DEFAULT_MAX_POINTS = 1000
+# Share of the curve's Delta G range a midpoint may be off the straight line
+DEFAULT_RELATIVE_TOLERANCE = 1e-3
+# Intervals are not split below this share of the range, so a jump cannot refine forever
+MIN_INTERVAL_FRACTION = 1e-9
+
+
+class AdaptiveSample(NamedTuple):
+    """Ascending temperatures chosen by adaptive_temperatures and the values evaluated at them."""
+    temperatures: np.ndarray
+    values: np.ndarray
+
+
+def adaptive_temperatures(
+    evaluate,
+    temperature_from,
+    temperature_to,
+    tolerance=None,
+    initial_points=DEFAULT_INITIAL_POINTS,
+    max_points=DEFAULT_MAX_POINTS,
+):
+    """
+    Choose temperatures so linear interpolation between them is within a tolerance.
+
+    Args:
+        evaluate (callable): Ascending temperatures array -> values array, e.g. Delta G.
+        temperature_from (float): Lower end of the range in Kelvin.
+        temperature_to (float): Upper end of the range in Kelvin.
+        tolerance (float, optional): Largest distance allowed between a midpoint and the
+            line through its interval's ends. Defaults to DEFAULT_RELATIVE_TOLERANCE of
+            the range of the values on the initial grid.
+        initial_points (int): Points of the uniform grid refinement starts from.
+        max_points (int): Most points to evaluate; once reached, the intervals furthest
+            off the line are the ones refined.
+
+    Returns:
+        AdaptiveSample: Every point evaluated, in temperature order, so its size is also
+        the number of evaluations.
+    """
+    low, high = sorted((float(temperature_from), float(temperature_to)))
+    max_points = max(int(max_points), 2)
+    temperatures = np.linspace(low, high, min(max(int(initial_points), 2), max_points))
+    values = np.array(np.broadcast_to(evaluate(temperatures), temperatures.shape), dtype=float)
+    if not np.all(np.isfinite(values)):
+        return AdaptiveSample(temperatures, values)
+
+    if tolerance is None:
+        scale = np.ptp(values) or max(np.abs(values).max(), 1.0)
+        tolerance = DEFAULT_RELATIVE_TOLERANCE * scale
+    min_width = MIN_INTERVAL_FRACTION * max(high - low, 1.0)
+
+    # Left ends of the intervals still to test, and how far off the line their parent was
+    pending = np.arange(temperatures.size - 1)
+    priority = np.full(pending.size, np.inf)
+    while pending.size and temperatures.size < max_points:
+        budget = max_points - temperatures.size
+        if pending.size > budget:
+            pending = np.sort(pending[np.argsort(-priority, kind="stable")[:budget]])
+
+        midpoints = 0.5 * (temperatures[pending] + temperatures[pending + 1])
+        midpoint_values = np.array(np.broadcast_to(evaluate(midpoints), midpoints.shape), dtype=float)
+        error = np.abs(midpoint_values - 0.5 * (values[pending] + values[pending + 1]))
+
+        temperatures = np.insert(temperatures, pending + 1, midpoints)
+        values = np.insert(values, pending + 1, midpoint_values)
+        # Each insertion shifts the later ones by one
+        inserted = pending + np.arange(1, pending.size + 1)
+
+        split = (error > tolerance) & (temperatures[inserted] - temperatures[inserted - 1] > min_width)
+        pending = np.column_stack((inserted[split] - 1, inserted[split])).ravel()
+        priority = np.repeat(error[split], 2)
+    return AdaptiveSample(temperatures, values)
+
+
+@instrumented("engine.adaptive")
+def sample_reaction(
+    species_index,
+    reaction_equation,
+    temperature_from,
+    temperature_to,
+    tolerance=None,
+    initial_points=DEFAULT_INITIAL_POINTS,
+    max_points=DEFAULT_MAX_POINTS,
+):
+    """
+    Evaluate one reaction at temperatures chosen by adaptive_temperatures on its Delta G.
+
+    Every refinement pass is one batch engine call, so the heat capacity, enthalpy and
+    entropy come with Delta G and no temperature is evaluated twice. Only the starting
+    grid goes through the shared species cache: the midpoints of a pass are never asked
+    for again, so caching them would only push the plot grid's columns out.
+
+    Args:
+        species_index: A SpeciesIndex or StoreSpeciesIndex.
+        reaction_equation (str): Reaction equation or single formula.
+        temperature_from (float): Lower end of the range in Kelvin.
+        temperature_to (float): Upper end of the range in Kelvin.
+        tolerance (float, optional): Delta G tolerance, see adaptive_temperatures.
+        initial_points (int): Points of the starting grid.
+        max_points (int): Most points to evaluate.
+
+    Returns:
+        BatchResults: The one reaction on its own temperature grid; its label is None
+        if the reaction could not be evaluated. Phase transitions are located on the
+        final grid, which is densest around them.
+    """
+    passes = []
+    # Holds nothing once a call returns, so refinement passes compute their columns directly
+    uncached = SpeciesFunctionCache(max_species=0)
+
+    def evaluate(temperatures):
+        species_cache = uncached if passes else None
+        results = calculate_reactions_batch_with_index(species_index, [reaction_equation], temperatures, species_cache)
+        passes.append(results)
+        return results.delta_G[0]
+
+    sample = adaptive_temperatures(
+        evaluate, temperature_from, temperature_to, tolerance, initial_points, max_points
+    )
+    first = passes[0]
+    if len(passes) == 1:
+        return first
+
+    order = np.argsort(np.concatenate([results.temperatures for results in passes]), kind="stable")
+
+    def merged(name):
+        return np.concatenate([getattr(results, name) for results in passes], axis=1)[:, order]
+
+    return BatchResults(
+        first.equations,
+        first.labels,
+        sample.temperatures,
+        sample.values[None, :],
+        merged("heat_capacity"),
+        merged("enthalpy"),
+        merged("entropy"),
+        [_phase_transitions(species_index, first.equations[0], sample.temperatures)],
+    )
+
+
+def _phase_transitions(species_index, reaction_equation, temperatures):
+    """PhaseTransitions of a reaction's auto-phase species on temperatures, as the batch engine lists them."""
+    species, _ = compile_reaction(reaction_equation).resolve(species_index)
+    transitions = {}
+    for _, record in species:
+        if isinstance(record, PhaseChoice) and record not in transitions:
+            transitions[record] = find_phase_transitions(record, temperatures)
+    return [transition for _, record in species if record in transitions for transition in transitions[record]]
@@ -0,0 +1,103 @@
+"""
+Run reaction calculations on a worker thread and hand results back through a queue.
+
+The window never waits on a calculation: it starts a CalculationJob, polls job.queue
+from a root.after callback and draws each reaction as soon as its message arrives.
+Cancelling is checked between steps, before each reaction and before its equilibrium
+search, so the step under way, such as one long adaptive sampling, is finished first.
+"""
+import queue
+import threading
+
+import numpy as np
+
+from calculation_file_module.adaptive_sampling import sample_reaction
+from calculation_file_module.batch_engine import calculate_reactions_batch_with_index
+from calculation_file_module.equilibrium_solver import find_equilibrium_temperatures
+from data_process_file.species_repository import get_species_repository
+
+# Message kinds put on CalculationJob.queue
+REACTION = "reaction"    # ("reaction", position, BatchResults holding that one reaction on its grid)
+EQUILIBRIUM = "equilibrium"  # ("equilibrium", position, EquilibriumTemperatures within the grid's range)
+FINISHED = "finished"    # ("finished", None, None)
+CANCELLED = "cancelled"  # ("cancelled", None, None)
+FAILED = "failed"        # ("failed", None, error message)
+
+
+class CalculationJob:
+    """
+    Evaluate reactions one at a time on a daemon thread.
+
+    Each reaction is posted as soon as it is done, so a long list starts plotting right
+    away; species shared between reactions are still computed once through the species
+    cache. A reaction that could be calculated is followed by an EQUILIBRIUM message with
+    the temperatures in the grid's range where its Delta G is zero, unless the job is
+    cancelled in between. Exactly one FINISHED, CANCELLED or FAILED message ends the stream.
+
+    With adaptive=True every reaction is sampled by sample_reaction over the grid's range
+    instead, using at most as many points as the grid has.
+    """
+
+    def __init__(self, file_path, reaction_equations, temperatures, adaptive=False):
+        self.file_path = file_path
+        self.reaction_equations = [equation.strip() for equation in reaction_equations if equation.strip()]
+        self.temperatures = np.asarray(temperatures, dtype=float)
+        self.adaptive = adaptive and self.temperatures.size > 0
+        self.queue = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="calculation", daemon=True)
+
+    def __len__(self):
+        return len(self.reaction_equations)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """
+        Ask the worker to stop at its next step; reactions already posted stay in the queue.
+
+        The reaction or equilibrium search being calculated is not interrupted, so
+        CANCELLED arrives once it is done.
+        """
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def _run(self):
+        try:
+            repository = get_species_repository(self.file_path)
+            if repository is None:
+                self.queue.put((FAILED, None, f"Could not load the species database '{self.file_path}'."))
+                return
+            for position, reaction_equation in enumerate(self.reaction_equations):
+                if self._cancel.is_set():
+                    self.queue.put((CANCELLED, None, None))
+                    return
+                if self.adaptive:
+                    results = sample_reaction(
+                        repository.index, reaction_equation, self.temperatures.min(), self.temperatures.max(),
+                        max_points=self.temperatures.size,
+                    )
+                else:
+                    results = calculate_reactions_batch_with_index(
+                        repository.index, [reaction_equation], self.temperatures
+                    )
+                self.queue.put((REACTION, position, results))
+                if self._cancel.is_set():
+                    self.queue.put((CANCELLED, None, None))
+                    return
+                if results.labels[0] is not None and self.temperatures.size:
+                    roots = find_equilibrium_temperatures(
+                        repository.index, reaction_equation, self.temperatures.min(), self.temperatures.max()
+                    )
+                    self.queue.put((EQUILIBRIUM, position, roots or []))
+            self.queue.put((FINISHED, None, None))
+        except Exception as e:
+            self.queue.put((FAILED, None, str(e)))
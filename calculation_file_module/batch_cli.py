@@ -0,0 +1,211 @@
+"""
+Headless batch calculations: reactions in, ΔG/H/S/Cp rows out, no Tk and no pyplot.
+
+Reactions are read one per line (or comma separated, as in the window's entry) from a file
+or stdin; blank lines and lines starting with "#" are skipped. They are evaluated in
+chunks with the batch engine and each chunk is written (CSV, TSV, Parquet or NPZ, see
+result_export) before the next chunk is read, so memory stays bounded however many
+reactions come in.
+
+    python -m calculation_file_module.batch_cli reactions.txt --temperatures 298:2000:100
+    echo "Al(s) + O2(g) = Al2O3(s)" | python -m calculation_file_module.batch_cli --temperatures 500,1000,1500
+
+The engine reports problems through logging, which writes to stderr, so stdout only
+carries the table, in worker processes too.
+"""
+import argparse
+import contextlib
+import sys
+
+import numpy as np
+
+from calculation_file_module.parallel_engine import iter_reaction_chunks_parallel
+from calculation_file_module.result_export import EXPORT_FORMATS, open_result_writer
+from data_process_file import instrumentation
+from data_process_file.species_repository import get_species_repository
+
+DEFAULT_DATABASE = "chemical_species_data_base.json"
+DEFAULT_CHUNK_SIZE = 64
+
+
+def parse_temperature_grid(spec):
+    """
+    Turn a grid spec into temperatures.
+
+    Args:
+        spec (str): "START:STOP:POINTS" for POINTS evenly spaced temperatures from START to
+            STOP, like the window's From/To/Step fields, or a comma separated list.
+
+    Returns:
+        numpy.ndarray: The temperatures in Kelvin.
+
+    Raises:
+        ValueError: If the spec cannot be read or gives no temperatures.
+    """
+    try:
+        if ":" in spec:
+            start, stop, points = spec.split(":")
+            temperatures = np.linspace(float(start), float(stop), int(points))
+        else:
+            temperatures = np.array([float(value) for value in spec.split(",") if value.strip()])
+    except ValueError:
+        raise ValueError(f"Invalid temperature grid '{spec}'; use START:STOP:POINTS or T1,T2,...")
+    if temperatures.size == 0:
+        raise ValueError(f"Temperature grid '{spec}' has no temperatures")
+    if np.any(temperatures <= 0):
+        raise ValueError("Temperatures must be above 0 K")
+    return temperatures
+
+
+def read_reactions(lines):
+    """Yield reaction equations from lines of text, skipping blanks and # comments."""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        for reaction_equation in line.split(","):
+            if reaction_equation.strip():
+                yield reaction_equation.strip()
+
+
+def chunked(items, size):
+    """Yield lists of up to size items, reading the iterable lazily."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_results(file_path, reaction_equations, temperatures, writer, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+    """
+    Evaluate reactions chunk by chunk and hand each chunk to a result writer.
+
+    This is a generator; nothing is read or written until it is iterated.
+
+    Args:
+        file_path (str): Path to the species database or compiled store.
+        reaction_equations (iterable): Reaction equations, read lazily.
+        temperatures (numpy.ndarray): Temperatures in Kelvin.
+        writer (ResultWriter): Writer from result_export.open_result_writer.
+        chunk_size (int): Reactions evaluated per batch.
+        workers (int): Worker processes evaluating chunks; rows are still written in input order.
+
+    Yields:
+        tuple: (reactions written, reactions that failed) so far, after each chunk.
+
+    Raises:
+        ValueError: If the species database could not be loaded for a chunk.
+    """
+    failed = 0
+    chunks = chunked(reaction_equations, chunk_size)
+    for results in iter_reaction_chunks_parallel(file_path, chunks, temperatures, workers):
+        if results is None:
+            raise ValueError(f"Could not load species database '{file_path}'")
+        for row, reaction_equation in enumerate(results.equations):
+            if results.labels[row] is None:
+                print(f"Error: Calculation failed for '{reaction_equation}'. Skipping...", file=sys.stderr)
+                failed += 1
+        writer.write_batch(results)
+        yield writer.reactions_written, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Calculate ΔG, H, S and Cp for many reactions without opening a window."
+    )
+    parser.add_argument(
+        "reactions", nargs="?", default="-",
+        help="file with one reaction per line, or - for stdin (default: stdin)",
+    )
+    parser.add_argument(
+        "-t", "--temperatures", required=True, metavar="GRID",
+        help="START:STOP:POINTS (e.g. 298:2000:100) or a comma separated list of temperatures in K",
+    )
+    parser.add_argument(
+        "-d", "--database", default=DEFAULT_DATABASE,
+        help=f"species database or compiled store (default: {DEFAULT_DATABASE})",
+    )
+    parser.add_argument("-o", "--output", default="-", help="output file, or - for stdout (default: stdout)")
+    parser.add_argument(
+        "--format", choices=sorted(set(EXPORT_FORMATS.values())),
+        help="output format (default: from the output file extension, else csv); parquet needs pyarrow",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+        help=f"reactions evaluated and written per batch (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=1,
+        help="worker processes evaluating chunks in parallel; 0 uses SMK_WORKERS or every CPU (default: 1)",
+    )
+    parser.add_argument(
+        "--instrument", choices=instrumentation.REPORT_FORMATS,
+        help="print call counts and times per stage to stderr when done (work in --workers processes is not included)",
+    )
+    parser.add_argument(
+        "--instrument-memory", action="store_true",
+        help="with --instrument, also record the tracemalloc peak of each stage (slower)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.instrument:
+        instrumentation.enable(memory=args.instrument_memory)
+        instrumentation.report_at_exit(args.instrument)
+
+    try:
+        temperatures = parse_temperature_grid(args.temperatures)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.chunk_size < 1:
+        print("Error: --chunk-size must be at least 1", file=sys.stderr)
+        return 1
+    if args.workers < 0:
+        print("Error: --workers cannot be negative", file=sys.stderr)
+        return 1
+
+    repository = get_species_repository(args.database)
+    if repository is None:
+        print(f"Error: Could not load species database '{args.database}'", file=sys.stderr)
+        return 1
+
+    export_format = args.format
+    if export_format is None and (args.output == "-" or not args.output.lower().endswith(tuple(EXPORT_FORMATS))):
+        export_format = "csv"
+
+    with contextlib.ExitStack() as stack:
+        if args.reactions == "-":
+            source = sys.stdin
+        else:
+            try:
+                source = stack.enter_context(open(args.reactions, encoding="utf-8"))
+            except OSError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+        try:
+            writer = stack.enter_context(open_result_writer(args.output, export_format))
+        except (OSError, ValueError, ImportError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+        written = failed = 0
+        progress = stream_results(
+            args.database, read_reactions(source), temperatures, writer, args.chunk_size, args.workers or None
+        )
+        try:
+            for written, failed in progress:
+                pass
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+    print(f"Wrote {written} reactions at {temperatures.size} temperatures; {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
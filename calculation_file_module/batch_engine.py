@@ -0,0 +1,135 @@
+import logging
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from calculation_file_module.calculation_engine_properties import find_phase_transitions
+from calculation_file_module.reaction_compiler import compile_reaction
+from calculation_file_module.species_cache import default_species_cache
+from data_process_file.instrumentation import instrumented, span
+from data_process_file.species_repository import PhaseChoice, get_species_repository
+
+logger = logging.getLogger(__name__)
+
+
+class BatchResults(NamedTuple):
+    """
+    Results of many reactions over one temperature grid.
+
+    Each property is a (reactions, temperatures) array in input order. Reactions that
+    could not be evaluated have a label of None and rows of NaN. transitions lists, per
+    reaction, the PhaseTransitions of its auto-phase species such as "Al(*)".
+    """
+    equations: List[str]
+    labels: List[Optional[str]]
+    temperatures: np.ndarray
+    delta_G: np.ndarray
+    heat_capacity: np.ndarray
+    enthalpy: np.ndarray
+    entropy: np.ndarray
+    transitions: List[list]
+
+
+def calculate_reactions_batch(file_path, reaction_equations, temperatures, species_cache=None):
+    """
+    Evaluate every reaction at every temperature with a few sparse matrix products.
+
+    A reactions x species stoichiometry matrix is built over the species the reactions
+    use, and species x temperature matrices of the Gibbs, heat capacity, enthalpy and
+    entropy terms are taken from the species cache, which computes only species it has
+    not seen on this grid. Each reaction property is then the product of the two, which
+    gives the same numbers as perform_calculations_sweep run reaction by reaction.
+
+    A reaction uses a handful of the species, so the stoichiometry matrix is kept as its
+    nonzero (row, species, coefficient) entries, in row order, and multiplied by gathering
+    each entry's species row and summing every reaction's entries with np.add.reduceat.
+    The work and memory grow with the entries times the temperatures rather than with
+    reactions x species, without depending on scipy.sparse.
+
+    Args:
+        file_path (str): Path to the species database or compiled store.
+        reaction_equations (list): Reaction equations, in output order.
+        temperatures (array-like): Temperatures in Kelvin.
+        species_cache (SpeciesFunctionCache, optional): Cache of species columns to reuse.
+            Defaults to the process-wide default_species_cache.
+
+    Returns:
+        BatchResults: The results, or None if the database could not be loaded.
+    """
+    repository = get_species_repository(file_path)
+    if repository is None:
+        logger.error("Error: Failed to parse Excel data.")
+        return None
+    return calculate_reactions_batch_with_index(repository.index, reaction_equations, temperatures, species_cache)
+
+
+@instrumented("engine.batch")
+def calculate_reactions_batch_with_index(species_index, reaction_equations, temperatures, species_cache=None):
+    """calculate_reactions_batch against an already loaded species index."""
+    if species_cache is None:
+        species_cache = default_species_cache
+    equations = [equation.strip() for equation in reaction_equations]
+    temperatures = np.asarray(temperatures, dtype=float)
+    shape = (len(equations), temperatures.size)
+    results = BatchResults(
+        equations,
+        [None] * len(equations),
+        temperatures,
+        np.full(shape, np.nan),
+        np.full(shape, np.nan),
+        np.full(shape, np.nan),
+        np.full(shape, np.nan),
+        [[] for _ in equations],
+    )
+
+    # Column of every species used by the batch, and its stoichiometric entries per reaction
+    species_columns = {}
+    species_records = []
+    entries = []
+    phase_transitions = {}
+    batch_rows = []
+    for row, equation in enumerate(equations):
+        try:
+            with span("engine.compile"):
+                reaction = compile_reaction(equation)
+        except ValueError as e:
+            logger.error(f"Error: {e}. Skipping...")
+            continue
+
+        try:
+            with span("engine.resolve"):
+                species, _ = reaction.resolve(species_index)
+        except ValueError as e:
+            logger.error(f"Error: {e} Skipping '{equation}'...")
+            continue
+
+        for coefficient, record in species:
+            column = species_columns.get(record)
+            if column is None:
+                column = species_columns[record] = len(species_records)
+                species_records.append(record)
+            entries.append((row, column, coefficient))
+            if isinstance(record, PhaseChoice):
+                if record not in phase_transitions:
+                    phase_transitions[record] = find_phase_transitions(record, temperatures)
+                results.transitions[row].extend(phase_transitions[record])
+        results.labels[row] = reaction.label
+        batch_rows.append(row)
+
+    if not batch_rows:
+        return results
+
+    # Every reaction in batch_rows has at least one entry, and entries are in row order
+    rows, columns, coefficients = (np.array(values) for values in zip(*entries))
+    starts = np.flatnonzero(np.diff(rows, prepend=-1))
+    coefficients = coefficients.astype(float)[:, None]
+
+    with span("engine.species_matrices"):
+        gibbs, heat_capacity, enthalpy, entropy = species_cache.matrices(species_records, temperatures)
+    with span("engine.reaction_products"):
+        batch_rows = rows[starts]
+        results.delta_G[batch_rows] = np.add.reduceat(coefficients * gibbs[columns], starts, axis=0)
+        results.heat_capacity[batch_rows] = np.add.reduceat(coefficients * heat_capacity[columns], starts, axis=0)
+        results.enthalpy[batch_rows] = np.add.reduceat(coefficients * enthalpy[columns], starts, axis=0)
+        results.entropy[batch_rows] = np.add.reduceat(coefficients * entropy[columns], starts, axis=0)
+    return results
@@ -1,267 +1,320 @@
-import pandas as pd
-import math
-from data_process_file.data_processor_module import parse_database_chemical_speacies
-from data_process_file.equation_processor import parse_reaction_equation
+import logging
+import os
+from typing import NamedTuple
+import numpy as np
+from data_process_file.species_repository import PhaseChoice, as_species_index, get_species_repository
+from data_process_file.instrumentation import instrumented, span
+from calculation_file_module.reaction_compiler import compile_reaction, scale_heat_capacity_coefficient
 
+logger = logging.getLogger(__name__)
+
+# Set SMK_COMPARE_CP_INTEGRALS=1 to check every closed-form Cp integral against the old 1 K summation,
+# in the scalar engine and in the species columns of the batch engine alike
+COMPARE_CP_INTEGRALS = os.environ.get("SMK_COMPARE_CP_INTEGRALS") == "1"
+
+@instrumented("engine.perform_calculations")
 def perform_calculations(file_path, temperature, reaction_equation):
 
 
-    processed_data = create_temp_dataframe(file_path , reaction_equation)
-    #processed_data = parse_database_chemical_speacies(file_path)
+    # Species are resolved through the repository's (formula, phase) index
+    repository = get_species_repository(file_path)
 
-    if processed_data is None:
-        print("Error: Failed to parse Excel data.")
+    if repository is None:
+        logger.error("Error: Failed to parse Excel data.")
         return None
     try:
-        # Check if the reaction equation is a single-element formula
-        if "=" in reaction_equation and "+" not in reaction_equation:
-            delta_G_reaction, heat_capacity, enthalpy, entropy, temperature_1 = (
-                calculate_freegibbs_single_element(
-                    processed_data, reaction_equation, temperature
-                )
-            )
-        else:
-            delta_G_reaction, heat_capacity, enthalpy, entropy, temperature_1 = (
-                calculate_freegibbs(processed_data, reaction_equation, temperature)
-            )
+        # Single-species equations such as "Al(s) = Al(l)" are compiled like any other
+        delta_G_reaction, heat_capacity, enthalpy, entropy, temperature_1 = (
+            calculate_freegibbs(repository.index, reaction_equation, temperature)
+        )
 
         return delta_G_reaction, heat_capacity, enthalpy, entropy, temperature_1
 
     except Exception as e:
-        print(f"Calculation error: {e}")
+        logger.error(f"Calculation error: {e}")
         return None
 
 
+def perform_calculations_sweep(file_path, temperatures, reaction_equation):
+    """
+    Evaluate a reaction over a whole temperature grid in one vectorized pass.
+
+    Args:
+        file_path (str): Path to the species database.
+        temperatures (array-like): Temperatures in Kelvin.
+        reaction_equation (str): Reaction equation, e.g. "4Al(s) + 3O2(g) = 2Al2O3(s)".
+
+    Returns:
+        tuple: NumPy arrays (delta_G, heat_capacity, enthalpy, entropy, temperatures),
+        in the same order as perform_calculations, or None if the calculation failed.
+    """
+    temperatures = np.asarray(temperatures, dtype=float)
+    return perform_calculations(file_path, temperatures, reaction_equation)
+
+
+@instrumented("engine.freegibbs")
 def calculate_freegibbs(processed_data, reaction_equation, temperature):
     try:
-        reactants, products = parse_reaction_equation(reaction_equation)
-
-        sum_enthalpy_reactants = 0
-        sum_entropy_reactants = 0
-        sum_enthalpy_products = 0
-        sum_entropy_products = 0
-        sum_a_reactants = 0
-        sum_b_reactants = 0
-        sum_c_reactants = 0
-        sum_d_reactants = 0
-        sum_a_products = 0
-        sum_b_products = 0
-        sum_c_products = 0
-        sum_d_products = 0
-
-        delta_G = 0  # Initialize delta_G
-        heat_capacity = 0  # Initialize heat_capacity
-        enthalpy_calculation = 0  # Initialize enthalpy_calculation
-        entropy_calculation = 0  # Initialize entropy_calculation
-
-        for substance_type, substances in [
-            ("Reactant", reactants),
-            ("Product", products),
-        ]:
-            for substance in substances:
-                coefficient = substance["coefficient"]
-                substance_formula = substance["formula"].strip()
-                phase = substance["phase"]
-
-                # Attempt exact match with phase included (e.g, "Al(g)")
-                substance_data = processed_data[
-                    (processed_data["Formula"] == f"{substance_formula}({phase})")
-                    & (processed_data["Phase"] == phase)
-                ]
-
-                # if the exact match fails, fallback to formula only search
-                if substance_data.empty:
-                    substance_data = processed_data[
-                        (processed_data["Formula"] == substance_formula)
-                        & (processed_data["Phase"] == phase)
-                    ]
-
-                if not substance_data.empty:
-                    delta_H = substance_data.iloc[0]["H 298 (kcal/mol)"]
-                    delta_S = substance_data.iloc[0]["S 298 (cal/mol*K)"]
-                    a_value = substance_data.iloc[0]["A"]
-                    b_value = substance_data.iloc[0]["B"]
-                    c_value = substance_data.iloc[0]["C"]
-                    d_value = substance_data.iloc[0]["D"]
-
-                    delta_H *= coefficient
-                    delta_S *= coefficient
-
-                    if a_value != 0:
-                        a_value /= 1000
-                    else:
-                        a_value = 1e-6
-
-                    if b_value != 0:
-                        b_value /= 1000
-                    else:
-                        b_value = 1e-6
-                    
-                    if c_value != 0:
-                        c_value /= 1000
-                    else:
-                        c_value = 1e-6
-                    
-                    if d_value != 0:
-                        d_value /= 1000
-                    else:
-                        d_value = 1e-6
-
-                    if substance_type == "Reactant":
-                        sum_enthalpy_reactants += delta_H
-                        sum_entropy_reactants += delta_S
-                        sum_a_reactants += a_value
-                        sum_b_reactants += b_value
-                        sum_c_reactants += c_value
-                        sum_d_reactants += d_value
-                    else:
-                        sum_enthalpy_products += delta_H
-                        sum_entropy_products += delta_S
-                        sum_a_products += a_value
-                        sum_b_products += b_value
-                        sum_c_products += c_value
-                        sum_d_products += d_value
-
-                    change_in_enthalpy = sum_enthalpy_products - sum_enthalpy_reactants
-                    change_in_entropy = sum_entropy_products - sum_entropy_reactants
-                    change_in_a = sum_a_products - sum_a_reactants
-                    change_in_b = sum_b_products - sum_b_reactants
-                    change_in_c = sum_c_products - sum_c_reactants
-                    change_in_d = sum_d_products - sum_d_reactants
-
-                    contribution_of_coefficients = (
-                        calculate_contribution_of_coefficients(
-                            change_in_a, change_in_b, change_in_c, change_in_d, temperature
-                        )
-                    )
-
-                    heat_capacity = calculate_heat_capacity(
-                        a_value, b_value, c_value, d_value, temperature
-                    )
-                    entropy_calculation = calculate_entropy_change(
-                        change_in_entropy, change_in_a, change_in_b, change_in_c, change_in_d, temperature
-                    )
-                    enthalpy_calculation = calculate_enthalpy_change(
-                        change_in_enthalpy, change_in_a, change_in_b, change_in_c, change_in_d, temperature
-                    )
-
-                    delta_G = (
-                        change_in_enthalpy
-                        - temperature * change_in_entropy
-                        + contribution_of_coefficients
-                    )
-
-                else:
-                    print(
-                        f"Error: Substance '{substance_formula}' with state '{phase}' not found in the database. Skipping..."
-                    )
-        return (
-            delta_G,
-            heat_capacity,
-            enthalpy_calculation,
-            entropy_calculation,
-            temperature
-        )
+        species_index = as_species_index(processed_data)
+
+        # Parsing, balancing and the species sums are done once per reaction and reused
+        with span("engine.compile"):
+            reaction = compile_reaction(reaction_equation)
+        with span("engine.resolve"):
+            species, constants = reaction.resolve(species_index)
+        return evaluate_resolved_reaction(species, constants, temperature)
 
     except KeyError as e:
-        print(f"KeyError occurred while accessing the DataFrame columns: {e}")
+        logger.error(f"KeyError occurred while accessing the DataFrame columns: {e}")
         return None
 
     except IndexError as e:
-        print(f"IndexError occurred while accessing DataFrame elements: {e}")
+        logger.error(f"IndexError occurred while accessing DataFrame elements: {e}")
         return None
 
     except ValueError as e:
-        print(f"ValueError occurred: {e}")
+        logger.error(f"ValueError occurred: {e}")
         return None
 
     except Exception as e:
-        print(f"Error occurred: {e}")
+        logger.error(f"Error occurred: {e}")
         return None
 
-def calculate_freegibbs_single_element(processed_data, reaction_equation, temperature):
-    single_element = parse_reaction_equation(reaction_equation)
+def evaluate_resolved_reaction(species, constants, temperature):
+    """
+    Evaluate a reaction resolved by CompiledReaction.resolve at the given temperatures.
 
-    try:
-        for substances_1 in [(single_element)]:
-            for substance_1 in substances_1:
-                substance_formula = substance_1["formula"].strip()
-                phase = substance_1["phase"]
-
-                # Attempt exact match with phase included (e.g, "Al(g)")
-                substance_data = processed_data[
-                    (processed_data["Formula"] == f"{substance_formula}({phase})")
-                    & (processed_data["Phase"] == phase)
-                ]
-
-                # if the exact match fails, fallback to formula only search
-                if substance_data.empty:
-                    substance_data = processed_data[
-                        (processed_data["Formula"] == substance_formula)
-                        & (processed_data["Phase"] == phase)
-                    ]
-
-                if not substance_data.empty:
-                    delta_H = substance_data.iloc[0]["H 298 (kcal/mol)"]
-                    delta_S = substance_data.iloc[0]["S 298 (cal/mol*K)"]
-                    a_value = substance_data.iloc[0]["A"]
-                    b_value = substance_data.iloc[0]["B"]
-                    c_value = substance_data.iloc[0]["C"]
-                    d_value = substance_data.iloc[0]["D"]
-
-                    if a_value != 0:
-                        a_value /= 1000
-                    else:
-                        a_value = 1e-6
-
-                    if b_value != 0:
-                        b_value /= 1000
-                    else:
-                        b_value = 1e-6
-
-                    delta_G = (
-                        delta_H
-                        - temperature * delta_S
-                        + calculate_contribution_of_coefficients(
-                            a_value, b_value, c_value, d_value, temperature
-                        )
-                    )
-
-                    heat_capacity = calculate_heat_capacity(
-                        a_value, b_value, c_value, d_value, temperature
-                    )
-
-                    entropy_calculation = calculate_entropy_change(
-                        delta_S, a_value, b_value, c_value, d_value, temperature
-                    )
-                    enthalpy_calculation = calculate_enthalpy_change(
-                        delta_S, a_value, b_value, c_value, d_value, temperature
-                    )
-
-                else:
-                    print(
-                        f"Error: Substance '{substance_formula}' not found in the database."
-                    )
-                    return None
-
-        return delta_G, heat_capacity, enthalpy_calculation, entropy_calculation, temperature
+    Returns:
+        tuple: (delta_G, heat_capacity, enthalpy, entropy, temperature).
+    """
+    if constants is None or not all(is_linear_species(record) for _, record in species):
+        # Multi-range and auto-phase species are evaluated one by one and summed
+        return evaluate_reaction_species(species, temperature)
+    return evaluate_reaction_constants(constants, temperature)
 
-    except KeyError as e:
-        print(f"KeyError occurred while accessing the DataFrame columns: {e}")
-        return None
+@instrumented("engine.evaluate_constants")
+def evaluate_reaction_constants(constants, temperature):
+    """
+    Evaluate a reaction's temperature-dependent properties from its totals.
 
-    except IndexError as e:
-        print(f"IndexError occurred while accessing DataFrame elements: {e}")
-        return None
+    Args:
+        constants (ReactionConstants): Reaction totals from a CompiledReaction.
+        temperature (float or numpy.ndarray): Temperature in Kelvin.
+
+    Returns:
+        tuple: (delta_G, heat_capacity, enthalpy, entropy, temperature).
+    """
+    delta_h, delta_s, delta_a, delta_b, delta_c, delta_d = constants
 
+    contribution_of_coefficients = calculate_contribution_of_coefficients(
+        delta_a, delta_b, delta_c, delta_d, temperature
+    )
+    heat_capacity = calculate_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature)
+    entropy_calculation = calculate_entropy_change(
+        delta_s, delta_a, delta_b, delta_c, delta_d, temperature
+    )
+    enthalpy_calculation = calculate_enthalpy_change(
+        delta_h, delta_a, delta_b, delta_c, delta_d, temperature
+    )
+
+    delta_G = delta_h - temperature * delta_s + contribution_of_coefficients
+
+    return delta_G, heat_capacity, enthalpy_calculation, entropy_calculation, temperature
+
+@instrumented("engine.evaluate_species")
+def evaluate_reaction_species(species, temperature):
+    """
+    Evaluate a reaction as the stoichiometric sum of its species' properties.
+
+    Args:
+        species (tuple): (signed coefficient, SpeciesRecord) pairs from CompiledReaction.resolve.
+        temperature (float or numpy.ndarray): Temperature in Kelvin.
+
+    Returns:
+        tuple: (delta_G, heat_capacity, enthalpy, entropy, temperature).
+    """
+    totals = [0.0, 0.0, 0.0, 0.0]
+    for coefficient, record in species:
+        for position, value in enumerate(calculate_species_properties(record, temperature)):
+            totals[position] = totals[position] + coefficient * value
+    delta_G, heat_capacity, enthalpy, entropy = totals
+    return delta_G, heat_capacity, enthalpy, entropy, temperature
+
+class PhaseTransition(NamedTuple):
+    """A temperature at which the stable phase of an auto-phase species changes."""
+    formula: str
+    temperature: float
+    from_phase: str
+    to_phase: str
+
+
+def is_linear_species(record):
+    """True for a species with one coefficient set, which can be folded into ReactionConstants."""
+    return not isinstance(record, PhaseChoice) and len(record.segments) <= 1
+
+def phase_gibbs_energy(choice, gibbs, temperature):
+    """
+    Put the Gibbs energies of a PhaseChoice's phases in kcal/mol so they can be compared.
+
+    The engine's Gibbs energy subtracts T times S298 in cal/mol*K from H298 in kcal/mol,
+    which overweights entropy a thousandfold and would make the gas win at any
+    temperature. Here T * S298 is taken in kcal instead; the Cp terms already are.
+
+    Args:
+        choice (PhaseChoice): The phases of one formula.
+        gibbs (numpy.ndarray): Engine Gibbs energies, phases x temperatures.
+        temperature (float or numpy.ndarray): Temperature in Kelvin.
+
+    Returns:
+        numpy.ndarray: Gibbs energies in kcal/mol, shaped like gibbs.
+    """
+    s298 = np.array([record.s298 for record in choice.records], dtype=float).reshape(-1, *[1] * (np.ndim(gibbs) - 1))
+    return gibbs + temperature * s298 * (1 - 1 / 1000)
+
+@instrumented("engine.stable_phase")
+def select_stable_phase(choice, temperature):
+    """
+    Evaluate every phase of a PhaseChoice and keep the one with the lowest Gibbs energy.
+
+    Args:
+        choice (PhaseChoice): The phases of one formula.
+        temperature (float or numpy.ndarray): Temperature in Kelvin.
+
+    Returns:
+        tuple: (gibbs, heat_capacity, enthalpy, entropy, stable), where stable holds the
+        position in choice.records of the phase used at each temperature.
+    """
+    # phases x properties x temperatures
+    properties = np.array([
+        np.broadcast_arrays(*calculate_species_properties(record, temperature)) for record in choice.records
+    ])
+    stable = np.argmin(phase_gibbs_energy(choice, properties[:, 0], temperature), axis=0)
+    selected = np.take_along_axis(properties, np.broadcast_to(stable, properties.shape[1:])[None], axis=0)[0]
+    gibbs, heat_capacity, enthalpy, entropy = selected
+    return gibbs, heat_capacity, enthalpy, entropy, stable
+
+@instrumented("engine.phase_transitions")
+def find_phase_transitions(choice, temperatures):
+    """
+    Find where the stable phase of a PhaseChoice changes on an ascending temperature grid.
+
+    Each change between neighbouring grid points is placed where the Gibbs energies of
+    the two phases cross, interpolating linearly between the points.
+
+    Args:
+        choice (PhaseChoice): The phases of one formula.
+        temperatures (array-like): Ascending temperatures in Kelvin.
+
+    Returns:
+        list: PhaseTransition entries in temperature order.
+    """
+    temperatures = np.asarray(temperatures, dtype=float)
+    gibbs = np.array([
+        np.broadcast_to(calculate_species_properties(record, temperatures)[0], temperatures.shape)
+        for record in choice.records
+    ])
+    gibbs = phase_gibbs_energy(choice, gibbs, temperatures)
+    stable = np.argmin(gibbs, axis=0)
+    steps = np.flatnonzero(np.diff(stable))
+    before = stable[steps]
+    after = stable[steps + 1]
+
+    gap_low = gibbs[after, steps] - gibbs[before, steps]
+    gap_high = gibbs[after, steps + 1] - gibbs[before, steps + 1]
+    gap_change = gap_low - gap_high
+    fraction = np.divide(gap_low, gap_change, out=np.zeros_like(gap_change), where=gap_change != 0)
+    crossing = temperatures[steps] + fraction * (temperatures[steps + 1] - temperatures[steps])
+
+    return [
+        PhaseTransition(choice.formula, float(temperature), choice.records[old].phase, choice.records[new].phase)
+        for temperature, old, new in zip(crossing, before, after)
+    ]
+
+def find_reaction_phase_transitions(file_path, reaction_equation, temperatures):
+    """
+    Report the stable-phase transitions of a reaction's auto-phase species, e.g. "Al(*)".
+
+    Args:
+        file_path (str): Path to the species database.
+        reaction_equation (str): Reaction equation.
+        temperatures (array-like): Ascending temperatures in Kelvin.
+
+    Returns:
+        list: PhaseTransition entries, or None if the reaction could not be resolved.
+    """
+    repository = get_species_repository(file_path)
+    if repository is None:
+        logger.error("Error: Failed to parse Excel data.")
+        return None
+    try:
+        species, _ = compile_reaction(reaction_equation).resolve(repository.index)
     except ValueError as e:
-        print(f"ValueError occurred: {e}")
+        logger.error(f"ValueError occurred: {e}")
         return None
 
-    except Exception as e:
-        print(f"Error occurred: {e}")
-        return None
+    transitions = []
+    for _, record in species:
+        if isinstance(record, PhaseChoice):
+            transitions.extend(find_phase_transitions(record, temperatures))
+    return transitions
+
+def calculate_species_properties(record, temperature):
+    """
+    Evaluate one species' Gibbs energy, heat capacity, enthalpy and entropy terms.
 
+    A PhaseChoice is evaluated as its stable phase at each temperature. A species with several Cp segments uses, at each temperature, the segment whose T1
+    is the last one at or below it (the first and last segments extend past their
+    ranges). The active segment is picked with np.searchsorted, and every integral is
+    offset per segment so it stays continuous across the boundaries and is zero at 298 K.
+
+    Args:
+        record (SpeciesRecord or PhaseChoice): The species.
+        temperature (float or numpy.ndarray): Temperature in Kelvin.
+
+    Returns:
+        tuple: (gibbs, heat_capacity, enthalpy, entropy), each shaped like temperature.
+    """
+    if isinstance(record, PhaseChoice):
+        return select_stable_phase(record, temperature)[:4]
+
+    with span("engine.species_properties"):
+        segments = record.segments if len(record.segments) > 1 else [record]
+        coefficients = np.array(
+            [[scale_heat_capacity_coefficient(value) for value in (segment.a, segment.b, segment.c, segment.d)]
+             for segment in segments]
+        )
+        boundaries = np.array([segment.t1 for segment in segments[1:]], dtype=float)
+        active = np.searchsorted(boundaries, temperature, side="right")
+        delta_a, delta_b, delta_c, delta_d = coefficients[active].T
+
+        def offsets(function):
+            # A segment's offset is the previous one's plus the jump between the two at their boundary
+            jumps = function(*coefficients[:-1].T, boundaries) - function(*coefficients[1:].T, boundaries)
+            offset = np.concatenate([[0.0], np.cumsum(jumps)])
+            return (offset - offset[np.searchsorted(boundaries, 298, side="right")])[active]
+
+        gibbs = (
+            record.h298
+            - temperature * record.s298
+            + calculate_contribution_of_coefficients(delta_a, delta_b, delta_c, delta_d, temperature)
+        )
+        heat_capacity = calculate_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature)
+        enthalpy = record.h298 + integrate_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature)
+        entropy = record.s298 + integrate_heat_capacity_over_temperature(delta_a, delta_b, delta_c, delta_d, temperature)
+
+        if len(segments) == 1 and COMPARE_CP_INTEGRALS:
+            compare_species_integrals(record, temperature, enthalpy, entropy)
+        if len(segments) > 1:
+            gibbs = (
+                gibbs
+                + offsets(lambda *args: integrate_gibbs_heat_capacity(*args)[0])
+                - temperature * offsets(lambda *args: integrate_gibbs_heat_capacity(*args)[1])
+            )
+            heat_capacity = heat_capacity + offsets(calculate_heat_capacity)
+            enthalpy = enthalpy + offsets(integrate_heat_capacity)
+            entropy = entropy + offsets(integrate_heat_capacity_over_temperature)
+
+    return gibbs, heat_capacity, enthalpy, entropy
 
 def calculate_contribution_of_coefficients(delta_a, delta_b, delta_c, delta_d, temperature):
     """
@@ -272,16 +325,16 @@ def calculate_contribution_of_coefficients(delta_a, delta_b, delta_c, delta_d, t
         delta_b (float): Change in the 'b' coefficient.
         delta_c (float): Change in the 'c' coefficient.
         delta_d (float): Change in the 'd' coefficient.
-        temperature (float): Temperature in Kelvin.
+        temperature (float or numpy.ndarray): Temperature in Kelvin.
 
     Returns:
-        float: Contribution of coefficients to the Gibbs free energy.
+        float or numpy.ndarray: Contribution of coefficients to the Gibbs free energy.
     """
     term_1 = delta_a * (
         temperature
         - 298
-        - temperature * math.log(temperature)
-        + temperature * math.log(298)
+        - temperature * np.log(temperature)
+        + temperature * np.log(298)
     )
     term_2 = delta_b * 10**-3 * (298 * temperature - 0.5 * temperature**2 - 0.5 * 298**2)
     term_3 = delta_c * 10**5 * (-0.5/temperature + 1/298 - 0.5*temperature/298**2)
@@ -291,10 +344,6 @@ def calculate_contribution_of_coefficients(delta_a, delta_b, delta_c, delta_d, t
 
     return result_1
 
-def is_single_element_formula(reaction_equation):
-    # Check if the reaction equation contains only the "=" sign
-    return "=" in reaction_equation and "+" not in reaction_equation
-
 def calculate_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature):
     """
     Calculate the heat capacity at a given temperature.
@@ -304,10 +353,10 @@ def calculate_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature):
         delta_b (float): Change in the 'b' coefficient.
         delta_c (float): Change in the 'c' coefficient.
         delta_d (float): Change in the 'd' coefficient.
-        temperature (float): Temperature in Kelvin.
+        temperature (float or numpy.ndarray): Temperature in Kelvin.
 
     Returns:
-        float: Heat capacity at the given temperature.
+        float or numpy.ndarray: Heat capacity at the given temperature.
     """
     term_1 = delta_a * (temperature - 298)
     term_2 = delta_b * 10**-3 * 0.5 * (temperature**2 - 298**2)
@@ -316,92 +365,216 @@ def calculate_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature):
     result_1 = term_1 + term_2 + term_3 + term_4
     return result_1
 
-def calculate_enthalpy_change(enthalpy_298, delta_a, delta_b, delta_c, delta_d, temperature):
+@instrumented("engine.enthalpy_integral")
+def calculate_enthalpy_change(enthalpy_298, delta_a, delta_b, delta_c, delta_d, temperature, compare=None):
     """
     Calculate the enthalpy change (ΔH°T) at a given temperature T.
 
+    The heat capacity term is integrated in closed form from 298 K to T, replacing the
+    former 1 K summation. Set SMK_COMPARE_CP_INTEGRALS=1 (or pass compare=True) to check
+    the result against that summation.
+
     Args:
         enthalpy_298 (float): Enthalpy at 298 K.
         delta_a (float): Change in the 'a' coefficient.
         delta_b (float): Change in the 'b' coefficient.
         delta_c (float): Change in the 'c' coefficient.
         delta_d (float): Change in the 'd' coefficient.
-        temperature (float): Temperature in Kelvin.
+        temperature (float or numpy.ndarray): Temperature in Kelvin.
+        compare (bool, optional): Compare against the 1 K summation. Defaults to COMPARE_CP_INTEGRALS.
 
     Returns:
-        float: Enthalpy change (ΔH°T) at the given temperature.
+        float or numpy.ndarray: Enthalpy change (ΔH°T) at the given temperature.
     """
-    integral = 0
-    for T in range(298, int(temperature + 1), 1):
-        integral += calculate_heat_capacity(delta_a, delta_b, delta_c, delta_d, T)
+    integral = integrate_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature)
+
+    if COMPARE_CP_INTEGRALS if compare is None else compare:
+        compare_cp_integrals(
+            "enthalpy",
+            integral,
+            summed_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature),
+            calculate_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature),
+            temperature,
+        )
 
     enthalpy_change = enthalpy_298 + integral
 
     return enthalpy_change
 
-def calculate_entropy_change(entropy_298, delta_a, delta_b, delta_c, delta_d, temperature):
+@instrumented("engine.entropy_integral")
+def calculate_entropy_change(entropy_298, delta_a, delta_b, delta_c, delta_d, temperature, compare=None):
     """
     Calculate the entropy change (ΔS°T) at a given temperature T.
 
+    The heat capacity term divided by T is integrated in closed form from 298 K to T,
+    replacing the former 1 K summation. Set SMK_COMPARE_CP_INTEGRALS=1 (or pass
+    compare=True) to check the result against that summation.
+
     Args:
         entropy_298 (float): Entropy at 298 K.
         delta_a (float): Change in the 'a' coefficient.
         delta_b (float): Change in the 'b' coefficient.
         delta_c (float): Change in the 'c' coefficient.
         delta_d (float): Change in the 'd' coefficient.
-        temperature (float): Temperature in Kelvin.
+        temperature (float or numpy.ndarray): Temperature in Kelvin.
+        compare (bool, optional): Compare against the 1 K summation. Defaults to COMPARE_CP_INTEGRALS.
+
+    Returns:
+        float or numpy.ndarray: Entropy change (ΔS°T) at the given temperature.
+    """
+    integral = integrate_heat_capacity_over_temperature(delta_a, delta_b, delta_c, delta_d, temperature)
+
+    if COMPARE_CP_INTEGRALS if compare is None else compare:
+        compare_cp_integrals(
+            "entropy",
+            integral,
+            summed_heat_capacity_over_temperature(delta_a, delta_b, delta_c, delta_d, temperature),
+            calculate_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature) / temperature,
+            temperature,
+        )
+
+    entropy_change = entropy_298 + integral
+
+    return entropy_change
+
+def integrate_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature):
+    """
+    Integrate calculate_heat_capacity from 298 K to T in closed form.
+
+    Args:
+        delta_a (float): Change in the 'a' coefficient.
+        delta_b (float): Change in the 'b' coefficient.
+        delta_c (float): Change in the 'c' coefficient.
+        delta_d (float): Change in the 'd' coefficient.
+        temperature (float or numpy.ndarray): Temperature in Kelvin.
+
+    Returns:
+        float or numpy.ndarray: The integral of the heat capacity term over [298, T].
+    """
+    log_ratio = np.log(temperature / 298)
+    term_1 = delta_a * 0.5 * (temperature - 298)**2
+    term_2 = delta_b * 10**-3 * 0.5 * ((temperature**3 - 298**3) / 3 - 298**2 * (temperature - 298))
+    term_3 = delta_c * 10**5 * ((temperature - 298) / 298 - log_ratio)
+    term_4 = delta_d * 10**-6 * 1/3 * ((temperature**4 - 298**4) / 4 - 298**3 * (temperature - 298))
+    return term_1 + term_2 + term_3 + term_4
+
+def integrate_heat_capacity_over_temperature(delta_a, delta_b, delta_c, delta_d, temperature):
+    """
+    Integrate calculate_heat_capacity / T from 298 K to T in closed form.
+
+    Args:
+        delta_a (float): Change in the 'a' coefficient.
+        delta_b (float): Change in the 'b' coefficient.
+        delta_c (float): Change in the 'c' coefficient.
+        delta_d (float): Change in the 'd' coefficient.
+        temperature (float or numpy.ndarray): Temperature in Kelvin.
+
+    Returns:
+        float or numpy.ndarray: The integral of the heat capacity term divided by T over [298, T].
+    """
+    log_ratio = np.log(temperature / 298)
+    term_1 = delta_a * ((temperature - 298) - 298 * log_ratio)
+    term_2 = delta_b * 10**-3 * 0.5 * ((temperature**2 - 298**2) / 2 - 298**2 * log_ratio)
+    term_3 = delta_c * 10**5 * (log_ratio / 298 + 1/temperature - 1/298)
+    term_4 = delta_d * 10**-6 * 1/3 * ((temperature**3 - 298**3) / 3 - 298**3 * log_ratio)
+    return term_1 + term_2 + term_3 + term_4
+
+def integrate_gibbs_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature):
+    """
+    Integrate the heat capacity behind calculate_contribution_of_coefficients from 298 K to T.
+
+    The contribution of coefficients is the first integral minus T times the second, so
+    these are the pieces that have to be carried across Cp segment boundaries.
+
+    Args:
+        delta_a (float): Change in the 'a' coefficient.
+        delta_b (float): Change in the 'b' coefficient.
+        delta_c (float): Change in the 'c' coefficient.
+        delta_d (float): Change in the 'd' coefficient.
+        temperature (float or numpy.ndarray): Temperature in Kelvin.
 
     Returns:
-        float: Entropy change (ΔS°T) at the given temperature.
+        tuple: (integral of Cp, integral of Cp / T) over [298, T].
     """
+    integral = (
+        delta_a * (temperature - 298)
+        + delta_b * 10**-3 * 0.5 * (temperature**2 - 298**2)
+        + delta_c * 10**5 * (1/298 - 1/temperature)
+        + delta_d * 10**-3 * 1/3 * (temperature**3 - 298**3)
+    )
+    integral_over_temperature = (
+        delta_a * np.log(temperature / 298)
+        + delta_b * 10**-3 * (temperature - 298)
+        + delta_c * 10**5 * 0.5 * (1/298**2 - 1/temperature**2)
+        + delta_d * 10**-3 * 0.5 * (temperature**2 - 298**2)
+    )
+    return integral, integral_over_temperature
+
+def summed_heat_capacity(delta_a, delta_b, delta_c, delta_d, temperature):
+    """Reference 1 K summation formerly used by calculate_enthalpy_change."""
+    if np.ndim(temperature):
+        return np.vectorize(
+            lambda T: summed_heat_capacity(delta_a, delta_b, delta_c, delta_d, T), otypes=[float]
+        )(temperature)
+    integral = 0
+    for T in range(298, int(temperature + 1), 1):
+        integral += calculate_heat_capacity(delta_a, delta_b, delta_c, delta_d, T)
+    return integral
+
+def summed_heat_capacity_over_temperature(delta_a, delta_b, delta_c, delta_d, temperature):
+    """Reference 1 K summation formerly used by calculate_entropy_change."""
+    if np.ndim(temperature):
+        return np.vectorize(
+            lambda T: summed_heat_capacity_over_temperature(delta_a, delta_b, delta_c, delta_d, T), otypes=[float]
+        )(temperature)
     integral = 0
     for T in range(298, int(temperature), 1):
         integral += calculate_heat_capacity(delta_a, delta_b, delta_c, delta_d, T) / T
+    return integral
 
-    entropy_change = entropy_298 + integral
+def compare_species_integrals(record, temperature, enthalpy, entropy):
+    """
+    Check one species' enthalpy and entropy against the 1 K summations.
 
-    return entropy_change
+    This is what SMK_COMPARE_CP_INTEGRALS=1 runs on the batch, plot and parallel paths,
+    which build species columns instead of calling calculate_enthalpy_change. Only
+    single-range species are compared, as the summation takes one coefficient set.
+
+    Returns:
+        bool: True when both integrals agree.
+    """
+    coefficients = [scale_heat_capacity_coefficient(value) for value in (record.a, record.b, record.c, record.d)]
+    heat_capacity = calculate_heat_capacity(*coefficients, temperature)
+    enthalpy_agrees = compare_cp_integrals(
+        "enthalpy", enthalpy - record.h298, summed_heat_capacity(*coefficients, temperature), heat_capacity, temperature
+    )
+    entropy_agrees = compare_cp_integrals(
+        "entropy",
+        entropy - record.s298,
+        summed_heat_capacity_over_temperature(*coefficients, temperature),
+        heat_capacity / temperature,
+        temperature,
+    )
+    return enthalpy_agrees and entropy_agrees
+
+def compare_cp_integrals(quantity, closed_form, summed, integrand_at_temperature, temperature, rtol=1e-3):
+    """
+    Report whether a closed-form Cp integral agrees with the 1 K summation.
 
+    A 1 K rectangle sum differs from the exact integral by up to roughly one integrand
+    value at the upper end (plus the part lost to int(temperature) truncation), so that
+    amount is allowed on top of the relative tolerance.
+
+    Returns:
+        bool: True when the two values agree.
+    """
+    difference = np.abs(closed_form - summed)
+    allowance = rtol * np.maximum(np.abs(closed_form), np.abs(summed)) + 2 * np.abs(integrand_at_temperature)
+    agrees = bool(np.all(difference <= allowance))
+    if not agrees:
+        logger.warning(
+            f"Warning: closed-form {quantity} integral {closed_form} differs from the 1 K summation "
+            f"{summed} by {difference} at T = {temperature} K (allowed {allowance})."
+        )
+    return agrees
 
-def create_temp_dataframe(file_path, reaction_equations):
-    # Initialize empty DataFrame to store the filtered data
-
-    processed_data = parse_database_chemical_speacies(file_path)
-    temp_df = pd.DataFrame()
-
-    reactants, products = parse_reaction_equation(reaction_equations)
-
-    for label, substances in [("Reactant", reactants), ("Product", products)]:
-        for substance in substances:
-            # Ensure that substance is a dictionary
-            if isinstance(substance, dict):
-                substance_formula = substance["formula"].strip()
-                phase = substance["phase"]
-
-                # Attempt exact match with phase included (e.g, "Al(g)")
-                substance_data = processed_data[
-                    (processed_data["Formula"] == f"{substance_formula}({phase})")
-                    & (processed_data["Phase"] == phase)
-                ]
-
-                # if the exact match fails, fallback to formula only search
-                if substance_data.empty:
-                    substance_data = processed_data[
-                        (processed_data["Formula"] == substance_formula)
-                        & (processed_data["Phase"] == phase)
-                    ]
-
-                # If we found matching data, append it to our temporary DataFrame
-                if not substance_data.empty:
-                    temp_df = pd.concat([temp_df, substance_data], ignore_index=True)
-                else:
-                    print(f"Warning: No data found for {substance_formula}({phase})")
-            else:
-                print(
-                    f"Warning: Expected a dictionary for substance, got {type(substance)} instead."
-                )
-
-    # Remove any duplicate rows that might have been added
-    temp_df = temp_df.drop_duplicates()
-
-    return temp_df
@@ -1,9 +1,16 @@
+import logging
+
 import numpy as np
-from matplotlib import pyplot as plt
-import pandas as pd
-from calculation_file_module.calculation_engine_properties import perform_calculations
-from data_process_file.equation_processor import balance_equation
+from calculation_file_module.adaptive_sampling import sample_reaction
+from calculation_file_module.batch_engine import calculate_reactions_batch
+from calculation_file_module.ellingham_analysis import EllinghamIndex, per_mole_of_oxygen
+from calculation_file_module.plot_manager import curve_plot_for
+from data_process_file.instrumentation import instrumented, span
+from data_process_file.species_repository import get_species_repository
+
+logger = logging.getLogger(__name__)
 
+@instrumented("plot.ellingham")
 def plot_ellingham_diagram(
     file_path,
     reaction_equations,
@@ -11,92 +18,161 @@ def plot_ellingham_diagram(
     temperature_to,
     temperature_step,
     canvas,
+    adaptive=False,
+    tolerance=None,
+    annotate=False,
 ):
-    # Generate temperature range
-    temperatures = np.linspace(temperature_from, temperature_to, temperature_step)
+    """
+    Plot the Delta G of reactions against temperature on a canvas's Ellingham diagram.
+
+    Curves are drawn per mole of O2, see plot_reaction_curve.
+
+    With adaptive=True each curve gets its own temperatures from sample_reaction, dense
+    around phase changes and sparse along straight stretches, and temperature_step is
+    the most points a curve may use.
+
+    Args:
+        file_path (str): Path to the species database or compiled store.
+        reaction_equations (list): Reaction equations.
+        temperature_from (float): Lower end of the range in Kelvin.
+        temperature_to (float): Upper end of the range in Kelvin.
+        temperature_step (int): Number of temperatures, or the most per curve when adaptive.
+        canvas: A matplotlib canvas.
+        adaptive (bool): Sample each curve adaptively instead of on one uniform grid.
+        tolerance (float, optional): Delta G tolerance of the adaptive sampling.
+        annotate (bool): Mark where the curves cross and shade the lowest curve, see
+            annotate_ellingham.
+
+    Returns:
+        dict: Reaction equation -> number of points its curve used, for the reactions plotted.
+    """
     reaction_equations = [eq.strip() for eq in reaction_equations]
 
-    # Clear the previous plot on the canvas
-    canvas.figure.clf()
-    ax = canvas.figure.add_subplot(111)  # Add a subplot for the plot
-
-    max_delta_G = float("-inf")  # Initialize max_delta_G to negative infinity
-    min_delta_G = float("inf")  # Initialize min_delta_G to positive infinity
-
-    for reaction_eq in reaction_equations:
-        if "=" not in reaction_eq and "+" not in reaction_eq:
-            # If no balancing required
-            balanced_eq = reaction_eq
-        else:
-            # If balancing is required
-            balanced_reactants, balanced_products = balance_equation(reaction_eq)
-            balanced_eq = (
-                " + ".join(balanced_reactants) + " = " + " + ".join(balanced_products)
-            )
-
-        # Initialize lists to store calculated values
-        delta_G_values = []
-        heat_capacity_list = []
-        enthalpy_list = []
-        entropy_list = []
-        temperature_list = []
-
-        for temperature in temperatures:
-            # Perform calculations
-            delta_G, heat_capacity, enthalpy, entropy, temperature_1 = (
-                perform_calculations(file_path, temperature, reaction_eq)
-            )
-
-            # Store results
-            delta_G_values.append(delta_G)
-            heat_capacity_list.append(heat_capacity)
-            enthalpy_list.append(enthalpy)
-            entropy_list.append(entropy)
-            temperature_list.append(temperature_1)
-
-            # Update min/max delta G
-            max_delta_G = max(max_delta_G, delta_G)
-            min_delta_G = min(min_delta_G, delta_G)
-
-        # Create a DataFrame (if needed for debugging or saving)
-        df = pd.DataFrame(
-            {
-                "Temperature (K)": temperature_list,
-                "H°298": enthalpy_list,
-                "S°298": entropy_list,
-                "Heat Capacity": heat_capacity_list,
-                "Delta G (kJ/mol)": delta_G_values,
-            }
-        )
-        print(df)  # For debugging; remove in production
-
-        # Plot data
-        color = np.random.rand(3)
-        ax.plot(
-            temperatures,
-            delta_G_values,
-            label=balanced_eq,
-            color=color,
-        )
-        # Annotate the start point of the reaction
-        ax.text(
-            temperatures[0],
-            delta_G_values[0],
-            balanced_eq,
-            fontsize=8,
-            color=color,
-            horizontalalignment="left",
-            verticalalignment="bottom",
-            fontweight="bold",
-        )
+    # Curves already on the canvas are updated in place
+    plot = ellingham_plot(canvas)
+
+    if adaptive:
+        repository = get_species_repository(file_path)
+        if repository is None:
+            logger.error("Error: Failed to parse Excel data.")
+            plot.redraw()
+            return {}
+        with span("plot.calculate"):
+            curves = [
+                (sample_reaction(repository.index, eq, temperature_from, temperature_to, tolerance,
+                                 max_points=temperature_step), 0)
+                for eq in reaction_equations
+            ]
+    else:
+        # Generate temperature range
+        temperatures = np.linspace(temperature_from, temperature_to, temperature_step)
+
+        # Every reaction is evaluated over the whole grid in one batch of matrix products
+        with span("plot.calculate"):
+            results = calculate_reactions_batch(file_path, reaction_equations, temperatures)
+        if results is None:
+            plot.redraw()
+            return {}
+        curves = [(results, row) for row in range(len(results.equations))]
 
-    # Set plot labels, title, and limits
-    ax.set_xlabel("Temperature (K)")
-    ax.set_ylabel("Delta G (kJ/mol)")
-    ax.set_title("Ellingham Diagram")
-    ax.set_ylim(min_delta_G - 50, max_delta_G + 50)  # Adjust y-axis limits
-    ax.axhline(y=0, color="k", linestyle="-", linewidth=0.5)  # Add y=0 line
-    ax.legend(fontsize=8)
+    plot.retain(reaction_equations)
+    points = {}
+    for results, row in curves:
+        if plot_reaction_curve(plot, results, row):
+            points[results.equations[row]] = results.temperatures.size
+            if adaptive:
+                logger.info(f"{results.labels[row]}: {results.temperatures.size} points")
+
+    if annotate:
+        with span("plot.annotate"):
+            annotate_ellingham(plot, EllinghamIndex(
+                ((results.equations[row], results.temperatures, results.delta_G[row]) for results, row in curves),
+                {results.equations[row]: results.labels[row] for results, row in curves},
+            ))
 
     # Draw the updated canvas
-    canvas.draw()
+    plot.redraw()
+    return points
+
+def ellingham_plot(canvas):
+    """
+    Return the CurvePlot holding a canvas's Ellingham diagram, creating it on first use.
+
+    Args:
+        canvas: A matplotlib canvas.
+
+    Returns:
+        CurvePlot: Curves keyed by reaction equation; call redraw() to show changes.
+    """
+    return curve_plot_for(canvas, "Delta G per mol O2", "Ellingham Diagram")
+
+@instrumented("plot.curve")
+def plot_reaction_curve(plot, results, row):
+    """
+    Add or update one reaction of a BatchResults on an Ellingham diagram.
+
+    Delta G is divided by the reaction's O2 coefficient, so "4Al + 3O2 = 2Al2O3" and
+    "2C + O2 = 2CO" are drawn on one scale and where they cross is where EllinghamIndex
+    finds it. A reaction that does not consume O2 is drawn as it is.
+
+    Args:
+        plot (CurvePlot): Plot from ellingham_plot.
+        results (BatchResults): Results holding the reaction.
+        row (int): The reaction's row in results.
+
+    Returns:
+        bool: False if the reaction could not be calculated.
+    """
+    reaction_eq = results.equations[row]
+    balanced_eq = results.labels[row]
+    if balanced_eq is None:
+        logger.error(f"Error: Calculation failed for '{reaction_eq}'. Skipping...")
+        plot.remove_curve(reaction_eq)
+        return False
+
+    temperatures = results.temperatures
+    delta_G_values = per_mole_of_oxygen(reaction_eq, results.delta_G[row])
+    if delta_G_values is None:
+        delta_G_values = results.delta_G[row]
+
+    # Mark where an auto-phase species such as "Al(*)" changes its stable phase
+    transition_temperatures = []
+    for transition in results.transitions[row]:
+        logger.info(
+            f"{balanced_eq}: {transition.formula} changes from ({transition.from_phase}) "
+            f"to ({transition.to_phase}) at {transition.temperature:.1f} K"
+        )
+        transition_temperatures.append(transition.temperature)
+    markers = (transition_temperatures, np.interp(transition_temperatures, temperatures, delta_G_values))
+
+    plot.set_curve(reaction_eq, temperatures, delta_G_values, balanced_eq, markers)
+    return True
+
+def annotate_ellingham(plot, index):
+    """
+    Show where the curves of an Ellingham diagram cross and which curve is lowest.
+
+    The lower envelope is shaded under the curves and every crossing is marked with
+    its temperature. Crossings on the envelope, where the most stable oxide changes,
+    are labelled first and logged.
+
+    Args:
+        plot (CurvePlot): Plot from ellingham_plot.
+        index (EllinghamIndex): Index of the curves on the plot.
+    """
+    for previous, piece in zip(index.envelope, index.envelope[1:]):
+        logger.info(
+            f"Most stable above {piece.temperature_from:.1f} K: {index.label(piece.equation)} "
+            f"(was {index.label(previous.equation)})"
+        )
+    if not index.crossings:
+        plot.set_overlay(index.envelope_curve() if index.envelope else None)
+        return
+
+    envelope_changes = {piece.temperature_from for piece in index.envelope}
+    crossings = sorted(index.crossings, key=lambda crossing: crossing.temperature not in envelope_changes)
+    plot.set_overlay(
+        index.envelope_curve(),
+        ([crossing.temperature for crossing in crossings], [crossing.delta_G for crossing in crossings]),
+        [f"{crossing.temperature:.0f} K" for crossing in crossings],
+    )
@@ -0,0 +1,399 @@
+"""
+Crossings and the lower envelope of the Delta G curves of an Ellingham diagram.
+
+An Ellingham diagram is read by asking where two lines cross and which line is lowest,
+that is which oxide is the most stable, at a temperature. EllinghamIndex answers both
+from the sampled curves:
+
+    index = EllinghamIndex.from_results(store.results())
+    index.most_stable(1200)                           # "2Mg(s) + O2(g) = 2MgO(s)"
+    index.crossings_of("2C(s) + O2(g) = 2CO(g)")      # where carbon overtakes each oxide
+    index.reducing_agents("2Fe(s) + O2(g) = 2FeO(s)", 800, 1500)
+
+Every curve is a polyline over increasing temperatures, so a Bentley-Ottmann sweep
+finds all crossings. The curves are kept in Delta G order along the sweep and only
+neighbours in that order are intersected: when they become neighbours, or when one
+of them moves on to its next segment. For N points in all and K crossings that is
+O((N + K) log N) heap events, where testing every pair of segments is O(n^2 m) for n
+curves of m points. The order is a plain list; its O(n) inserts cost less than a
+balanced tree for the curves one diagram holds.
+
+The bottom of the order is the lower envelope. Its pieces are kept with their start
+temperatures, so most_stable is one binary search. Curves that touch without changing
+order do not cross, nor do curves closer than COINCIDENT_TOLERANCE of the largest Delta G,
+such as one reaction entered twice with its terms in another order.
+
+Curves are only comparable per mole of O2: "4Al + 3O2 = 2Al2O3" is written for three,
+"2C + O2 = 2CO" for one. Each Delta G is divided by its reaction's O2 coefficient as it
+is added, and reactions without O2 as a reactant are left out. On that scale a reaction
+below another one means its metal reduces the other's oxide; that is what
+reducing_agents reports.
+"""
+import bisect
+import heapq
+from typing import NamedTuple
+
+import numpy as np
+
+from calculation_file_module.reaction_compiler import compile_reaction
+from data_process_file.instrumentation import instrumented
+
+# Sweep events at one temperature are handled in this order, so a crossing landing on a
+# vertex swaps the two curves before either moves on to its next segment
+_CROSS, _VERTEX, _END, _START = range(4)
+
+# Share of the largest |Delta G| below which two curves count as the same line
+COINCIDENT_TOLERANCE = 1e-9
+
+
+class Crossing(NamedTuple):
+    """
+    A temperature where two Delta G curves cross.
+
+    stable_below is the equation with the lower Delta G just below the temperature, and
+    stable_above the one lower just above it.
+    """
+    temperature: float
+    delta_G: float
+    stable_below: str
+    stable_above: str
+
+
+class CurveRange(NamedTuple):
+    """A temperature range over which a curve has some property, e.g. is the lowest."""
+    equation: str
+    temperature_from: float
+    temperature_to: float
+
+
+def _sweep(times, values, tolerance=0.0):
+    """
+    Sweep polylines from low to high temperature.
+
+    Args:
+        times (list): Per curve, a list of strictly increasing temperatures.
+        values (list): Per curve, a list of Delta G at those temperatures.
+        tolerance (float): How far one curve must get below the other to cross it.
+
+    Returns:
+        tuple: (crossings, envelope) where crossings lists (temperature, delta_G, lower,
+        upper) in temperature order, lower being the curve below before the crossing,
+        and envelope lists (temperature, curve) each time the lowest curve changes,
+        curve being None where no curve is defined.
+    """
+    segment = [0] * len(times)
+    status = []
+    events = [(curve_times[0], _START, curve, curve, -1, 0, 0) for curve, curve_times in enumerate(times)]
+    heapq.heapify(events)
+    sequence = len(events)
+    crossings = []
+    envelope = []
+
+    def value(curve, temperature):
+        position = segment[curve]
+        curve_times = times[curve]
+        curve_values = values[curve]
+        low = curve_times[position]
+        return curve_values[position] + (curve_values[position + 1] - curve_values[position]) * (
+            (temperature - low) / (curve_times[position + 1] - low)
+        )
+
+    def slope(curve):
+        position = segment[curve]
+        return (values[curve][position + 1] - values[curve][position]) / (
+            times[curve][position + 1] - times[curve][position]
+        )
+
+    def push(temperature, kind, curve, other=-1, version=0, other_version=0):
+        nonlocal sequence
+        sequence += 1
+        heapq.heappush(events, (temperature, kind, sequence, curve, other, version, other_version))
+
+    def check(lower, upper, temperature):
+        # Segment ends at this temperature move on first; their vertex events recheck
+        end = min(times[lower][segment[lower] + 1], times[upper][segment[upper] + 1])
+        if end <= temperature:
+            return
+        gap_end = value(upper, end) - value(lower, end)
+        if gap_end < -tolerance:
+            gap = value(upper, temperature) - value(lower, temperature)
+            fraction = gap / (gap - gap_end) if gap > 0 else 0.0
+            push(temperature + (end - temperature) * fraction, _CROSS, lower, upper, segment[lower], segment[upper])
+
+    def check_around(position, temperature):
+        # The pairs a curve at position forms with its neighbours
+        if position > 0:
+            check(status[position - 1], status[position], temperature)
+        if position + 1 < len(status):
+            check(status[position], status[position + 1], temperature)
+
+    def push_next(curve):
+        following = segment[curve] + 1
+        push(times[curve][following], _END if following == len(times[curve]) - 1 else _VERTEX, curve)
+
+    while events:
+        temperature, kind, _, curve, other, version, other_version = heapq.heappop(events)
+        if kind == _CROSS:
+            # Stale if either curve has moved on or they are no longer neighbours
+            if segment[curve] != version or segment[other] != other_version or curve not in status:
+                continue
+            position = status.index(curve)
+            if position + 1 >= len(status) or status[position + 1] != other:
+                continue
+            status[position], status[position + 1] = other, curve
+            crossings.append((temperature, value(curve, temperature), curve, other))
+            if position == 0:
+                envelope.append((temperature, other))
+            if position > 0:
+                check(status[position - 1], other, temperature)
+            if position + 2 < len(status):
+                check(curve, status[position + 2], temperature)
+        elif kind == _VERTEX:
+            segment[curve] += 1
+            push_next(curve)
+            check_around(status.index(curve), temperature)
+        elif kind == _END:
+            position = status.index(curve)
+            del status[position]
+            if position == 0:
+                envelope.append((temperature, status[0] if status else None))
+            if 0 < position < len(status):
+                check(status[position - 1], status[position], temperature)
+        else:
+            # Curves starting level are ordered by where they head next
+            position = bisect.bisect_left(
+                status, (value(curve, temperature), slope(curve)), key=lambda s: (value(s, temperature), slope(s))
+            )
+            status.insert(position, curve)
+            push_next(curve)
+            if position == 0:
+                envelope.append((temperature, curve))
+            check_around(position, temperature)
+    return crossings, envelope
+
+
+def oxygen_coefficient(equation):
+    """
+    Return the moles of O2 a balanced reaction consumes, e.g. 3 for "4Al + 3O2 = 2Al2O3".
+
+    Returns:
+        float: O2 on the reactant side less any on the product side, or None if the
+        reaction does not consume O2 or cannot be parsed.
+    """
+    try:
+        reaction = compile_reaction(equation)
+    except ValueError:
+        return None
+    consumed = sum(
+        sign * substance["coefficient"]
+        for sign, substances in ((1, reaction.reactants), (-1, reaction.products))
+        for substance in substances
+        if substance["formula"].strip() == "O2"
+    )
+    return float(consumed) if consumed > 0 else None
+
+
+def per_mole_of_oxygen(equation, delta_G):
+    """
+    Scale a reaction's Delta G to one mole of O2, as an Ellingham diagram plots it.
+
+    Returns:
+        The Delta G divided by oxygen_coefficient(equation), or None without O2 consumed.
+    """
+    coefficient = oxygen_coefficient(equation)
+    if coefficient is None:
+        return None
+    return np.asarray(delta_G, dtype=float) / coefficient
+
+
+class EllinghamIndex:
+    """
+    Crossings and lower envelope of Delta G curves, with binary search queries.
+
+    Args:
+        curves (iterable): (equation, temperatures, delta_G) per curve. Points with a
+            NaN Delta G are dropped and curves left with fewer than two points ignored.
+        labels (dict, optional): Equation -> balanced label, e.g. for annotations.
+        normalize (bool): Divide each Delta G by its reaction's O2 coefficient and leave
+            out reactions that do not consume O2. Pass False for curves that are already
+            on one scale, e.g. polylines that are not reactions.
+    """
+
+    @instrumented("analysis.ellingham_index")
+    def __init__(self, curves, labels=None, normalize=True):
+        self.labels = dict(labels or {})
+        self._curves = {}
+        for equation, temperatures, delta_G in curves:
+            if normalize:
+                delta_G = per_mole_of_oxygen(equation, delta_G)
+                if delta_G is None:
+                    continue
+            temperatures = np.asarray(temperatures, dtype=float)
+            delta_G = np.asarray(delta_G, dtype=float)
+            finite = np.isfinite(temperatures) & np.isfinite(delta_G)
+            temperatures, first = np.unique(temperatures[finite], return_index=True)
+            if temperatures.size >= 2:
+                self._curves[equation] = (temperatures, delta_G[finite][first])
+
+        equations = list(self._curves)
+        scale = max((float(np.abs(delta_G).max()) for _, delta_G in self._curves.values()), default=0.0)
+        self._tolerance = COINCIDENT_TOLERANCE * scale
+        crossings, envelope = _sweep(
+            [self._curves[equation][0].tolist() for equation in equations],
+            [self._curves[equation][1].tolist() for equation in equations],
+            self._tolerance,
+        )
+        self.crossings = [
+            Crossing(temperature, delta_G, equations[lower], equations[upper])
+            for temperature, delta_G, lower, upper in crossings
+        ]
+
+        # Crossing temperatures of each curve, and of each pair of curves
+        self._crossings_by_equation = {equation: [] for equation in equations}
+        self._pair_temperatures = {}
+        for crossing in self.crossings:
+            for equation in (crossing.stable_below, crossing.stable_above):
+                self._crossings_by_equation[equation].append(crossing)
+            pair = frozenset((crossing.stable_below, crossing.stable_above))
+            self._pair_temperatures.setdefault(pair, []).append(crossing.temperature)
+
+        self.envelope = []
+        for (start, curve), (end, _) in zip(envelope, envelope[1:]):
+            if curve is None or end <= start:
+                continue
+            if self.envelope and self.envelope[-1].equation == equations[curve]:
+                self.envelope[-1] = self.envelope[-1]._replace(temperature_to=end)
+            else:
+                self.envelope.append(CurveRange(equations[curve], start, end))
+        self._envelope_starts = [piece.temperature_from for piece in self.envelope]
+
+    @classmethod
+    def from_results(cls, results):
+        """
+        Build the index from a BatchResults or a list of ReactionResults.
+
+        Reactions that could not be calculated, or do not consume O2, are left out.
+        """
+        if hasattr(results, "equations"):
+            rows = [
+                (equation, label, results.temperatures, results.delta_G[row])
+                for row, (equation, label) in enumerate(zip(results.equations, results.labels))
+            ]
+        else:
+            rows = [(result.equation, result.label, result.temperatures, result.delta_G) for result in results]
+        rows = [row for row in rows if row[1] is not None]
+        return cls(
+            ((equation, temperatures, delta_G) for equation, _, temperatures, delta_G in rows),
+            {equation: label for equation, label, _, _ in rows},
+        )
+
+    def __len__(self):
+        return len(self._curves)
+
+    def __contains__(self, equation):
+        return equation in self._curves
+
+    def label(self, equation):
+        return self.labels.get(equation, equation)
+
+    def delta_G(self, equation, temperature):
+        """Delta G of a curve at a temperature by linear interpolation, NaN outside its range."""
+        temperatures, delta_G = self._curves[equation]
+        if not temperatures[0] <= temperature <= temperatures[-1]:
+            return float("nan")
+        return float(np.interp(temperature, temperatures, delta_G))
+
+    def most_stable(self, temperature):
+        """
+        Return the equation with the lowest Delta G at a temperature.
+
+        Returns:
+            str: The equation, or None outside every curve's range.
+        """
+        position = bisect.bisect_right(self._envelope_starts, temperature) - 1
+        if position < 0:
+            return None
+        piece = self.envelope[position]
+        return piece.equation if temperature <= piece.temperature_to else None
+
+    def crossings_of(self, equation, temperature_from=None, temperature_to=None):
+        """
+        Return the crossings of one curve, optionally only those in a temperature range.
+
+        Returns:
+            list: Crossings in temperature order.
+        """
+        crossings = self._crossings_by_equation.get(equation, [])
+        low = 0 if temperature_from is None else bisect.bisect_left(
+            crossings, temperature_from, key=lambda crossing: crossing.temperature
+        )
+        high = len(crossings) if temperature_to is None else bisect.bisect_right(
+            crossings, temperature_to, key=lambda crossing: crossing.temperature
+        )
+        return crossings[low:high]
+
+    def reducing_agents(self, equation, temperature_from, temperature_to):
+        """
+        Find the curves below one curve anywhere in a temperature range.
+
+        Each other curve is compared once at the start of the range, the rest comes from
+        the pair's crossings, so this costs one interpolation per curve plus the output.
+
+        Args:
+            equation (str): The oxide's formation reaction.
+            temperature_from (float): Lower end of the range in Kelvin.
+            temperature_to (float): Upper end of the range in Kelvin.
+
+        Returns:
+            list: CurveRanges of every curve below equation, ordered by start temperature.
+        """
+        if equation not in self._curves:
+            return []
+        own_temperatures = self._curves[equation][0]
+        ranges = []
+        for other, (temperatures, _) in self._curves.items():
+            if other == equation:
+                continue
+            start = float(max(temperature_from, temperatures[0], own_temperatures[0]))
+            end = float(min(temperature_to, temperatures[-1], own_temperatures[-1]))
+            if start > end:
+                continue
+            pair_temperatures = self._pair_temperatures.get(frozenset((equation, other)), [])
+            first = bisect.bisect_right(pair_temperatures, start)
+            below = self.delta_G(other, start) < self.delta_G(equation, start) - self._tolerance
+            # A crossing at the start itself decides from the curves just after it
+            if first > 0 and pair_temperatures[first - 1] == start:
+                crossing = next(
+                    crossing for crossing in self.crossings_of(equation, start, start)
+                    if other in (crossing.stable_below, crossing.stable_above)
+                )
+                below = crossing.stable_above == other
+            range_start = start
+            for temperature in pair_temperatures[first:bisect.bisect_right(pair_temperatures, end)]:
+                if below:
+                    ranges.append(CurveRange(other, range_start, temperature))
+                below = not below
+                range_start = temperature
+            if below and range_start < end:
+                ranges.append(CurveRange(other, range_start, end))
+        return sorted(ranges, key=lambda curve_range: curve_range.temperature_from)
+
+    def envelope_curve(self):
+        """
+        Return the lower envelope as one line.
+
+        Returns:
+            tuple: (temperatures, delta_G) arrays following the lowest curve.
+        """
+        temperatures = []
+        delta_G = []
+        for piece in self.envelope:
+            curve_temperatures, curve_delta_G = self._curves[piece.equation]
+            inside = (curve_temperatures > piece.temperature_from) & (curve_temperatures < piece.temperature_to)
+            temperatures.extend([piece.temperature_from, *curve_temperatures[inside], piece.temperature_to])
+            delta_G.extend([
+                self.delta_G(piece.equation, piece.temperature_from),
+                *curve_delta_G[inside],
+                self.delta_G(piece.equation, piece.temperature_to),
+            ])
+        return np.array(temperatures), np.array(delta_G)
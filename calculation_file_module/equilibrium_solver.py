@@ -0,0 +1,242 @@
+"""
+Find the temperatures where a reaction's Delta G is zero.
+
+Instead of reading the crossing off a dense sweep, Delta G is evaluated once on a coarse
+grid over the requested range, every pair of neighbouring points where its sign changes
+brackets one root, and each bracket is refined with Brent's method to DEFAULT_TOLERANCE:
+
+    for root in find_equilibrium_temperatures("chemical_species_data_base.json",
+                                              "H2O(g) = H2(g) + O2(g)", 298, 3000):
+        print(root.temperature, "spontaneous above" if root.spontaneous_above else "below")
+
+A millikelvin root costs the grid plus a dozen or so evaluations, where a sweep would
+need a point every millikelvin. Species with several Cp ranges and auto-phase species
+such as "Al(*)" are evaluated exactly as perform_calculations does, so kinks at range
+ends and phase changes are handled. Roots closer together than one grid step, or where
+Delta G only touches zero without changing sign, can be missed; raise grid_points
+for such reactions.
+
+method="newton" refines with safeguarded Newton steps on dDelta G/dT = -Delta S
+instead. The engine's Delta S is the slope of its Delta G only to within a few percent,
+so every step is kept inside the bracket and falls back to bisection when it leaves it.
+"""
+import logging
+import math
+import sys
+from typing import NamedTuple
+
+import numpy as np
+
+from calculation_file_module.calculation_engine_properties import evaluate_resolved_reaction
+from calculation_file_module.reaction_compiler import compile_reaction
+from data_process_file.instrumentation import instrumented
+from data_process_file.species_repository import as_species_index, get_species_repository
+
+logger = logging.getLogger(__name__)
+
+# Points of the bracketing grid over the requested range
+DEFAULT_GRID_POINTS = 64
+# Width in Kelvin to which each root is refined
+DEFAULT_TOLERANCE = 1e-3
+MAX_ITERATIONS = 100
+
+SOLVER_METHODS = ["brent", "newton"]
+
+
+class EquilibriumTemperature(NamedTuple):
+    """
+    A temperature at which a reaction's Delta G crosses zero.
+
+    spontaneous_above is True when Delta G falls through zero there, so the reaction is
+    spontaneous just above the temperature, and False when it rises through zero.
+    entropy is Delta S at the temperature, and evaluations the number of Delta G
+    evaluations spent refining the root.
+    """
+    temperature: float
+    spontaneous_above: bool
+    entropy: float
+    evaluations: int
+
+
+def reaction_evaluator(species_index, reaction_equation):
+    """
+    Return a function giving (delta_G, entropy) of a reaction at an array of temperatures.
+
+    Args:
+        species_index: A SpeciesIndex or StoreSpeciesIndex.
+        reaction_equation (str): Reaction equation or single formula.
+
+    Returns:
+        callable: temperatures -> (delta_G, entropy) arrays, or None if the reaction
+        could not be parsed.
+    """
+    try:
+        species, constants = compile_reaction(reaction_equation).resolve(species_index)
+    except ValueError as e:
+        logger.error(f"Error parsing reaction equation: {e}")
+        return None
+
+    def evaluate(temperatures):
+        delta_G, _, _, entropy, _ = evaluate_resolved_reaction(species, constants, temperatures)
+        return delta_G, entropy
+
+    return evaluate
+
+
+def bracket_roots(temperatures, delta_G):
+    """
+    Find where Delta G changes sign on an ascending grid.
+
+    Returns:
+        tuple: (brackets, exact) where brackets lists the (i, i + 1) grid positions around
+        each sign change and exact lists positions where Delta G is exactly zero.
+    """
+    signs = np.sign(delta_G)
+    changes = np.flatnonzero(signs[:-1] * signs[1:] < 0)
+    exact = np.flatnonzero(signs == 0)
+    return [(int(low), int(low) + 1) for low in changes], [int(position) for position in exact]
+
+
+def _brent(function, low, high, f_low, f_high, tolerance):
+    """Brent's root finder on a bracket whose ends have opposite signs; returns (root, evaluations)."""
+    a, b, fa, fb = low, high, f_low, f_high
+    c, fc = a, fa
+    d = e = b - a
+    for evaluations in range(MAX_ITERATIONS):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        step_tolerance = 2 * sys.float_info.epsilon * abs(b) + 0.5 * tolerance
+        middle = 0.5 * (c - b)
+        if abs(middle) <= step_tolerance or fb == 0:
+            return b, evaluations
+        if abs(e) >= step_tolerance and abs(fa) > abs(fb):
+            # Secant step, or inverse quadratic interpolation once three points are known
+            s = fb / fa
+            if a == c:
+                p = 2 * middle * s
+                q = 1 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * middle * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * middle * q - abs(step_tolerance * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = middle
+        else:
+            d = e = middle
+        a, fa = b, fb
+        b += d if abs(d) > step_tolerance else math.copysign(step_tolerance, middle)
+        fb = function(b)[0]
+    return b, MAX_ITERATIONS
+
+
+def _newton(function, low, high, f_low, f_high, tolerance):
+    """Newton's method on dDelta G/dT = -Delta S, kept inside the bracket; returns (root, evaluations)."""
+    # Orient the bracket so that Delta G is negative at low
+    if f_low > 0:
+        low, high = high, low
+    step_before = abs(high - low)
+    step = step_before
+    temperature = 0.5 * (low + high)
+    value, entropy = function(temperature)
+    evaluations = 1
+    while evaluations < MAX_ITERATIONS and value != 0:
+        slope = -entropy
+        leaves_bracket = ((temperature - high) * slope - value) * ((temperature - low) * slope - value) > 0
+        if leaves_bracket or abs(2 * value) > abs(step_before * slope):
+            step_before, step = step, 0.5 * (high - low)
+            temperature = low + step
+        else:
+            step_before, step = step, value / slope
+            temperature -= step
+        if abs(step) < tolerance:
+            break
+        value, entropy = function(temperature)
+        evaluations += 1
+        if value < 0:
+            low = temperature
+        else:
+            high = temperature
+    return temperature, evaluations
+
+
+@instrumented("engine.equilibrium")
+def find_equilibrium_temperatures(
+    source,
+    reaction_equation,
+    temperature_from,
+    temperature_to,
+    grid_points=DEFAULT_GRID_POINTS,
+    tolerance=DEFAULT_TOLERANCE,
+    method="brent",
+):
+    """
+    Find every temperature in a range where a reaction's Delta G is zero.
+
+    Args:
+        source: Path to the species database, or a species index, repository or
+            processed DataFrame.
+        reaction_equation (str): Reaction equation, e.g. "2Fe(s) + O2(g) = 2FeO(s)".
+        temperature_from (float): Lower end of the range in Kelvin.
+        temperature_to (float): Upper end of the range in Kelvin.
+        grid_points (int): Points of the bracketing grid; two roots closer than one grid
+            step apart can be missed.
+        tolerance (float): Width in Kelvin to which each root is refined.
+        method (str): "brent" or "newton".
+
+    Returns:
+        list: EquilibriumTemperature entries in temperature order, or None if the
+        reaction or database could not be evaluated.
+    """
+    if method not in SOLVER_METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {', '.join(SOLVER_METHODS)}")
+    if isinstance(source, str):
+        repository = get_species_repository(source)
+        if repository is None:
+            logger.error("Error: Failed to parse Excel data.")
+            return None
+        species_index = repository.index
+    else:
+        species_index = as_species_index(source)
+
+    evaluate = reaction_evaluator(species_index, reaction_equation)
+    if evaluate is None:
+        return None
+
+    def evaluate_at(temperature):
+        delta_G, entropy = evaluate(temperature)
+        return float(delta_G), float(entropy)
+
+    low_end, high_end = sorted((float(temperature_from), float(temperature_to)))
+    grid = np.linspace(low_end, high_end, max(int(grid_points), 2))
+    try:
+        delta_G, entropy = (np.broadcast_to(values, grid.shape) for values in evaluate(grid))
+    except ValueError as e:
+        logger.error(f"ValueError occurred: {e}")
+        return None
+
+    refine = _brent if method == "brent" else _newton
+    brackets, exact = bracket_roots(grid, delta_G)
+    roots = []
+    for low, high in brackets:
+        temperature, evaluations = refine(evaluate_at, grid[low], grid[high], delta_G[low], delta_G[high], tolerance)
+        roots.append(EquilibriumTemperature(
+            float(temperature), bool(delta_G[high] < 0), evaluate_at(temperature)[1], evaluations
+        ))
+    for position in exact:
+        # A grid point landing on the root: the neighbours tell which way Delta G goes
+        after = delta_G[min(position + 1, grid.size - 1)]
+        before = delta_G[max(position - 1, 0)]
+        roots.append(EquilibriumTemperature(
+            float(grid[position]), bool(after < 0 or (after == 0 and before > 0)), float(entropy[position]), 0
+        ))
+    return sorted(roots)
@@ -0,0 +1,127 @@
+"""
+Spread reaction lists over a pool of worker processes.
+
+Each worker opens the species database once, in its initializer, and then evaluates whole
+chunks of reactions with the batch engine, so balancing, species lookups and the
+temperature sweep of different chunks run on different cores. Chunk results come back
+in input order whatever order the workers finish in.
+"""
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from calculation_file_module.batch_engine import BatchResults, calculate_reactions_batch_with_index
+from data_process_file.species_repository import get_species_repository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64
+
+# Species index of the database opened by this worker process
+_worker_index = None
+
+
+def default_worker_count():
+    """Worker count from SMK_WORKERS, or the number of CPUs."""
+    try:
+        return max(1, int(os.environ["SMK_WORKERS"]))
+    except (KeyError, ValueError):
+        return os.cpu_count() or 1
+
+
+def _initialize_worker(file_path):
+    global _worker_index
+    repository = get_species_repository(file_path)
+    _worker_index = repository.index if repository is not None else None
+
+
+def _evaluate_chunk(reaction_equations, temperatures):
+    if _worker_index is None:
+        return None
+    return calculate_reactions_batch_with_index(_worker_index, reaction_equations, temperatures)
+
+
+def iter_reaction_chunks_parallel(file_path, chunks, temperatures, workers=None):
+    """
+    Evaluate chunks of reactions in worker processes and yield their results in order.
+
+    At most two chunks per worker are in flight at a time, so chunks can be read lazily
+    from a large input and memory stays bounded.
+
+    Args:
+        file_path (str): Path to the species database or compiled store.
+        chunks (iterable): Lists of reaction equations.
+        temperatures (array-like): Temperatures in Kelvin.
+        workers (int, optional): Worker processes. Defaults to default_worker_count();
+            with 1 the chunks are evaluated in this process.
+
+    Yields:
+        BatchResults: One per chunk, in input order, or None for a chunk whose worker could
+        not load the database.
+    """
+    temperatures = np.asarray(temperatures, dtype=float)
+    workers = workers or default_worker_count()
+
+    if workers == 1:
+        repository = get_species_repository(file_path)
+        for chunk in chunks:
+            if repository is None:
+                yield None
+            else:
+                yield calculate_reactions_batch_with_index(repository.index, chunk, temperatures)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker, initargs=(file_path,)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_evaluate_chunk, chunk, temperatures))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def calculate_reactions_parallel(file_path, reaction_equations, temperatures, workers=None, chunk_size=None):
+    """
+    calculate_reactions_batch spread over worker processes.
+
+    Args:
+        file_path (str): Path to the species database or compiled store.
+        reaction_equations (list): Reaction equations, in output order.
+        temperatures (array-like): Temperatures in Kelvin.
+        workers (int, optional): Worker processes. Defaults to default_worker_count().
+        chunk_size (int, optional): Reactions per task. Defaults to an even split into
+            four tasks per worker, capped at DEFAULT_CHUNK_SIZE.
+
+    Returns:
+        BatchResults: The merged results in input order, or None if the database could not
+        be loaded.
+    """
+    reaction_equations = list(reaction_equations)
+    temperatures = np.asarray(temperatures, dtype=float)
+    workers = workers or default_worker_count()
+    if chunk_size is None:
+        chunk_size = max(1, min(DEFAULT_CHUNK_SIZE, -(-len(reaction_equations) // (4 * workers))))
+
+    chunks = [reaction_equations[start:start + chunk_size] for start in range(0, len(reaction_equations), chunk_size)]
+    parts = list(iter_reaction_chunks_parallel(file_path, chunks, temperatures, workers))
+    if any(part is None for part in parts):
+        logger.error("Error: Failed to parse Excel data.")
+        return None
+    if not parts:
+        empty = np.empty((0, temperatures.size))
+        return BatchResults([], [], temperatures, empty, empty.copy(), empty.copy(), empty.copy(), [])
+
+    return BatchResults(
+        [equation for part in parts for equation in part.equations],
+        [label for part in parts for label in part.labels],
+        temperatures,
+        np.concatenate([part.delta_G for part in parts]),
+        np.concatenate([part.heat_capacity for part in parts]),
+        np.concatenate([part.enthalpy for part in parts]),
+        np.concatenate([part.entropy for part in parts]),
+        [transitions for part in parts for transitions in part.transitions],
+    )
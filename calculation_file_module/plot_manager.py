@@ -0,0 +1,400 @@
+"""
+Keep the curves of a plot alive between redraws instead of rebuilding the figure.
+
+A CurvePlot owns one axes on a canvas. Curves are keyed (by reaction equation) and
+set_curve replaces a curve's data in place with set_data, so recalculating or switching
+the plotted property never clears the figure. Curves, their labels and markers are
+animated artists drawn by blitting over cached images:
+
+* the background: axes, ticks and titles, redrawn only when the limits, titles or the
+  canvas size change;
+* the composite: the background plus every curve drawn so far. A redraw after adding
+  curves restores it and draws only the new ones, so its cost does not grow with the
+  curves already shown. Changing or removing a curve rebuilds it from the background.
+
+Curves denser than max_points are decimated for display, keeping each bucket's minimum
+and maximum so peaks survive. A curve label that would overlap an earlier one is hidden,
+and the legend lists the first MAX_LEGEND_ENTRIES curves. set_overlay adds a band drawn
+under the curves and labelled points drawn over them, such as the lower envelope and
+the crossings of an Ellingham diagram.
+"""
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib.lines import Line2D
+
+from data_process_file.instrumentation import instrumented
+
+# Points drawn per curve before decimation kicks in
+MAX_DISPLAY_POINTS = 2000
+
+# Curves listed in the legend; the rest are summed up in a last entry
+MAX_LEGEND_ENTRIES = 20
+
+# Space left above and below the plotted values, in data units
+Y_MARGIN = 50
+
+# Overlay points given a text label at most; the rest are only marked
+MAX_OVERLAY_LABELS = 50
+
+# One CurvePlot per canvas, dropped with the canvas
+_plots = weakref.WeakKeyDictionary()
+
+
+def decimate_curve(x, y, max_points=MAX_DISPLAY_POINTS):
+    """
+    Thin a dense curve for display, keeping its shape.
+
+    The points are split into max_points // 2 buckets and each bucket keeps the points
+    holding its minimum and maximum, plus the curve's first and last points.
+
+    Args:
+        x (numpy.ndarray): Sorted x values.
+        y (numpy.ndarray): y values, same length as x.
+        max_points (int): Most points to return, about.
+
+    Returns:
+        tuple: (x, y), unchanged when they already have max_points or fewer.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    count = y.size
+    buckets = max(max_points // 2, 1)
+    if count <= max_points:
+        return x, y
+
+    size = -(-count // buckets)  # ceil
+    padded = np.pad(y, (0, buckets * size - count), mode="edge").reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    keep = np.concatenate((
+        [0, count - 1],
+        offsets + padded.argmin(axis=1),
+        offsets + padded.argmax(axis=1),
+    ))
+    keep = np.unique(np.minimum(keep, count - 1))
+    return x[keep], y[keep]
+
+
+def _overlapping(boxes, box):
+    """Return True if any row of boxes (x0, y0, x1, y1) overlaps box."""
+    return bool(np.any(
+        (boxes[:, 0] < box[2]) & (box[0] < boxes[:, 2]) & (boxes[:, 1] < box[3]) & (box[1] < boxes[:, 3])
+    ))
+
+
+def _covers(current, needed, slack=0.25):
+    """
+    Return True if the current limits hold the needed ones without being much wider.
+
+    Small changes of the plotted values then keep the limits, and with them the cached
+    background, instead of forcing a full draw.
+    """
+    span = needed[1] - needed[0]
+    return (
+        current[0] <= needed[0]
+        and needed[1] <= current[1]
+        and (current[1] - current[0]) <= span * (1 + slack)
+    )
+
+
+class CurvePlot:
+    """
+    Keyed curves on one axes of a matplotlib canvas, redrawn by blitting.
+
+    Args:
+        canvas: A matplotlib canvas; FigureCanvasTkAgg in the window.
+        ylabel (str): y-axis label.
+        title (str): Axes title.
+        xlabel (str): x-axis label.
+        max_points (int): Points drawn per curve before decimating.
+        label_curves (bool): Write each curve's label at its first point.
+    """
+
+    def __init__(
+        self, canvas, ylabel, title, xlabel="Temperature (K)", max_points=MAX_DISPLAY_POINTS, label_curves=True
+    ):
+        self.canvas = canvas
+        self.max_points = max_points
+        self.label_curves = label_curves
+        canvas.figure.clf()
+        self.ax = canvas.figure.add_subplot(111)
+        self.ax.set_xlabel(xlabel)
+        self.ax.axhline(y=0, color="k", linestyle="-", linewidth=0.5)  # Add y=0 line
+        self.set_titles(ylabel, title)
+
+        # key -> [Line2D, Text, Line2D of markers, (xmin, xmax, ymin, ymax)]
+        self.curves = OrderedDict()
+        self._legend_dirty = False
+        self._needs_full_draw = True
+        self._background = None
+        self._composite = None
+        # Curves added since the composite was taken, and whether it shows outdated curves
+        self._pending = []
+        self._stale = False
+        # Window extents of the curve labels shown, one (x0, y0, x1, y1) row each
+        self._label_boxes = np.empty((0, 4))
+        # Band under the curves, marked points over them and the points' texts
+        self._overlay_band = None
+        self._overlay_points = None
+        self._overlay_texts = []
+        self._draw_connection = canvas.mpl_connect("draw_event", self._on_draw)
+
+    def __len__(self):
+        return len(self.curves)
+
+    def __contains__(self, key):
+        return key in self.curves
+
+    def set_titles(self, ylabel, title):
+        """Relabel the axes; takes effect with the next full draw."""
+        if self.ax.get_ylabel() != ylabel or self.ax.get_title() != title:
+            self.ax.set_ylabel(ylabel)
+            self.ax.set_title(title)
+            self._needs_full_draw = True
+
+    def set_curve(self, key, x, y, label, markers=None):
+        """
+        Add a curve or replace the data of the curve already stored under key.
+
+        Args:
+            key: The curve's key, e.g. the reaction equation as entered.
+            x (numpy.ndarray): Temperatures.
+            y (numpy.ndarray): Values to plot.
+            label (str): Legend entry, also written at the start of the curve.
+            markers (tuple, optional): (x, y) arrays of points to mark on the curve.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        display_x, display_y = decimate_curve(x, y, self.max_points)
+        marker_x, marker_y = markers if markers is not None else ((), ())
+        finite = y[np.isfinite(y)]
+        limits = (
+            float(x.min()), float(x.max()),
+            float(finite.min()) if finite.size else np.nan,
+            float(finite.max()) if finite.size else np.nan,
+        )
+
+        if key in self.curves:
+            line, text, marker_line, _ = self.curves[key]
+            line.set_data(display_x, display_y)
+            marker_line.set_data(marker_x, marker_y)
+            text.set_position((display_x[0], display_y[0]))
+            if line.get_label() != label:
+                line.set_label(label)
+                text.set_text(label)
+                self._legend_dirty = True
+            self.curves[key][3] = limits
+            if key not in self._pending:
+                self._stale = True  # The old curve is part of the composite
+            return
+
+        color = np.random.rand(3)
+        (line,) = self.ax.plot(display_x, display_y, label=label, color=color, animated=True)
+        (marker_line,) = self.ax.plot(
+            marker_x, marker_y, linestyle="none", marker="o", markersize=4, color=color, animated=True
+        )
+        # Annotate the start point of the curve
+        text = self.ax.text(
+            display_x[0],
+            display_y[0],
+            label,
+            fontsize=8,
+            color=color,
+            horizontalalignment="left",
+            verticalalignment="bottom",
+            fontweight="bold",
+            animated=True,
+        )
+        self.curves[key] = [line, text, marker_line, limits]
+        self._pending.append(key)
+        self._legend_dirty = True
+
+    def set_overlay(self, band=None, points=None, point_labels=()):
+        """
+        Replace the overlay; called without arguments it removes it.
+
+        Args:
+            band (tuple, optional): (x, y) arrays of a wide line drawn under the curves.
+            points (tuple, optional): (x, y) arrays of points marked over the curves.
+            point_labels (list): Text next to each point, for the first MAX_OVERLAY_LABELS
+                points; a text that would overlap a label already shown is hidden.
+        """
+        for artist in [self._overlay_band, self._overlay_points, *self._overlay_texts]:
+            if artist is not None:
+                artist.remove()
+        self._overlay_band = self._overlay_points = None
+        self._overlay_texts = []
+        if band is not None:
+            (self._overlay_band,) = self.ax.plot(
+                *band, color="0.5", linewidth=6, alpha=0.3, solid_capstyle="butt", animated=True
+            )
+        if points is not None:
+            (self._overlay_points,) = self.ax.plot(
+                *points, linestyle="none", marker="x", markersize=6, color="k", animated=True
+            )
+            for x, y, text in list(zip(*points, point_labels))[:MAX_OVERLAY_LABELS]:
+                self._overlay_texts.append(self.ax.text(
+                    x, y, text, fontsize=7, horizontalalignment="left", verticalalignment="top", animated=True
+                ))
+        self._stale = True
+
+    def remove_curve(self, key):
+        curve = self.curves.pop(key, None)
+        if curve is not None:
+            for artist in curve[:3]:
+                artist.remove()
+            self._legend_dirty = True
+            self._stale = True
+
+    def retain(self, keys):
+        """Remove every curve whose key is not in keys."""
+        keys = set(keys)
+        for key in [key for key in self.curves if key not in keys]:
+            self.remove_curve(key)
+
+    def clear(self):
+        self.retain(())
+
+    def _fit_limits(self):
+        """Fit the axes to the stored curves; returns True if the limits changed."""
+        if not self.curves:
+            return False
+        limits = np.array([curve[3] for curve in self.curves.values()])
+        x_min, x_max = limits[:, 0].min(), limits[:, 1].max()
+        y_values = limits[:, 2:][np.isfinite(limits[:, 2:])]
+        y_min, y_max = (y_values.min(), y_values.max()) if y_values.size else (0.0, 0.0)
+        xlim = (x_min, x_max) if x_min < x_max else (x_min - 1, x_max + 1)
+        ylim = (y_min - Y_MARGIN, y_max + Y_MARGIN)  # Adjust y-axis limits
+        if np.allclose(self.ax.get_xlim(), xlim) and _covers(self.ax.get_ylim(), ylim):
+            return False
+        self.ax.set_xlim(xlim)
+        self.ax.set_ylim(ylim)
+        return True
+
+    def _update_legend(self):
+        if self._legend_dirty:
+            self._legend_dirty = False
+            if self.curves:
+                handles = [curve[0] for curve in self.curves.values()][:MAX_LEGEND_ENTRIES]
+                if len(self.curves) > MAX_LEGEND_ENTRIES:
+                    handles.append(Line2D([], [], linestyle="none", label=f"... and {len(self.curves) - len(handles)} more"))
+                # A fixed corner away from the curve labels; "best" would search every curve on each blit
+                legend = self.ax.legend(handles=handles, fontsize=8, loc="lower right")
+                legend.set_animated(True)
+            elif self.ax.get_legend() is not None:
+                self.ax.get_legend().remove()
+
+    def _place_label(self, renderer, text):
+        """Show a curve label only if it starts inside the axes and clears the labels already shown."""
+        if not self.label_curves:
+            text.set_visible(False)
+            return
+        self._place_text(renderer, text)
+
+    def _place_text(self, renderer, text):
+        text.set_visible(True)  # A hidden text has no extent to measure
+        box = text.get_window_extent(renderer)
+        box = np.array([box.x0, box.y0, box.x1, box.y1])
+        axes_box = self.ax.bbox
+        visible = (
+            axes_box.x0 <= box[0] <= axes_box.x1
+            and axes_box.y0 <= box[1] <= axes_box.y1
+            and not _overlapping(self._label_boxes, box)
+        )
+        text.set_visible(visible)
+        if visible:
+            self._label_boxes = np.vstack((self._label_boxes, box))
+
+    def _draw_curves(self, keys):
+        renderer = self.canvas.get_renderer()
+        for key in keys:
+            line, text, marker_line, _ = self.curves[key]
+            self._place_label(renderer, text)
+            self.ax.draw_artist(line)
+            self.ax.draw_artist(marker_line)
+            self.ax.draw_artist(text)
+
+    def _draw_overlay_points(self):
+        if self._overlay_points is None:
+            return
+        renderer = self.canvas.get_renderer()
+        self.ax.draw_artist(self._overlay_points)
+        for text in self._overlay_texts:
+            self._place_text(renderer, text)
+            self.ax.draw_artist(text)
+
+    def _compose(self, rebuild):
+        """
+        Draw the curves the composite lacks and take it again, then add the legend on top.
+
+        Args:
+            rebuild (bool): Start from the background and draw every curve.
+        """
+        if rebuild:
+            self.canvas.restore_region(self._background)
+            self._label_boxes = np.empty((0, 4))
+            keys = list(self.curves)
+            if self._overlay_band is not None:
+                self.ax.draw_artist(self._overlay_band)
+        else:
+            self.canvas.restore_region(self._composite)
+            keys = [key for key in self._pending if key in self.curves]
+        self._draw_curves(keys)
+        if rebuild:
+            self._draw_overlay_points()
+        self._composite = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._pending = []
+        self._stale = False
+        if self.ax.get_legend() is not None:
+            self.ax.draw_artist(self.ax.get_legend())
+
+    @instrumented("plot.compose")
+    def _on_draw(self, event):
+        # A full draw (first show, resize, new limits) renders everything but the curves;
+        # keep that as the background and put the curves on top.
+        if event is not None and event.canvas is not self.canvas:
+            return
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._compose(rebuild=True)
+
+    @instrumented("plot.redraw")
+    def redraw(self):
+        """
+        Show the current curves.
+
+        Blits the new curves over the cached composite, redraws every curve over the
+        background when one changed, or schedules a full draw when the limits or titles
+        changed since the last one.
+        """
+        self._update_legend()
+        if self._fit_limits():
+            self._needs_full_draw = True
+        if self._needs_full_draw or self._background is None:
+            self._needs_full_draw = False
+            self.canvas.draw_idle()
+            return
+        self._compose(rebuild=self._stale)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def detach(self):
+        """Stop listening to the canvas, e.g. before something else clears its figure."""
+        self.canvas.mpl_disconnect(self._draw_connection)
+
+
+def curve_plot_for(canvas, ylabel, title, **options):
+    """
+    Return the CurvePlot of a canvas, creating it on first use.
+
+    A new one is made if something else cleared the figure since. options are passed to
+    CurvePlot when it is created.
+    """
+    plot = _plots.get(canvas)
+    if plot is None or plot.ax not in canvas.figure.axes:
+        if plot is not None:
+            plot.detach()
+        plot = CurvePlot(canvas, ylabel, title, **options)
+        _plots[canvas] = plot
+    else:
+        plot.set_titles(ylabel, title)
+    return plot
@@ -0,0 +1,152 @@
+import functools
+import re
+from typing import NamedTuple
+
+from data_process_file.equation_processor import balance_equation, parse_formula_list
+from data_process_file.species_repository import AUTO_PHASE, PhaseChoice
+from data_process_file.species_search import did_you_mean, format_suggestions
+
+
+class ReactionConstants(NamedTuple):
+    """Reaction totals (products minus reactants) that the temperature terms are evaluated on."""
+    delta_h: float
+    delta_s: float
+    delta_a: float
+    delta_b: float
+    delta_c: float
+    delta_d: float
+
+
+def scale_heat_capacity_coefficient(value):
+    """Scale a database A-D coefficient the way the engine has always used it (zero becomes 1e-6)."""
+    if value != 0:
+        return value / 1000
+    return 1e-6
+
+
+class CompiledReaction:
+    """
+    A reaction equation parsed and balanced once.
+
+    Species are resolved against a SpeciesIndex on first use and the reaction totals are
+    kept for that index, so evaluating the reaction at any number of temperatures is pure
+    arithmetic on ReactionConstants.
+    """
+
+    def __init__(self, equation, reactants, products, label):
+        self.equation = equation
+        self.reactants = reactants
+        self.products = products
+        self.label = label
+        self._binding = None
+
+    def resolve(self, species_index):
+        """
+        Return (species, constants) for a species index.
+
+        species is a tuple of (signed coefficient, SpeciesRecord) pairs, negative for
+        reactants and positive for products. A species written with the auto phase, e.g.
+        "Al(*)", resolves to a PhaseChoice over the formula's phases when it has more than one.
+
+        constants is None when the reaction has a PhaseChoice, since the stable phase and
+        so the coefficients change with temperature.
+
+        Raises:
+            ValueError: If any species is missing from the database; the message names
+                each one with the closest species the database has.
+        """
+        binding = self._binding
+        if binding is not None and binding[0] is species_index:
+            return binding[1], binding[2]
+
+        species = []
+        missing = []
+        for sign, substances in [(-1, self.reactants), (1, self.products)]:
+            for substance in substances:
+                substance_formula = substance["formula"].strip()
+                phase = substance["phase"]
+                if phase == AUTO_PHASE:
+                    records = species_index.lookup_phases(substance_formula)
+                    record = PhaseChoice(substance_formula, records) if len(records) > 1 else next(iter(records), None)
+                else:
+                    record = species_index.lookup(substance_formula, phase)
+                if record is None:
+                    suggestions = format_suggestions(did_you_mean(species_index, substance_formula, phase))
+                    missing.append(
+                        f"Substance '{substance_formula}' with state '{phase}' not found in the database.{suggestions}"
+                    )
+                    continue
+                species.append((sign * substance["coefficient"], record))
+        if missing:
+            # A reaction with a species left out would still balance on paper but give wrong totals
+            raise ValueError(" ".join(missing))
+        species = tuple(species)
+
+        if any(isinstance(record, PhaseChoice) for _, record in species):
+            self._binding = (species_index, species, None)
+            return species, None
+
+        constants = ReactionConstants(
+            sum(coefficient * record.h298 for coefficient, record in species),
+            sum(coefficient * record.s298 for coefficient, record in species),
+            sum(coefficient * scale_heat_capacity_coefficient(record.a) for coefficient, record in species),
+            sum(coefficient * scale_heat_capacity_coefficient(record.b) for coefficient, record in species),
+            sum(coefficient * scale_heat_capacity_coefficient(record.c) for coefficient, record in species),
+            sum(coefficient * scale_heat_capacity_coefficient(record.d) for coefficient, record in species),
+        )
+        self._binding = (species_index, species, constants)
+        return species, constants
+
+    def constants(self, species_index):
+        """Return the ReactionConstants of this reaction for a species index."""
+        return self.resolve(species_index)[1]
+
+
+def normalize_reaction_equation(reaction_equation):
+    """Drop all whitespace so equivalent spellings of an equation share one cache entry."""
+    return re.sub(r"\s+", "", reaction_equation)
+
+
+def compile_reaction(reaction_equation):
+    """
+    Return the CompiledReaction for an equation, parsing and balancing it only once.
+
+    Args:
+        reaction_equation (str): A reaction such as "Al(s) + O2(g) = Al2O3(s)", or a single
+            formula such as "Al2O3(s)".
+
+    Returns:
+        CompiledReaction: The shared compiled reaction.
+
+    Raises:
+        ValueError: If the equation cannot be parsed or balanced.
+    """
+    return _compile_normalized_reaction(normalize_reaction_equation(reaction_equation))
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_normalized_reaction(equation):
+    if "=" not in equation:
+        # A single formula is evaluated on its own, as a product with coefficient 1
+        products = parse_formula_list([equation])
+        if products is None:
+            raise ValueError(f"Could not parse formula '{equation}'")
+        return CompiledReaction(equation, [], products, equation)
+
+    try:
+        balanced_reactants, balanced_products = balance_equation(equation)
+    except (IndexError, KeyError) as e:
+        # Malformed formulas (e.g. a stray lowercase letter) fail inside the element parser
+        raise ValueError(f"Could not parse reaction equation '{equation}': {e}") from e
+    reactants = parse_formula_list(balanced_reactants)
+    products = parse_formula_list(balanced_products)
+    if reactants is None or products is None:
+        raise ValueError(f"Could not parse reaction equation '{equation}'")
+
+    label = " + ".join(balanced_reactants) + " = " + " + ".join(balanced_products)
+    return CompiledReaction(equation, reactants, products, label)
+
+
+def clear_compiled_reactions():
+    """Drop every compiled reaction so the next compile_reaction parses and balances again."""
+    _compile_normalized_reaction.cache_clear()
@@ -0,0 +1,241 @@
+"""
+Chunked writers for multi-reaction, multi-temperature results.
+
+Every writer takes results one BatchResults chunk at a time and writes it out before the
+next arrives, so memory depends on the chunk size and not on the length of the run:
+
+    with open_result_writer("screening.parquet") as writer:
+        for results in iter_reaction_chunks_parallel(file_path, chunks, temperatures):
+            writer.write_batch(results)
+
+Formats are chosen from the file extension:
+
+* .csv / .tsv: one row per reaction and temperature, streamed through the csv module.
+* .parquet: the same table, one row group per chunk; needs pyarrow.
+* .npz: each chunk's (reactions, temperatures) arrays stored as-is; read it back with
+  load_npz_results.
+
+Reactions that could not be calculated are skipped.
+"""
+import abc
+import csv
+import os
+import sys
+import zipfile
+
+import numpy as np
+
+from calculation_file_module.batch_engine import BatchResults
+# The columns are the ones export_results_excel writes, so every format has one schema
+from calculation_file_module.result_store import PROPERTY_COLUMNS, RESULT_COLUMNS
+
+EXPORT_FORMATS = {".csv": "csv", ".tsv": "tsv", ".parquet": "parquet", ".npz": "npz"}
+
+
+def _evaluated_rows(results):
+    return [row for row, label in enumerate(results.labels) if label is not None]
+
+
+class ResultWriter(abc.ABC):
+    """Base class: counts what is written and closes on leaving a with block."""
+
+    def __init__(self):
+        self.reactions_written = 0
+        self.rows_written = 0
+
+    def write_batch(self, results):
+        rows = _evaluated_rows(results)
+        if rows:
+            self._write(results, rows)
+            self.reactions_written += len(rows)
+            self.rows_written += len(rows) * results.temperatures.size
+
+    @abc.abstractmethod
+    def _write(self, results, rows):
+        """Write the given rows of one BatchResults chunk."""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class CsvResultWriter(ResultWriter):
+    """Stream RESULT_COLUMNS rows to a path or an open text file ("-" for stdout)."""
+
+    def __init__(self, output, delimiter=","):
+        super().__init__()
+        self._owns_file = isinstance(output, (str, os.PathLike)) and output != "-"
+        if output == "-":
+            output = sys.stdout
+        self.file = open(output, "w", encoding="utf-8", newline="") if self._owns_file else output
+        self.writer = csv.writer(self.file, delimiter=delimiter, lineterminator="\n")
+        self.writer.writerow(RESULT_COLUMNS)
+
+    def _write(self, results, rows):
+        temperatures = results.temperatures.tolist()
+        count = len(temperatures)
+        for row in rows:
+            self.writer.writerows(
+                zip(
+                    [results.equations[row]] * count,
+                    [results.labels[row]] * count,
+                    temperatures,
+                    *(getattr(results, name)[row].tolist() for name in PROPERTY_COLUMNS.values()),
+                )
+            )
+        self.file.flush()
+
+    def close(self):
+        if self._owns_file:
+            self.file.close()
+
+
+class ParquetResultWriter(ResultWriter):
+    """Write RESULT_COLUMNS to a Parquet file, one row group per chunk (needs pyarrow)."""
+
+    def __init__(self, path):
+        super().__init__()
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow; install it with pip install pyarrow")
+        self._pa = pa
+        self.schema = pa.schema(
+            [(RESULT_COLUMNS[0], pa.string()), (RESULT_COLUMNS[1], pa.string())]
+            + [(name, pa.float64()) for name in RESULT_COLUMNS[2:]]
+        )
+        self.writer = pq.ParquetWriter(os.fspath(path), self.schema)
+
+    def _write(self, results, rows):
+        pa = self._pa
+        count = results.temperatures.size
+        rows = np.asarray(rows)
+        columns = {
+            RESULT_COLUMNS[0]: np.repeat(np.array(results.equations, dtype=object)[rows], count),
+            RESULT_COLUMNS[1]: np.repeat(np.array(results.labels, dtype=object)[rows], count),
+            RESULT_COLUMNS[2]: np.tile(results.temperatures, len(rows)),
+        }
+        for column, name in PROPERTY_COLUMNS.items():
+            columns[column] = getattr(results, name)[rows].ravel()
+        self.writer.write_table(pa.table(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class NpzResultWriter(ResultWriter):
+    """
+    Write each chunk's arrays into a .npz archive without holding earlier chunks.
+
+    Chunk i is stored as equations_i, labels_i, temperatures_i and one
+    (reactions, temperatures) array per property, e.g. delta_G_i.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED, allowZip64=True)
+        self.chunks = 0
+
+    def _save(self, name, array):
+        with self.archive.open(f"{name}.npy", "w", force_zip64=True) as member:
+            np.lib.format.write_array(member, np.asanyarray(array), allow_pickle=False)
+
+    def _write(self, results, rows):
+        chunk = f"{self.chunks:06d}"
+        self._save(f"equations_{chunk}", np.array([results.equations[row] for row in rows], dtype=str))
+        self._save(f"labels_{chunk}", np.array([results.labels[row] for row in rows], dtype=str))
+        self._save(f"temperatures_{chunk}", results.temperatures)
+        for name in PROPERTY_COLUMNS.values():
+            self._save(f"{name}_{chunk}", getattr(results, name)[rows])
+        self.chunks += 1
+
+    def close(self):
+        self.archive.close()
+
+
+def open_result_writer(path, export_format=None):
+    """
+    Open the writer for a file, chosen by export_format or else by the file extension.
+
+    Args:
+        path (str or os.PathLike): File to write, or "-" for CSV/TSV on stdout.
+        export_format (str, optional): "csv", "tsv", "parquet" or "npz".
+
+    Returns:
+        ResultWriter: The opened writer; use it in a with block.
+
+    Raises:
+        ValueError: If the format is unknown or cannot go to stdout.
+        ImportError: For Parquet without pyarrow.
+    """
+    if export_format is None:
+        export_format = EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+        if export_format is None:
+            raise ValueError(f"Cannot tell the export format of '{path}'; use one of {', '.join(EXPORT_FORMATS)}")
+    if export_format in ("csv", "tsv"):
+        return CsvResultWriter(path, delimiter="\t" if export_format == "tsv" else ",")
+    if path == "-":
+        raise ValueError(f"{export_format} export needs an output file")
+    if export_format == "parquet":
+        return ParquetResultWriter(path)
+    if export_format == "npz":
+        return NpzResultWriter(path)
+    raise ValueError(f"Unknown export format '{export_format}'")
+
+
+def export_batches(batches, path, export_format=None):
+    """
+    Write an iterable of BatchResults chunks to one file.
+
+    Returns:
+        int: Number of (reaction, temperature) rows written.
+    """
+    with open_result_writer(path, export_format) as writer:
+        for results in batches:
+            writer.write_batch(results)
+    return writer.rows_written
+
+
+def reaction_results_as_batches(reaction_results):
+    """Yield a one-reaction BatchResults for each ReactionResult of a session store."""
+    for result in reaction_results:
+        yield BatchResults(
+            [result.equation],
+            [result.label],
+            result.temperatures,
+            result.delta_G[None],
+            result.heat_capacity[None],
+            result.enthalpy[None],
+            result.entropy[None],
+            [result.transitions],
+        )
+
+
+def load_npz_results(path):
+    """
+    Read an archive written by NpzResultWriter back into one BatchResults per chunk.
+
+    Returns:
+        list: BatchResults in the order the chunks were written.
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        chunks = sorted(name.split("_")[-1] for name in archive.files if name.startswith("equations_"))
+        return [
+            BatchResults(
+                archive[f"equations_{chunk}"].tolist(),
+                archive[f"labels_{chunk}"].tolist(),
+                archive[f"temperatures_{chunk}"],
+                archive[f"delta_G_{chunk}"],
+                archive[f"heat_capacity_{chunk}"],
+                archive[f"enthalpy_{chunk}"],
+                archive[f"entropy_{chunk}"],
+                [[] for _ in archive[f"equations_{chunk}"]],
+            )
+            for chunk in chunks
+        ]
@@ -0,0 +1,173 @@
+"""
+Session store of calculated reactions, so plots read results from memory instead of a file.
+
+The window adds each reaction's arrays as they arrive from the worker; the Cp, S and H
+buttons plot straight from the store. Writing results to disk is a separate step that
+runs on a background thread on a snapshot of the store.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+# Result columns of every export format and the ReactionResult field behind each. Values are
+# in the engine's units (H in kcal/mol, S in cal/mol*K), so the names carry no unit
+PROPERTY_COLUMNS = {
+    "Delta G": "delta_G",
+    "Enthalpy": "enthalpy",
+    "Entropy": "entropy",
+    "Heat Capacity": "heat_capacity",
+}
+RESULT_COLUMNS = ["Reaction", "Balanced reaction", "Temperature (K)", *PROPERTY_COLUMNS]
+
+DEFAULT_EXPORT_PATH = "data_from_calculation.xlsx"
+
+# One export at a time, in the order they were requested
+_export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+
+
+class ReactionResult(NamedTuple):
+    """The arrays calculated for one reaction over one temperature grid."""
+    equation: str
+    label: str
+    temperatures: np.ndarray
+    delta_G: np.ndarray
+    heat_capacity: np.ndarray
+    enthalpy: np.ndarray
+    entropy: np.ndarray
+    transitions: List
+
+    def column(self, name):
+        """Return the array behind a PROPERTY_COLUMNS name such as "Heat Capacity"."""
+        return getattr(self, PROPERTY_COLUMNS[name])
+
+
+class SessionResultStore:
+    """
+    Calculated reactions keyed by the equation as entered, in calculation order.
+
+    Adding a reaction that is already stored replaces it. The store is shared between the
+    Tk thread and export threads, so every access takes its lock.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def add_batch(self, results):
+        """
+        Store every successfully calculated reaction of a BatchResults.
+
+        Returns:
+            list: The ReactionResults added.
+        """
+        added = []
+        for row, equation in enumerate(results.equations):
+            label = results.labels[row]
+            if label is None:
+                continue
+            added.append(ReactionResult(
+                equation,
+                label,
+                results.temperatures,
+                results.delta_G[row],
+                results.heat_capacity[row],
+                results.enthalpy[row],
+                results.entropy[row],
+                list(results.transitions[row]),
+            ))
+        with self._lock:
+            for result in added:
+                self._results.pop(result.equation, None)
+                self._results[result.equation] = result
+        return added
+
+    def get(self, equation) -> Optional[ReactionResult]:
+        with self._lock:
+            return self._results.get(equation.strip())
+
+    def results(self):
+        """Return a snapshot list of the stored ReactionResults, in calculation order."""
+        with self._lock:
+            return list(self._results.values())
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._results)
+
+
+def results_to_dataframe(results):
+    """
+    Flatten ReactionResults into one long table with a row per reaction and temperature.
+
+    Args:
+        results (list): ReactionResults, e.g. from SessionResultStore.results().
+
+    Returns:
+        pandas.DataFrame: The RESULT_COLUMNS.
+    """
+    import pandas as pd
+
+    frames = [
+        pd.DataFrame({
+            "Reaction": result.equation,
+            "Balanced reaction": result.label,
+            "Temperature (K)": result.temperatures,
+            **{name: result.column(name) for name in PROPERTY_COLUMNS},
+        })
+        for result in results
+    ]
+    if not frames:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def export_results_excel(results, path=DEFAULT_EXPORT_PATH):
+    """Write ReactionResults to an Excel workbook (needs openpyxl) and return the path."""
+    results_to_dataframe(results).to_excel(path, index=False)
+    return path
+
+
+def export_results_file(results, path=DEFAULT_EXPORT_PATH):
+    """
+    Write ReactionResults to a file chosen by its extension.
+
+    .xlsx goes through openpyxl; .csv, .tsv, .parquet and .npz go through the chunked
+    writers of result_export, one reaction at a time. pandas cannot write the old .xls
+    format, so .xls is not accepted.
+
+    Args:
+        results (list): ReactionResults to write.
+        path (str or os.PathLike): File to write.
+
+    Returns:
+        str: The written path.
+    """
+    if os.fspath(path).lower().endswith(".xlsx"):
+        return export_results_excel(results, path)
+
+    from calculation_file_module.result_export import export_batches, reaction_results_as_batches
+
+    export_batches(reaction_results_as_batches(results), path)
+    return path
+
+
+def export_results_async(store, path=DEFAULT_EXPORT_PATH, exporter=export_results_file):
+    """
+    Export a snapshot of the store on the background export thread.
+
+    Args:
+        store (SessionResultStore): The results to export, read now.
+        path (str): File to write.
+        exporter (callable): Called as exporter(results, path) on the export thread.
+
+    Returns:
+        concurrent.futures.Future: Resolves to the written path, or raises the export error.
+    """
+    return _export_executor.submit(exporter, store.results(), path)
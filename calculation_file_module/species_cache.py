@@ -0,0 +1,153 @@
+"""
+Per-species thermodynamic columns shared by every reaction evaluated on one grid.
+
+Reactions in one Ellingham diagram usually share species such as O2(g), CO(g) and
+CO2(g). Each species' Gibbs, heat capacity, enthalpy and entropy terms are computed once
+per temperature grid and kept in a bounded LRU cache keyed by grid, so a reaction is a
+stoichiometric sum of cached columns and adding a reaction only costs work for its new species.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from calculation_file_module import calculation_engine_properties
+from calculation_file_module.calculation_engine_properties import (
+    calculate_contribution_of_coefficients,
+    calculate_heat_capacity,
+    calculate_species_properties,
+    compare_species_integrals,
+    integrate_heat_capacity,
+    integrate_heat_capacity_over_temperature,
+    is_linear_species,
+)
+from calculation_file_module.reaction_compiler import scale_heat_capacity_coefficient
+
+DEFAULT_MAX_SPECIES = 1024
+
+
+def species_property_matrices(records, temperatures):
+    """
+    Build species x temperature matrices of the terms every reaction property is summed from.
+
+    Every engine formula is linear in H298, S298 and the scaled A-D coefficients, so for
+    single-range species each matrix is a species x 4 coefficient matrix times a
+    4 x temperature basis taken from the engine functions themselves.
+
+    Args:
+        records (list): SpeciesRecords or PhaseChoices, one row each.
+        temperatures (numpy.ndarray): Temperatures in Kelvin.
+
+    Returns:
+        tuple: (gibbs, heat_capacity, enthalpy, entropy) arrays of shape (species, temperatures).
+    """
+    gibbs, heat_capacity, enthalpy, entropy = (np.empty((len(records), temperatures.size)) for _ in range(4))
+
+    linear = [position for position, record in enumerate(records) if is_linear_species(record)]
+    if linear:
+        h298 = np.array([records[position].h298 for position in linear], dtype=float)[:, None]
+        s298 = np.array([records[position].s298 for position in linear], dtype=float)[:, None]
+        coefficients = np.array(
+            [[scale_heat_capacity_coefficient(value) for value in (record.a, record.b, record.c, record.d)]
+             for record in (records[position] for position in linear)],
+            dtype=float,
+        ).reshape(len(linear), 4)
+
+        gibbs[linear] = (
+            h298 - temperatures * s298 + coefficients @ _basis(calculate_contribution_of_coefficients, temperatures)
+        )
+        heat_capacity[linear] = coefficients @ _basis(calculate_heat_capacity, temperatures)
+        enthalpy[linear] = h298 + coefficients @ _basis(integrate_heat_capacity, temperatures)
+        entropy[linear] = s298 + coefficients @ _basis(integrate_heat_capacity_over_temperature, temperatures)
+        if calculation_engine_properties.COMPARE_CP_INTEGRALS:
+            for position in linear:
+                compare_species_integrals(records[position], temperatures, enthalpy[position], entropy[position])
+
+    # Multi-range and auto-phase species are not linear in one coefficient set; their rows
+    # come from the per-species evaluation
+    for position, record in enumerate(records):
+        if not is_linear_species(record):
+            (gibbs[position], heat_capacity[position], enthalpy[position],
+             entropy[position]) = calculate_species_properties(record, temperatures)
+    return gibbs, heat_capacity, enthalpy, entropy
+
+
+def _basis(function, temperatures):
+    """Evaluate an engine function once per unit coefficient, giving a 4 x temperature basis."""
+    return np.vstack([
+        function(*unit, temperatures) * np.ones_like(temperatures)
+        for unit in ((1, 0, 0, 0), (0, 1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1))
+    ])
+
+
+class SpeciesFunctionCache:
+    """
+    Bounded LRU cache of species columns, keyed by temperature grid and species.
+
+    Entries are keyed by a digest of the grid and by SpeciesRecord, so a record with the
+    same values from a reloaded database is reused and an edited one is not. Columns of
+    several grids are kept side by side, so switching between the grids of two plots
+    does not throw either's columns away; the least recently used (grid, species)
+    entries are dropped once there are more than max_species. With max_species=0
+    nothing is kept and every call computes its columns.
+    """
+
+    def __init__(self, max_species=DEFAULT_MAX_SPECIES):
+        self.max_species = max_species
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def matrices(self, records, temperatures):
+        """
+        Return species x temperature matrices for records, computing only uncached species.
+
+        Args:
+            records (list): SpeciesRecords, one matrix row each, in order.
+            temperatures (array-like): Temperatures in Kelvin.
+
+        Returns:
+            tuple: (gibbs, heat_capacity, enthalpy, entropy) arrays of shape (species, temperatures).
+        """
+        temperatures = np.asarray(temperatures, dtype=float)
+        grid = grid_key(temperatures)
+        with self._lock:
+            missing = [record for record in dict.fromkeys(records) if (grid, record) not in self._entries]
+            self.misses += len(missing)
+            self.hits += len(records) - len(missing)
+            if missing:
+                columns = np.stack(species_property_matrices(missing, temperatures), axis=1)
+                for record, record_columns in zip(missing, columns):
+                    self._entries[grid, record] = record_columns
+
+            for record in records:
+                self._entries.move_to_end((grid, record))
+            stacked = np.array([self._entries[grid, record] for record in records]).reshape(
+                len(records), 4, temperatures.size
+            )
+
+            # Evict only after the request is served, so one oversized batch still succeeds
+            while len(self._entries) > self.max_species:
+                self._entries.popitem(last=False)
+
+        return stacked[:, 0], stacked[:, 1], stacked[:, 2], stacked[:, 3]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def grid_key(temperatures):
+    """Key of a float64 temperature grid: its size and a digest of its values."""
+    return temperatures.size, hashlib.blake2b(np.ascontiguousarray(temperatures).tobytes(), digest_size=16).digest()
+
+
+# Shared by the batch engine and the plot, so consecutive plots on one grid reuse species
+default_species_cache = SpeciesFunctionCache()
@@ -1,117 +1,138 @@
+import logging
+import warnings
+
 import pandas as pd
+from data_process_file.instrumentation import instrumented, span
+from data_process_file.species_ingest import (
+    ValidationReport,
+    clean_species_frame,
+    clean_species_table,
+    ingest_species_database,
+)
+
+logger = logging.getLogger(__name__)
+
+@instrumented("database.parse")
+def parse_database_chemical_speacies(file_path, report=None):
+    """
+    Read a JSON species database into the processed species table.
+
+    Records are streamed and validated a chunk at a time by species_ingest, so memory
+    stays bounded by the table plus one chunk. What was fixed on the way (missing phases,
+    non-numeric values, repeated rows, ...) goes into report; without one, a summary is
+    logged as a warning when anything was fixed.
+
+    Args:
+        file_path (str): The .json (or .jsonl) database.
+        report (ValidationReport, optional): Filled with what validation found.
 
-def parse_database_chemical_speacies(file_path):
+    Returns:
+        pandas.DataFrame: The processed table, or None if the file could not be read.
+    """
+    collected = ValidationReport() if report is None else report
     try:
-        # Read Excel file into a Pandas DataFrame
-        df = pd.read_json(file_path)
-        
-        # Perform data validation checks
-        validate_data(df)
-        # Preprocess the data if necessary
-        # (e.g., convert units, scale values)
-        preprocessed_data = preprocess_data(df)
-        
-        return preprocessed_data # Return the filtered DataFrame
-    
+        data = ingest_species_database(file_path, report=collected)
     except Exception as e:
         # Handle any errors encountered during data processing
-        print(f"Error parsing Excel data: {e}")
+        logger.error(f"Error parsing species database: {e}")
         return None
+    if report is None and collected.issues:
+        logger.warning(collected.summary())
+    return data
 
 def validate_data(df):
-    
-    """
-    Validates the input DataFrame based on the following criteria:
-    1. Required Columns
-    2. State Column
-    3. Molar Mass Range
-    4. Enthalpy and Entropy Columns
-    5. Temperature Range Columns
-    6. Heat Capacity Coefficients
     """
-    missing_columns = []
-
-    # 1. Required Columns
-    required_columns= ['Formula', 'MW (g/mol)', 'Melting P. (K)','Boiling P. (K)','T1 (K)','T2 (K)','Phase','H 298 (kcal/mol)','S 298 (cal/mol*K)','A','B','C','D','Density (g/cm3)']
+    Deprecated: use species_ingest.clean_species_frame, which returns the cleaned rows.
 
-    if not all(col in df.columns for col in required_columns):
-        missing_columns.extend(set(required_columns) - set(df.columns))
-        raise ValueError(f"Missing required columns in the DataFrame: {' ,'.join(missing_columns)}" )
+    Checks a raw species table. Unlike before, df is no longer fixed in place; what would
+    have been fixed is returned instead, and preprocess_data returns the fixed table.
 
-    # 2. State Column
-    valid_states= ['l','s','g','ia','ao']
-    
-    # Replace invalid values in 'Phase' column with a default value (e.g., 's')
-    df['Phase'] = df['Phase'].where(df['Phase'].isin(valid_states), 's')
-    
-    # Replace missing values in 'Phase' column with the default value 's'
-    df['Phase'].fillna('s', inplace=True)
+    Returns:
+        ValidationReport: What was found.
 
-    # Log the number of replacements made
-    replaced_count = df['Phase'].isna().sum()
-    if replaced_count > 0:
-        print(f"Replaced {replaced_count} missing values in the 'Phase' column with default value 's'.")
-
-    # 3. Enthalpy and Entropy Columns - Log missing values
-
-    if df['H 298 (kcal/mol)'].isnull().any() or df['S 298 (cal/mol*K)'].isnull().any():
-        df['H 298 (kcal/mol)'] = df['H 298 (kcal/mol)'].fillna(0)
-        df['S 298 (cal/mol*K)'] = df['S 298 (cal/mol*K)'].fillna(0)
-        missing_columns.append("Missing values in 'H 298' or 'S 298' columns have been replaced with 0.")
+    Raises:
+        ValueError: If required columns are missing.
+    """
+    warnings.warn(
+        "validate_data is deprecated; use species_ingest.clean_species_frame",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    report = ValidationReport()
+    clean_species_frame(df.reset_index(drop=True), report)
+    return report
 
-    # 4. Temperature Range Columns - Log missing values
+def preprocess_data(df):
+    """
+    Deprecated: use species_ingest.clean_species_table.
 
+    Returns:
+        pandas.DataFrame: The cleaned table with the first row of each (Formula, Phase).
+    """
+    warnings.warn(
+        "preprocess_data is deprecated; use species_ingest.clean_species_table",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    return clean_species_table(df).drop_duplicates(subset=['Formula', 'Phase'], ignore_index=True)
+
+# Phase names used by Thermodata.xlsx
+THERMODATA_STATES = {'sol': 's', 'liq': 'l', 'gas': 'g'}
+
+@instrumented("database.parse_workbook")
+def parse_thermodata_workbook(file_path, report=None):
+    """
+    Read a Thermodata.xlsx style workbook into the species database schema.
+
+    The workbook stores H°298 in J/mol, S°298 and the a, b heat capacity terms in J/(mol*K),
+    one row per phase with the formula repeated and the range as text ("298 - 933"). A liq
+    row right after the sol row of its formula holds the enthalpy and entropy of fusion, so
+    the solid's H°298 and S°298 are added to it; gas rows hold standard values (Zn gas is
+    130.4 kJ/mol, its enthalpy of formation) and are kept as they are. Values are converted
+    to the kcal/cal units of the JSON database, then validated like
+    parse_database_chemical_speacies.
+    """
     try:
-        required_columns = ['T1 (K)', 'T2 (K)']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
-        
-        # Additional checks for data consistency
-        if df['T1 (K)'].isnull().any() or df['T2 (K)'].isnull().any():
-            raise ValueError("Missing values found in 'Temperature Range Start' or 'Temperature Range End' columns.")
-        
-        if (df['T1 (K)'] >= df['T2 (K)']).any():
-            raise ValueError("Temperature range start must be less than temperature range end.")
-    except Exception as e:
-        print(f"An error occurred: {e}")
+        with span("database.read_excel"):
+            workbook = pd.read_excel(file_path)
+
+        formula = workbook['Formula'].astype(str).str.strip()
+        state = workbook['State'].astype(str).str.strip()
+        # The solid row must be a full entry: water's liq row follows a bare "Heat of Fusion"
+        # sol row without S°298 and holds standard values itself
+        fusion = (
+            (state == 'liq') & (state.shift() == 'sol') & (formula == formula.shift())
+            & workbook['S°298'].shift().notna()
+        )
+        # A solid element's H°298 is left blank, i.e. 0
+        enthalpy = workbook['H°298'].mask(fusion, workbook['H°298'].fillna(0) + workbook['H°298'].shift().fillna(0))
+        entropy = workbook['S°298'].mask(fusion, workbook['S°298'].fillna(0) + workbook['S°298'].shift().fillna(0))
+
+        temperature_range = workbook['Temperature Range'].astype(str).str.split('-', n=1, expand=True)
+        df = pd.DataFrame({
+            'Formula': formula,
+            'MW (g/mol)': workbook.groupby('Formula')['Mol Mass'].transform('first'),
+            'Melting P. (K)': 0,
+            'Boiling P. (K)': 0,
+            'T1 (K)': pd.to_numeric(temperature_range[0].str.strip(), errors='coerce'),
+            'T2 (K)': pd.to_numeric(temperature_range[1].str.strip(), errors='coerce'),
+            'Phase': state.map(THERMODATA_STATES),
+            'H 298 (kcal/mol)': enthalpy / 4184,
+            'S 298 (cal/mol*K)': entropy / 4.184,
+            'A': workbook['a'] / 4.184,
+            'B': workbook['b'] / 4.184,
+            'C': 0.0,
+            'D': 0.0,
+            'Density (g/cm3)': 0.0,
+        })
+
+        collected = ValidationReport() if report is None else report
+        collected.source = file_path
+        data = clean_species_table(df, collected)
+        if report is None and collected.issues:
+            logger.warning(collected.summary())
+        return data
 
-    # 6. Heat Capacity Coefficients - Log missing values
-
-    try:
-        df.fillna(0, inplace=True)
-        if df['A'].isnull().any() or df['B'].isnull().any() or df['C'].isnull().any() or df['D'].isnull().any():
-            raise ValueError("Missing values found in heat capacity coefficients A, B, C, and D")
     except Exception as e:
-        print(f"An error occurred: {e}")
-
-def preprocess_data(df):
-    try:
-        # Convert enthalpy and entropy values to kJ/mol and kj/mol*K because the data is in cal
-        df['H 298 (kcal/mol)']*4.184
-        df['S 298 (cal/mol*K)']*0.004184
-    except KeyError as e:
-        print(f"Error converting enthalpy and entropy values: {e}")
-    
-    try:
-        # Split 'Temperature Range' into 'Temperature Range Start' and 'Temperature Range End'
-        df['T1 (K)'] = pd.to_numeric(df['T1 (K)'], errors='coerce').fillna(0)
-        df['T2 (K)'] = pd.to_numeric(df['T2 (K)'], errors='coerce').fillna(0)
-    except (KeyError, ValueError) as e:
-        print(f"Error extracting temperature range data: {e}")
-    
-    try:
-        # Convert heat capacity coefficients to float and replace empty strings with zero
-        df['A'] = pd.to_numeric(df['A'], errors='coerce').fillna(0)
-        df['B'] = pd.to_numeric(df['B'], errors='coerce').fillna(0)
-        df['C'] = pd.to_numeric(df['C'], errors='coerce').fillna(0)
-        df['D'] = pd.to_numeric(df['D'], errors='coerce').fillna(0)
-    except (KeyError, ValueError) as e:
-        print(f"Error extracting heat capacity coefficients: {e}")
-
-    # Select the first occurrence of each unique formula for each specific phase
-    unique_values = df[['Formula', 'MW (g/mol)', 'Phase', 'T1 (K)' , 'T2 (K)','H 298 (kcal/mol)', 'S 298 (cal/mol*K)', 'A' , 'B' , 'C', 'D' , 'Density (g/cm3)']].drop_duplicates(subset=['Formula', 'Phase'])
-   
-    return unique_values
-
-
+        logger.error(f"Error parsing Excel data: {e}")
+        return None
@@ -1,8 +1,16 @@
-from sympy import Matrix,lcm
+import logging
+import math
 import re
-from sympy import Matrix
-from sympy.ntheory import factorint
 
+from data_process_file.instrumentation import instrumented
+
+logger = logging.getLogger(__name__)
+
+
+class BalanceError(ValueError):
+    """Raised when a reaction equation has no unique positive integer balance."""
+
+@instrumented("equation.parse")
 def parse_reaction_equation(reaction_equation):
     try:
         if "=" not in reaction_equation:
@@ -22,10 +30,11 @@ def parse_reaction_equation(reaction_equation):
         return reactants_list, products_list
 
     except Exception as e:
-        print(f"Error parsing reaction equation: {e}")
+        logger.error(f"Error parsing reaction equation: {e}")
         return None, None
 
 
+@instrumented("equation.parse_formulas")
 def parse_formula_list(formulas):
     try:
         parsed_list = []
@@ -63,51 +72,89 @@ def parse_formula_list(formulas):
         return parsed_list
     
     except Exception as e:
-        print(f"Error parsing formula list: {e}")
+        logger.error(f"Error parsing formula list: {e}")
         return None
 
 
 def lcm(arr):
-    lcm = 1
-    factors = {}
-    for num in arr:
-        num_factors = factorint(num)
-        for factor, power in num_factors.items():
-            factors[factor] = max(factors.get(factor, 0), power)
-    for factor, power in factors.items():
-        lcm *= factor ** power
-    return lcm
+    return math.lcm(*arr)
 
-def balance_equation(full_equation, given_coefficients=None):
+def solve_stoichiometry(element_matrix):
+    """
+    Find the smallest positive integer coefficients that balance a reaction.
 
-    # Split the full equation into reactants and products
-    equation_parts = full_equation.split("=")
-    reactants_str = equation_parts[0].strip()
-    products_str = equation_parts[1].strip()
+    Integer Gauss-Jordan elimination (every row kept divided by its gcd) runs on the
+    element-by-species matrix, so no fractions or floating point are involved.
 
-    # Helper functions
+    Args:
+        element_matrix (list): One row per species with its signed element counts
+            (positive for reactants, negative for products).
 
-    def parse_state(compound):
-        state_match = re.search(r'\((\w+)\)', compound.strip())
-        return state_match.group(1) if state_match else None
+    Returns:
+        list: One positive integer coefficient per species.
 
-    def remove_state(compound):
-        return re.sub(r'\(\w+\)', '', compound.strip()) 
+    Raises:
+        BalanceError: If the reaction cannot be balanced as written, or if it has more
+            than one independent balance and the choice would be arbitrary.
+    """
+    species_count = len(element_matrix)
+    rows = [list(row) for row in zip(*element_matrix)]
 
-    def remove_coefficient(compound):
-        return re.sub(r'^\d+', '', compound.strip()) 
+    pivot_columns = []
+    rank = 0
+    for column in range(species_count):
+        pivot_row = next((i for i in range(rank, len(rows)) if rows[i][column]), None)
+        if pivot_row is None:
+            continue
+        rows[rank], rows[pivot_row] = rows[pivot_row], rows[rank]
+        pivot = rows[rank][column]
+        for i in range(len(rows)):
+            factor = rows[i][column]
+            if i != rank and factor:
+                row = [pivot * x - factor * y for x, y in zip(rows[i], rows[rank])]
+                divisor = math.gcd(*row)
+                rows[i] = [x // divisor for x in row] if divisor > 1 else row
+        pivot_columns.append(column)
+        rank += 1
 
-    def print_equation(compound, coeff):
-        state = parse_state(compound)
+    free_columns = [column for column in range(species_count) if column not in pivot_columns]
+    if not free_columns:
+        raise BalanceError("The reaction cannot be balanced: no combination of coefficients conserves every element.")
+    if len(free_columns) > 1:
+        raise BalanceError(
+            f"The reaction is ambiguous: it has {len(free_columns)} independent balances. "
+            "Split it into separate reactions or give the coefficients explicitly."
+        )
 
-        if state:
-            return f"{coeff} {remove_state(compound).strip()} ({state.strip()})"
-        else:
-            return f"{coeff} {remove_state(compound).strip()}"
+    # Each pivot row now reads pivot * x[pivot_column] + value * x[free] = 0
+    free = free_columns[0]
+    scale = lcm([abs(rows[i][pivot_columns[i]]) for i in range(rank)] or [1])
+    coefficients = [0] * species_count
+    coefficients[free] = scale
+    for i, column in enumerate(pivot_columns):
+        coefficients[column] = -rows[i][free] * scale // rows[i][column]
 
-    reactants = reactants_str.replace(' ', '').split("+")
-    products = products_str.replace(' ', '').split("+")
+    divisor = math.gcd(*coefficients)
+    coefficients = [coefficient // divisor for coefficient in coefficients]
+    if all(coefficient < 0 for coefficient in coefficients):
+        coefficients = [-coefficient for coefficient in coefficients]
+    if any(coefficient <= 0 for coefficient in coefficients):
+        raise BalanceError(
+            "The reaction cannot be balanced as written: some species would need a zero or negative coefficient."
+        )
+    return coefficients
+
+def build_element_matrix(reactants, products):
+    """
+    Count the elements of each species, signed positive for reactants and negative for products.
+
+    Args:
+        reactants (list): Reactant formulas, e.g. ["Al(s)", "O2(g)"].
+        products (list): Product formulas.
 
+    Returns:
+        list: One row per species (reactants first) with one column per element.
+    """
     elementList = []
     elementMatrix = []
 
@@ -149,7 +196,7 @@ def balance_equation(full_equation, given_coefficients=None):
                     addToMatrix(elementsAndNumbers[i], index, multiplier, side)
 
     def compoundDecipher(compound, index, side):
-        segments = re.split('(\([A-Za-z0-9]*\)[0-9]*)', compound)
+        segments = re.split('(\([A-Za-z0-9*]*\)[0-9]*)', compound)  # "(*)" is a state, like "(s)"
         for segment in segments:
             if segment.startswith("("):
                 segment = re.split('\)([0-9]*)', segment)
@@ -168,23 +215,54 @@ def balance_equation(full_equation, given_coefficients=None):
     for i in range(len(products)):
         compoundDecipher(products[i], i + len(reactants), -1)
 
-    elementMatrix = Matrix(elementMatrix)
-    elementMatrix = elementMatrix.transpose()
-    solution = elementMatrix.nullspace()[0]
-    multiple = lcm([val.q for val in solution])
-    solution = multiple * solution
-    coefficients = solution.tolist()
+    return elementMatrix
+
+@instrumented("equation.balance")
+def balance_equation(full_equation, given_coefficients=None):
+
+    # Split the full equation into reactants and products
+    equation_parts = full_equation.split("=")
+    reactants_str = equation_parts[0].strip()
+    products_str = equation_parts[1].strip()
+
+    # Helper functions
+
+    # A state is a word such as "s" or "g", or "*" for the stable phase at each temperature
+    def parse_state(compound):
+        state_match = re.search(r'\(([\w*]+)\)', compound.strip())
+        return state_match.group(1) if state_match else None
+
+    def remove_state(compound):
+        return re.sub(r'\([\w*]+\)', '', compound.strip()) 
+
+    def remove_coefficient(compound):
+        return re.sub(r'^\d+', '', compound.strip()) 
+
+    def print_equation(compound, coeff):
+        state = parse_state(compound)
+
+        if state:
+            return f"{coeff} {remove_state(compound).strip()} ({state.strip()})"
+        else:
+            return f"{coeff} {remove_state(compound).strip()}"
+
+    reactants = reactants_str.replace(' ', '').split("+")
+    products = products_str.replace(' ', '').split("+")
+
+    elementMatrix = build_element_matrix(reactants, products)
+
+    coefficients = solve_stoichiometry(elementMatrix)
 
     # If given coefficients are provided, replace them
     if given_coefficients:
         for i in range(len(given_coefficients)):
-            coefficients[i][0] = given_coefficients[i]
+            coefficients[i] = given_coefficients[i]
 
     balanced_reactants = [
-        print_equation(remove_coefficient(reactants[i]), coefficients[i][0]) for i in range(len(reactants))
+        print_equation(remove_coefficient(reactants[i]), coefficients[i]) for i in range(len(reactants))
     ]
     balanced_products = [
-        print_equation(remove_coefficient(products[i]), coefficients[i + len(reactants)][0])
+        print_equation(remove_coefficient(products[i]), coefficients[i + len(reactants)])
         for i in range(len(products))
     ]
 
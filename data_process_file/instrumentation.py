@@ -0,0 +1,250 @@
+"""
+Stage timing and memory instrumentation for the calculation pipeline.
+
+Stages are marked with spans, either around a block or a whole function:
+
+    with span("database.read_json"):
+        df = pd.read_json(file_path)
+
+    @instrumented("equation.balance")
+    def balance_equation(full_equation, given_coefficients=None):
+
+Every span name collects its number of calls, cumulative and longest wall time and,
+when memory tracking is on, the largest tracemalloc peak seen inside it. Times of nested
+spans are inclusive, so "engine.perform_calculations" also covers the "equation.balance"
+spans it runs.
+
+Instrumentation is off by default and a span then costs a single flag check. Set
+SMK_INSTRUMENT=table (or json) to turn it on and print a summary to stderr when the
+process exits, and SMK_INSTRUMENT_MEMORY=1 to add tracemalloc peaks, which slows every
+allocation down. The batch CLI and main.py take --instrument instead. Only the current
+process is measured: with the batch CLI's --workers, work done in worker processes is
+not included.
+"""
+import atexit
+import contextlib
+import functools
+import os
+import sys
+import threading
+import time
+
+REPORT_FORMATS = ["table", "json"]
+
+_enabled = False
+# The tracemalloc module while memory tracking is on, else None; main.py imports this
+# module before the window opens, so tracemalloc and json load only when needed
+_memory = None
+_stats = {}
+_lock = threading.Lock()
+_local = threading.local()
+_NO_SPAN = contextlib.nullcontext()
+
+
+class SpanStats:
+    """Totals collected for one span name."""
+
+    __slots__ = ("calls", "total_time", "max_time", "peak_memory")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.peak_memory = None
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "total_s": self.total_time,
+            "mean_s": self.total_time / self.calls if self.calls else 0.0,
+            "max_s": self.max_time,
+            "peak_memory_bytes": self.peak_memory,
+        }
+
+
+class _Span:
+    __slots__ = ("name", "start", "frame")
+
+    def __init__(self, name):
+        self.name = name
+        self.frame = None
+
+    def __enter__(self):
+        tracemalloc = _memory
+        if tracemalloc is not None and tracemalloc.is_tracing():
+            # tracemalloc keeps one peak; hand the enclosing span the peak so far before resetting it
+            stack = _memory_stack()
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            self.frame = [current, 0]
+            stack.append(self.frame)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.start
+        peak_memory = None
+        if self.frame is not None:
+            stack = _memory_stack()
+            current, peak = _memory.get_traced_memory()
+            peak = max(peak, self.frame[1])
+            if stack and stack[-1] is self.frame:
+                stack.pop()
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            peak_memory = peak - self.frame[0]
+
+        with _lock:
+            stats = _stats.get(self.name)
+            if stats is None:
+                stats = _stats[self.name] = SpanStats()
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            if peak_memory is not None:
+                stats.peak_memory = max(stats.peak_memory or 0, peak_memory)
+        return False
+
+
+def _memory_stack():
+    stack = getattr(_local, "memory_stack", None)
+    if stack is None:
+        stack = _local.memory_stack = []
+    return stack
+
+
+def span(name):
+    """
+    Return a context manager that times the block under name.
+
+    Args:
+        name (str): Stage name, "<area>.<stage>" such as "database.validate".
+
+    Returns:
+        A context manager; a shared no-op one while instrumentation is off.
+    """
+    if not _enabled:
+        return _NO_SPAN
+    return _Span(name)
+
+
+def instrumented(name):
+    """Decorator that runs every call of a function inside span(name)."""
+
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _Span(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def enable(memory=False):
+    """Start collecting spans; with memory=True also start tracemalloc and record peaks."""
+    global _enabled, _memory
+    if memory:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _memory = tracemalloc
+    else:
+        _memory = None
+    _enabled = True
+
+
+def disable():
+    """Stop collecting spans; collected totals are kept until reset()."""
+    global _enabled, _memory
+    _enabled = False
+    if _memory is not None and _memory.is_tracing():
+        _memory.stop()
+    _memory = None
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Forget every collected total."""
+    with _lock:
+        _stats.clear()
+
+
+def collected():
+    """
+    Return the collected totals.
+
+    Returns:
+        dict: Span name -> {"calls", "total_s", "mean_s", "max_s", "peak_memory_bytes"},
+        slowest cumulative time first. peak_memory_bytes is None without memory tracking.
+    """
+    with _lock:
+        items = [(name, stats.as_dict()) for name, stats in _stats.items()]
+    return dict(sorted(items, key=lambda item: item[1]["total_s"], reverse=True))
+
+
+def _format_bytes(value):
+    if value is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def format_table(stats=None):
+    """Return the collected totals as a text table, slowest stage first."""
+    stats = collected() if stats is None else stats
+    if not stats:
+        return "No instrumented stages ran."
+    width = max(len("stage"), *(len(name) for name in stats))
+    lines = [f"{'stage':<{width}} {'calls':>8} {'total ms':>11} {'mean ms':>10} {'max ms':>10} {'peak mem':>11}"]
+    for name, record in stats.items():
+        lines.append(
+            f"{name:<{width}} {record['calls']:8d} {record['total_s'] * 1000:11.2f} "
+            f"{record['mean_s'] * 1000:10.3f} {record['max_s'] * 1000:10.3f} "
+            f"{_format_bytes(record['peak_memory_bytes']):>11}"
+        )
+    return "\n".join(lines)
+
+
+def report(report_format="table", stream=None):
+    """
+    Write the collected totals as a table or as JSON.
+
+    Args:
+        report_format (str): "table" or "json".
+        stream (file, optional): Where to write. Defaults to sys.stderr.
+    """
+    stream = sys.stderr if stream is None else stream
+    if report_format == "json":
+        import json
+
+        json.dump({"memory": _memory is not None, "stages": collected()}, stream, indent=2)
+        stream.write("\n")
+    else:
+        stream.write(format_table() + "\n")
+    stream.flush()
+
+
+def report_at_exit(report_format="table"):
+    """Print the report to stderr when the process exits, replacing an earlier request."""
+    atexit.unregister(report)
+    atexit.register(report, report_format)
+
+
+# SMK_INSTRUMENT=1, table or json turns instrumentation on for the whole run
+_environment_format = os.environ.get("SMK_INSTRUMENT", "").strip().lower()
+if _environment_format in ("1", *REPORT_FORMATS):
+    enable(memory=os.environ.get("SMK_INSTRUMENT_MEMORY") == "1")
+    report_at_exit("table" if _environment_format == "1" else _environment_format)
@@ -0,0 +1,376 @@
+"""
+Chunked ingestion and validation of species databases.
+
+The JSON database is streamed a chunk of records at a time instead of being read whole:
+each chunk is validated and coerced to the processed schema in one vectorized pass,
+rows repeated anywhere in the file are dropped, and what was fixed along the way is
+collected in a ValidationReport instead of being printed. Peak memory is the processed
+table plus one chunk of raw records, however large the file is.
+
+    report = ValidationReport()
+    data = ingest_species_database("chemical_species_data_base.json", report=report)
+    print(report.summary())
+
+Check a database from the command line:
+
+    python -m data_process_file.species_ingest chemical_species_data_base.json --json
+"""
+import argparse
+import io
+import json
+import sys
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from data_process_file.instrumentation import instrumented, span
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Read size while streaming a JSON array; objects are decoded out of this buffer
+READ_BLOCK_CHARS = 1 << 22
+# What may stand between the records of a JSON array
+_SEPARATORS = " \t\r\n,"
+
+REQUIRED_COLUMNS = [
+    'Formula', 'MW (g/mol)', 'Melting P. (K)', 'Boiling P. (K)', 'T1 (K)', 'T2 (K)', 'Phase',
+    'H 298 (kcal/mol)', 'S 298 (cal/mol*K)', 'A', 'B', 'C', 'D', 'Density (g/cm3)',
+]
+
+# Columns of the processed table, in order
+SPECIES_COLUMNS = [
+    'Formula', 'MW (g/mol)', 'Phase', 'T1 (K)', 'T2 (K)', 'H 298 (kcal/mol)', 'S 298 (cal/mol*K)',
+    'A', 'B', 'C', 'D', 'Density (g/cm3)',
+]
+NUMERIC_COLUMNS = [column for column in SPECIES_COLUMNS if column not in ('Formula', 'Phase')]
+
+VALID_PHASES = ['l', 's', 'g', 'ia', 'ao']
+DEFAULT_PHASE = 's'
+
+# What each issue code means, and what was done about it
+ISSUE_MESSAGES = {
+    "missing_formula": "rows without a formula were dropped",
+    "missing_phase": f"missing phase set to '{DEFAULT_PHASE}'",
+    "invalid_phase": f"phase not one of {', '.join(VALID_PHASES)}; set to '{DEFAULT_PHASE}'",
+    "missing_value": "missing values set to 0",
+    "non_numeric": "non-numeric values set to 0",
+    "inverted_range": "T1 (K) is not below T2 (K); rows kept",
+    "duplicate_row": "rows repeating an earlier row were dropped",
+}
+
+# Source rows listed per issue in the report
+MAX_EXAMPLE_ROWS = 5
+
+
+class ValidationIssue(NamedTuple):
+    """One kind of problem found while ingesting, e.g. non-numeric values in column A."""
+    code: str
+    column: str
+    count: int
+    rows: list
+    message: str
+
+
+class ValidationReport:
+    """
+    What ingesting a database found and fixed, with the first source rows of each issue.
+
+    Row numbers are positions of records in the source file, counting from 0.
+    """
+
+    def __init__(self):
+        self.source = None
+        self.rows_read = 0
+        self.rows_kept = 0
+        self.errors = []
+        self._issues = {}
+
+    def add(self, code, mask, first_row=0, column=""):
+        """Count the rows of a chunk where mask is True under an issue code."""
+        if mask.any():
+            self.add_rows(code, np.flatnonzero(mask) + first_row, column)
+
+    def add_rows(self, code, rows, column=""):
+        """Count the given source rows under an issue code."""
+        if not len(rows):
+            return
+        entry = self._issues.setdefault((code, column), [0, []])
+        entry[0] += len(rows)
+        if len(entry[1]) < MAX_EXAMPLE_ROWS:
+            entry[1].extend(int(row) for row in rows[:MAX_EXAMPLE_ROWS - len(entry[1])])
+
+    @property
+    def issues(self):
+        return [
+            ValidationIssue(code, column, count, rows, ISSUE_MESSAGES[code])
+            for (code, column), (count, rows) in self._issues.items()
+        ]
+
+    @property
+    def ok(self):
+        """True if the database was ingested, possibly with fixed-up rows."""
+        return not self.errors
+
+    def as_dict(self):
+        return {
+            "source": self.source,
+            "rows_read": self.rows_read,
+            "rows_kept": self.rows_kept,
+            "errors": list(self.errors),
+            "issues": [issue._asdict() for issue in self.issues],
+        }
+
+    def summary(self):
+        lines = [f"{self.source}: {self.rows_kept} of {self.rows_read} rows kept"]
+        lines += [f"  error: {error}" for error in self.errors]
+        for issue in self.issues:
+            where = f" in '{issue.column}'" if issue.column else ""
+            lines.append(f"  {issue.count} {issue.code}{where}: {issue.message} (rows {issue.rows})")
+        return "\n".join(lines)
+
+
+def iter_json_records(file_path, chunk_size=DEFAULT_CHUNK_ROWS):
+    """
+    Yield a species database as DataFrames of at most chunk_size raw records.
+
+    A JSON array of records is decoded incrementally, one READ_BLOCK_CHARS block at a
+    time; .jsonl files are read line by line. Any other JSON layout pandas understands
+    is read whole and then split.
+
+    Raises:
+        ValueError: If the file is not valid JSON.
+    """
+    if file_path.lower().endswith(".jsonl"):
+        with pd.read_json(file_path, lines=True, chunksize=chunk_size) as reader:
+            yield from reader
+        return
+
+    with open(file_path, encoding="utf-8") as database_file:
+        pending = database_file.read(READ_BLOCK_CHARS).lstrip()
+        if not pending.startswith("["):
+            frame = pd.read_json(file_path)
+            for start in range(0, len(frame), chunk_size):
+                yield frame.iloc[start:start + chunk_size].reset_index(drop=True)
+            return
+
+        pending = pending[1:]
+        frames = []
+        rows = 0
+        while True:
+            block = database_file.read(READ_BLOCK_CHARS)
+            frame, pending = _decode_records(pending + block if block else pending)
+            if len(frame):
+                frames.append(frame)
+                rows += len(frame)
+            while rows >= chunk_size or (not block and rows):
+                batch = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+                yield batch.iloc[:chunk_size].reset_index(drop=True)
+                frames = [batch.iloc[chunk_size:]] if len(batch) > chunk_size else []
+                rows = max(len(batch) - chunk_size, 0)
+            if not block:
+                break
+        if pending.strip(_SEPARATORS) != "]":
+            raise ValueError("The species database is not a complete JSON array of records")
+
+
+def _decode_records(text):
+    """
+    Decode the complete records at the start of text, a stretch of a JSON array.
+
+    Returns:
+        tuple: (DataFrame of the records, the undecoded rest of text).
+    """
+    # Everything up to the last "}" is read as one array: it only parses if the cut
+    # falls between records, and pandas' reader is much faster than one call per record
+    end = text.rfind("}") + 1
+    body = text[:end].lstrip(_SEPARATORS)
+    if not body:
+        return pd.DataFrame(), text
+    try:
+        return pd.read_json(io.StringIO("[" + body + "]")), text[end:]
+    except ValueError:
+        pass
+
+    # The last "}" closed something inside a record: decode records one at a time
+    decoder = json.JSONDecoder()
+    records = []
+    position = 0
+    while True:
+        while position < len(text) and text[position] in _SEPARATORS:
+            position += 1
+        if position >= len(text) or text[position] == "]":
+            break
+        try:
+            record, position = decoder.raw_decode(text, position)
+        except json.JSONDecodeError:
+            break
+        records.append(record)
+    return pd.DataFrame.from_records(records), text[position:]
+
+
+@instrumented("database.validate")
+def clean_species_frame(frame, report, first_row=0):
+    """
+    Validate raw species rows and coerce them to the processed schema in one pass.
+
+    Rows without a formula are dropped; a missing or unknown phase becomes "s"; missing
+    and non-numeric values become 0; a T1 (K) not below T2 (K) is reported and kept.
+
+    Args:
+        frame (pandas.DataFrame): Raw rows with the REQUIRED_COLUMNS.
+        report (ValidationReport): Collects what was found.
+        first_row (int): Source position of the frame's first row, for the report.
+
+    Returns:
+        pandas.DataFrame: SPECIES_COLUMNS, numeric columns as float64, indexed by
+        source row.
+
+    Raises:
+        ValueError: If required columns are missing.
+    """
+    missing_columns = [column for column in REQUIRED_COLUMNS if column not in frame.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns in the DataFrame: {', '.join(missing_columns)}")
+
+    formula = frame['Formula']
+    has_formula = formula.notna().to_numpy() & (formula.astype(str).str.strip() != "").to_numpy()
+    report.add("missing_formula", ~has_formula, first_row)
+
+    phase = frame['Phase']
+    missing_phase = phase.isna().to_numpy()
+    invalid_phase = ~phase.isin(VALID_PHASES).to_numpy() & ~missing_phase
+    report.add("missing_phase", missing_phase & has_formula, first_row)
+    report.add("invalid_phase", invalid_phase & has_formula, first_row)
+
+    # Every numeric column is coerced, checked and filled as one float block
+    raw = frame[NUMERIC_COLUMNS]
+    missing = raw.isna().to_numpy()
+    values = raw.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64, copy=True)
+    unusable = np.isnan(values)
+    for position, column in enumerate(NUMERIC_COLUMNS):
+        report.add("missing_value", missing[:, position] & has_formula, first_row, column)
+        report.add("non_numeric", unusable[:, position] & ~missing[:, position] & has_formula, first_row, column)
+    values[unusable] = 0.0
+
+    t1 = values[:, NUMERIC_COLUMNS.index('T1 (K)')]
+    t2 = values[:, NUMERIC_COLUMNS.index('T2 (K)')]
+    report.add("inverted_range", (t1 >= t2) & has_formula, first_row)
+
+    cleaned = pd.DataFrame(values[has_formula], columns=NUMERIC_COLUMNS, index=np.flatnonzero(has_formula) + first_row)
+    cleaned.insert(0, 'Formula', formula.to_numpy()[has_formula])
+    cleaned.insert(2, 'Phase', phase.where(~(missing_phase | invalid_phase), DEFAULT_PHASE).to_numpy()[has_formula])
+    return cleaned
+
+
+class _DuplicateFilter:
+    """Drops rows repeating an earlier row, across chunks, by 64-bit row hashes."""
+
+    def __init__(self):
+        # Hashes of the rows kept so far, sorted for binary search
+        self.seen = np.empty(0, dtype=np.uint64)
+
+    def keep(self, frame):
+        hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+        first = ~pd.Series(hashes).duplicated().to_numpy()
+        if len(self.seen):
+            positions = np.minimum(np.searchsorted(self.seen, hashes), len(self.seen) - 1)
+            first &= self.seen[positions] != hashes
+        new = np.sort(hashes[first])
+        # Inserting a sorted chunk is a single pass over seen, where re-sorting is not
+        self.seen = np.insert(self.seen, np.searchsorted(self.seen, new), new)
+        return first
+
+
+def iter_species_chunks(file_path, report, chunk_size=DEFAULT_CHUNK_ROWS):
+    """
+    Yield the cleaned, de-duplicated rows of a JSON species database chunk by chunk.
+
+    Args:
+        file_path (str): The .json (or .jsonl) database.
+        report (ValidationReport): Collects what was found.
+        chunk_size (int): Records read and validated at a time.
+    """
+    report.source = file_path
+    duplicates = _DuplicateFilter()
+    first_row = 0
+    for raw in iter_json_records(file_path, chunk_size):
+        cleaned = clean_species_frame(raw, report, first_row)
+        first_row += len(raw)
+        report.rows_read += len(raw)
+
+        keep = duplicates.keep(cleaned)
+        report.add_rows("duplicate_row", cleaned.index[~keep])
+        cleaned = cleaned[keep]
+        report.rows_kept += len(cleaned)
+        yield cleaned
+
+
+@instrumented("database.ingest")
+def ingest_species_database(file_path, chunk_size=DEFAULT_CHUNK_ROWS, report=None):
+    """
+    Read a JSON species database into the processed table, a chunk at a time.
+
+    Args:
+        file_path (str): The .json (or .jsonl) database.
+        chunk_size (int): Records read and validated at a time.
+        report (ValidationReport, optional): Filled with what was found and fixed.
+
+    Returns:
+        pandas.DataFrame: SPECIES_COLUMNS with one row per unique source row.
+
+    Raises:
+        ValueError: If the file is not valid JSON or lacks required columns.
+    """
+    report = ValidationReport() if report is None else report
+    try:
+        with span("database.read_json"):
+            chunks = list(iter_species_chunks(file_path, report, chunk_size))
+    except ValueError as e:
+        report.errors.append(str(e))
+        raise
+    if not chunks:
+        return pd.DataFrame({column: pd.Series(dtype=object if column in ('Formula', 'Phase') else float)
+                             for column in SPECIES_COLUMNS})
+    return pd.concat(chunks, ignore_index=True)
+
+
+def clean_species_table(frame, report=None):
+    """
+    Validate and de-duplicate an in-memory table, e.g. one built from a workbook.
+
+    Returns:
+        pandas.DataFrame: SPECIES_COLUMNS with one row per unique input row.
+    """
+    report = ValidationReport() if report is None else report
+    report.rows_read += len(frame)
+    data = clean_species_frame(frame.reset_index(drop=True), report)
+    keep = _DuplicateFilter().keep(data)
+    report.add_rows("duplicate_row", data.index[~keep])
+    data = data[keep].reset_index(drop=True)
+    report.rows_kept += len(data)
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate a species database and report what would be fixed.")
+    parser.add_argument("database", help="species database (.json or .jsonl)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"records validated at a time (default: {DEFAULT_CHUNK_ROWS})")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = ValidationReport()
+    report.source = args.database
+    try:
+        for _ in iter_species_chunks(args.database, report, args.chunk_size):
+            pass
+    except (OSError, ValueError) as e:
+        report.errors.append(str(e))
+
+    print(json.dumps(report.as_dict(), indent=2) if args.json else report.summary())
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
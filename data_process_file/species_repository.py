@@ -0,0 +1,249 @@
+import logging
+import os
+import threading
+from typing import NamedTuple, Tuple
+
+from data_process_file.data_processor_module import parse_database_chemical_speacies
+from data_process_file.species_store import MANIFEST_NAME, SpeciesStore, StoreSpeciesIndex, is_species_store
+
+logger = logging.getLogger(__name__)
+
+# One repository per database file for the whole process, keyed by absolute path
+_repositories = {}
+_repositories_lock = threading.Lock()
+
+
+class CpSegment(NamedTuple):
+    """Heat capacity coefficients of one database row and the T1-T2 range they apply to."""
+    t1: float
+    t2: float
+    a: float
+    b: float
+    c: float
+    d: float
+    row: int
+
+
+class SpeciesRecord(NamedTuple):
+    """
+    Thermodynamic constants of one species, as stored in the database.
+
+    H298, S298 and A-D come from the species' first row. segments holds every row of the
+    species ordered by T1, so species listed with several temperature ranges are evaluated
+    piecewise; it is empty or has one entry for species with a single row.
+    """
+    formula: str
+    phase: str
+    h298: float
+    s298: float
+    a: float
+    b: float
+    c: float
+    d: float
+    row: int
+    segments: Tuple[CpSegment, ...] = ()
+
+
+# Phase written in a reaction, e.g. "Al(*)", to let the engine pick the stable phase per temperature
+AUTO_PHASE = "*"
+
+
+class PhaseChoice(NamedTuple):
+    """Every phase record of one formula, evaluated as whichever has the lowest Gibbs energy."""
+    formula: str
+    records: Tuple[SpeciesRecord, ...]
+
+
+def build_species_record(formula, phase, rows):
+    """
+    Build a SpeciesRecord from the (row, h298, s298, t1, t2, a, b, c, d) rows of one species.
+
+    The first row in database order supplies H298, S298 and the record's own A-D. Rows are
+    ordered by T1 to form the segments; a later row starting at the same T1 as an earlier
+    one is a duplicate and is dropped, so the first row in the database still wins.
+    """
+    row, h298, s298, _, _, a, b, c, d = rows[0]
+    segments = {}
+    for segment_row, _, _, t1, t2, segment_a, segment_b, segment_c, segment_d in rows:
+        if t1 not in segments:
+            segments[t1] = CpSegment(t1, t2, segment_a, segment_b, segment_c, segment_d, segment_row)
+    ordered = tuple(segments[t1] for t1 in sorted(segments))
+    return SpeciesRecord(formula, phase, h298, s298, a, b, c, d, row, ordered)
+
+
+class SpeciesIndex:
+    """
+    Hashed lookup of species records by (formula, phase).
+
+    Rows are resolved with the same precedence the engine has always used: rows whose
+    Formula carries its own phase suffix (e.g. "Al(g)") win over bare "Al" rows of the
+    same phase, and within each kind the first row in the database supplies H298 and S298.
+    Every row of the winning kind becomes one Cp segment of the record.
+    """
+
+    def __init__(self, records):
+        self._records = {record_key: record for record_key, record in records}
+        self._phases = {}
+        for (formula, _), record in self._records.items():
+            self._phases.setdefault(formula, []).append(record)
+
+    @staticmethod
+    def group_rows(formulas, phases, rows):
+        """
+        Group database rows by the (formula, phase) they resolve to.
+
+        Args:
+            formulas (iterable): Stripped Formula values, one per row.
+            phases (iterable): Phase values, one per row.
+            rows (iterable): Row tuples to group, one per row.
+
+        Returns:
+            dict: (formula, phase) -> list of the winning kind's rows, in database order.
+        """
+        suffixed = {}
+        bare = {}
+        for formula, phase, row in zip(formulas, phases, rows):
+            suffix = f"({phase})"
+            if formula.endswith(suffix) and len(formula) > len(suffix):
+                suffixed.setdefault((formula[: -len(suffix)].strip(), phase), []).append(row)
+            else:
+                bare.setdefault((formula, phase), []).append(row)
+        groups = dict(bare)
+        groups.update(suffixed)
+        return groups
+
+    @classmethod
+    def from_dataframe(cls, data):
+        formulas = data["Formula"].astype(str).str.strip().tolist()
+        phases = data["Phase"].tolist()
+        columns = [
+            data["H 298 (kcal/mol)"],
+            data["S 298 (cal/mol*K)"],
+            data["T1 (K)"],
+            data["T2 (K)"],
+            data["A"],
+            data["B"],
+            data["C"],
+            data["D"],
+        ]
+        rows = (
+            (row, *(float(value) for value in values))
+            for row, values in enumerate(zip(*columns))
+        )
+        groups = cls.group_rows(formulas, phases, rows)
+        records = []
+        for (formula, phase), species_rows in groups.items():
+            first = species_rows[0][0]
+            records.append(((formula, phase), build_species_record(formulas[first], phase, species_rows)))
+        return cls(records)
+
+    def lookup(self, formula, phase):
+        """Return the SpeciesRecord for a formula and phase, or None if it is not in the database."""
+        return self._records.get((formula.strip(), phase))
+
+    def lookup_phases(self, formula):
+        """Return the SpeciesRecord of every phase of a formula, in database order."""
+        return tuple(self._phases.get(formula.strip(), ()))
+
+    def items(self):
+        """Return the resolved ((formula, phase), SpeciesRecord) pairs."""
+        return self._records.items()
+
+    def keys(self):
+        """Return the (formula, phase) pair of every resolved species."""
+        return self._records.keys()
+
+    def __len__(self):
+        return len(self._records)
+
+
+def as_species_index(processed_data):
+    """Accept a species index, a SpeciesRepository or a processed DataFrame and return an index."""
+    if isinstance(processed_data, SpeciesRepository):
+        return processed_data.index
+    if hasattr(processed_data, "lookup"):
+        return processed_data
+    return SpeciesIndex.from_dataframe(processed_data)
+
+
+class SpeciesRepository:
+    """
+    Parsed and validated species database shared by every calculation in the process.
+
+    The DataFrame held in ``data`` is the single copy produced by
+    parse_database_chemical_speacies. It is shared between all callers, so it must be
+    treated as read-only: filter or copy it, never modify it in place.
+
+    A repository opened on a compiled species store has no DataFrame until ``data`` is
+    first read; lookups go straight to the memory-mapped columns.
+    """
+
+    def __init__(self, file_path, data, modified_time, store=None):
+        self.file_path = file_path
+        self.modified_time = modified_time
+        self._data = data
+        self._store = store
+        if store is not None:
+            self.index = StoreSpeciesIndex(store)
+        else:
+            self.index = SpeciesIndex.from_dataframe(data)
+
+    @property
+    def data(self):
+        """Shared read-only view of the processed species DataFrame."""
+        if self._data is None:
+            self._data = self._store.to_dataframe()
+        return self._data
+
+    def is_current(self, modified_time):
+        return self.modified_time == modified_time
+
+
+def get_species_repository(file_path):
+    """
+    Return the process-wide repository for a species database file.
+
+    The file is parsed and indexed on first use and again only when its modification time
+    changes, so a temperature sweep reuses one parsed copy instead of re-reading the file
+    for every point.
+
+    Args:
+        file_path (str): Path to the species database, or to a store directory compiled
+            with data_process_file.species_store.
+
+    Returns:
+        SpeciesRepository: The cached repository, or None if the file could not be parsed.
+    """
+    path = os.path.abspath(file_path)
+    store = is_species_store(path)
+    try:
+        modified_time = os.path.getmtime(os.path.join(path, MANIFEST_NAME) if store else path)
+    except OSError as e:
+        logger.error(f"Error reading species database '{file_path}': {e}")
+        return None
+
+    with _repositories_lock:
+        repository = _repositories.get(path)
+        if repository is not None and repository.is_current(modified_time):
+            return repository
+
+        if store:
+            try:
+                repository = SpeciesRepository(path, None, modified_time, store=SpeciesStore(path))
+            except (OSError, ValueError) as e:
+                logger.error(f"Error opening species store '{file_path}': {e}")
+                return None
+        else:
+            data = parse_database_chemical_speacies(path)
+            if data is None:
+                return None
+            repository = SpeciesRepository(path, data, modified_time)
+
+        _repositories[path] = repository
+        return repository
+
+
+def clear_species_repositories():
+    """Drop every cached repository so the next lookup re-reads its file."""
+    with _repositories_lock:
+        _repositories.clear()
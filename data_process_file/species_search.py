@@ -0,0 +1,235 @@
+"""
+Prefix and typo-tolerant search over the species of a database.
+
+SpeciesSearchIndex keeps a database's formulas in one case-insensitively sorted list.
+Every prefix is a contiguous range of that list, so completing what the user is typing
+takes two binary searches. The list also serves as an implicit trie: the formulas that
+extend a prefix by one more character are sub-ranges found the same way. An
+edit-distance search walks it like a trie, carrying one Levenshtein row per prefix and
+skipping every range whose row is already over the limit, so it never compares
+against the whole database.
+
+    search = search_index_for(repository.index)
+    search.complete("al2")                        # [("Al2O3", "l"), ("Al2O3", "s"), ...]
+    search.similar("Al2O4")                       # [(1, "Al2O3"), ...]
+    did_you_mean(repository.index, "Al2O4", "s")  # ["Al2O3(s)"]
+"""
+import bisect
+import threading
+import weakref
+
+from data_process_file.equation_processor import parse_formula_list
+from data_process_file.species_repository import AUTO_PHASE
+
+MAX_COMPLETIONS = 10
+MAX_SUGGESTIONS = 3
+MAX_EDIT_DISTANCE = 2
+
+# Sorts after any character of a formula, so prefix + _PREFIX_END closes the prefix's range
+_PREFIX_END = "\U0010ffff"
+
+# One search index per species index, built on first use
+_search_indexes = weakref.WeakKeyDictionary()
+_search_indexes_lock = threading.Lock()
+
+
+class SpeciesSearchIndex:
+    """
+    Completion and "did you mean" lookups over (formula, phase) species keys.
+
+    Formulas are matched ignoring case, so "al2o3" finds "Al2O3" and a formula typed in
+    the wrong case is found at distance 0.
+
+    Args:
+        keys (iterable): (formula, phase) pairs, e.g. a species index's keys().
+    """
+
+    def __init__(self, keys):
+        self._phases = {}
+        for formula, phase in keys:
+            self._phases.setdefault(formula, []).append(phase)
+        self._formulas = {}
+        for formula in self._phases:
+            self._formulas.setdefault(formula.lower(), []).append(formula)
+        self._names = sorted(self._formulas)
+
+    def __len__(self):
+        return len(self._phases)
+
+    def phases(self, formula):
+        """Return the phases a formula has in the database, in database order."""
+        return list(self._phases.get(formula.strip(), ()))
+
+    def _prefix_range(self, prefix, lo=0, hi=None):
+        hi = len(self._names) if hi is None else hi
+        start = bisect.bisect_left(self._names, prefix, lo, hi)
+        return start, bisect.bisect_left(self._names, prefix + _PREFIX_END, start, hi)
+
+    def complete(self, text, limit=MAX_COMPLETIONS):
+        """
+        Return the species whose formula starts with text, ignoring case.
+
+        Text may end in a partly typed phase, e.g. "Al2O3(g"; only the phases of that
+        formula starting with it are returned then.
+
+        Args:
+            text (str): What has been typed of one species.
+            limit (int): Most species to return.
+
+        Returns:
+            list: (formula, phase) pairs, formulas in alphabetical order (so an exact
+            match comes first) and each formula's phases in database order.
+        """
+        formula_text, parenthesis, phase_text = text.strip().partition("(")
+        prefix = formula_text.strip().lower()
+        phase_text = phase_text.rstrip(")").strip().lower()
+        if not prefix:
+            return []
+        if parenthesis:
+            names = [prefix] if prefix in self._formulas else []
+        else:
+            start, end = self._prefix_range(prefix)
+            # Every formula has at least one phase, so limit names are enough
+            names = self._names[start:min(end, start + limit)]
+
+        completions = []
+        for name in names:
+            for formula in self._formulas[name]:
+                for phase in self._phases[formula]:
+                    if phase.startswith(phase_text):
+                        completions.append((formula, phase))
+                        if len(completions) >= limit:
+                            return completions
+        return completions
+
+    def similar(self, formula, limit=MAX_SUGGESTIONS, max_distance=MAX_EDIT_DISTANCE):
+        """
+        Return database formulas within an edit distance of formula, ignoring case.
+
+        Args:
+            formula (str): The formula to match, e.g. a misspelt one.
+            limit (int): Most formulas to return.
+            max_distance (int): Largest number of inserted, deleted or changed characters.
+
+        Returns:
+            list: (distance, formula) pairs, closest first.
+        """
+        target = formula.strip().lower()
+        names = self._names
+        matches = []
+
+        def walk(depth, lo, hi, row):
+            # names[lo:hi] all start with the same depth characters, whose distances
+            # to each prefix of target are in row; a name equal to the prefix sorts first
+            position = lo
+            if len(names[lo]) == depth:
+                if row[-1] <= max_distance:
+                    matches.append((row[-1], names[lo]))
+                position += 1
+            while position < hi:
+                name = names[position]
+                character = name[depth]
+                _, end = self._prefix_range(name[:depth + 1], position, hi)
+                next_row = [row[0] + 1]
+                for column, target_character in enumerate(target, 1):
+                    next_row.append(min(
+                        next_row[column - 1] + 1,
+                        row[column] + 1,
+                        row[column - 1] + (target_character != character),
+                    ))
+                if min(next_row) <= max_distance:
+                    walk(depth + 1, position, end, next_row)
+                position = end
+
+        if names and target:
+            walk(0, 0, len(names), list(range(len(target) + 1)))
+        matches.sort()
+
+        similar = []
+        for distance, name in matches:
+            for match in self._formulas[name]:
+                if match != formula.strip():
+                    similar.append((distance, match))
+        return similar[:limit]
+
+
+def search_index_for(species_index):
+    """
+    Return the SpeciesSearchIndex of a species index, building it on first use.
+
+    Args:
+        species_index: A SpeciesIndex or StoreSpeciesIndex.
+
+    Returns:
+        SpeciesSearchIndex: Shared for as long as the species index is alive.
+    """
+    with _search_indexes_lock:
+        search = _search_indexes.get(species_index)
+        if search is None:
+            search = _search_indexes[species_index] = SpeciesSearchIndex(species_index.keys())
+        return search
+
+
+def did_you_mean(species_index, formula, phase, limit=MAX_SUGGESTIONS):
+    """
+    Suggest species for a (formula, phase) the database does not have.
+
+    A known formula written with a missing phase gets the phases it does have; otherwise
+    the closest formulas are offered, in the same phase where they have it.
+
+    Returns:
+        list: Up to limit species written as in a reaction, e.g. ["Al2O3(s)"].
+    """
+    search = search_index_for(species_index)
+    formula = formula.strip()
+    phases = search.phases(formula)
+    if phases:
+        return [f"{formula}({known_phase})" for known_phase in phases if known_phase != phase][:limit]
+
+    suggestions = []
+    for _, similar_formula in search.similar(formula, limit):
+        similar_phases = search.phases(similar_formula)
+        if phase == AUTO_PHASE:
+            similar_phases = [AUTO_PHASE]
+        elif phase in similar_phases:
+            similar_phases = [phase]
+        suggestions.extend(f"{similar_formula}({similar_phase})" for similar_phase in similar_phases)
+    return suggestions[:limit]
+
+
+def format_suggestions(suggestions):
+    """Return " Did you mean A(s) or B(s)?" for a message, or "" without suggestions."""
+    if not suggestions:
+        return ""
+    if len(suggestions) == 1:
+        return f" Did you mean {suggestions[0]}?"
+    return f" Did you mean {', '.join(suggestions[:-1])} or {suggestions[-1]}?"
+
+
+def missing_species(species_index, reaction_equations):
+    """
+    Find the species of reaction equations that the database does not have.
+
+    Equations are only split into their species, not balanced, so this is cheap enough
+    to run before a calculation starts.
+
+    Args:
+        species_index: A SpeciesIndex or StoreSpeciesIndex.
+        reaction_equations (list): Equations such as "Al(s) + O2(g) = Al2O3(s)", or formulas.
+
+    Returns:
+        list: (formula, phase, suggestions) for each missing species, in the order typed.
+    """
+    missing = {}
+    for reaction_equation in reaction_equations:
+        terms = [term for side in reaction_equation.split("=") for term in side.split("+") if term.strip()]
+        for substance in parse_formula_list(terms) or ():
+            formula = substance["formula"].strip()
+            phase = substance["phase"]
+            if phase == AUTO_PHASE:
+                found = species_index.lookup_phases(formula)
+            else:
+                found = species_index.lookup(formula, phase)
+            if not found and (formula, phase) not in missing:
+                missing[(formula, phase)] = did_you_mean(species_index, formula, phase)
+    return [(formula, phase, suggestions) for (formula, phase), suggestions in missing.items()]
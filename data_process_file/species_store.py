@@ -0,0 +1,410 @@
+"""
+Compiled, memory-mapped form of the species database.
+
+A store is a directory holding one float64 .npy file per numeric column, the formula and
+phase columns as int32 codes into an interned string table, and a sorted key index with
+the rows of each species' Cp segments. The files of one compile sit in their own
+generation directory, named by the manifest. Opening a store memory-maps all of them,
+which reads no data until a page is touched, so worker processes share one copy through
+the page cache and opening a store costs milliseconds however large the database is.
+Compiling streams the database into the column files a chunk at a time, so it needs no
+more memory than one chunk plus a few integers per row for the key index.
+
+Recompiling writes a new generation and then swaps the manifest, so a store opened
+before keeps reading its own generation and never mixes old strings with new columns.
+
+Compile a store from the command line:
+
+    python -m data_process_file.species_store chemical_species_data_base.json species.smkdb
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+from data_process_file.data_processor_module import parse_thermodata_workbook
+from data_process_file.species_ingest import DEFAULT_CHUNK_ROWS, ValidationReport, iter_species_chunks
+
+STORE_FORMAT = 3
+MANIFEST_NAME = "manifest.json"
+GENERATION_PREFIX = "generation-"
+
+# Processed DataFrame column -> file name inside the store
+NUMERIC_COLUMNS = {
+    "MW (g/mol)": "mw",
+    "T1 (K)": "t1",
+    "T2 (K)": "t2",
+    "H 298 (kcal/mol)": "h298",
+    "S 298 (cal/mol*K)": "s298",
+    "A": "a",
+    "B": "b",
+    "C": "c",
+    "D": "d",
+    "Density (g/cm3)": "density",
+}
+
+# The columns a SpeciesRecord needs, in record order
+RECORD_COLUMNS = ["h298", "s298", "a", "b", "c", "d"]
+
+# The columns a CpSegment needs, in segment order
+SEGMENT_COLUMNS = ["t1", "t2", "a", "b", "c", "d"]
+
+# Every file of a generation, all mapped when a store is opened
+INDEX_FILES = ["index_keys", "index_rows", "segment_offsets", "segment_rows"]
+STORE_FILES = [*NUMERIC_COLUMNS.values(), "formula", "phase", *INDEX_FILES]
+
+
+def species_key(formula, phase):
+    """Key under which a (formula, phase) pair is stored in the sorted index."""
+    return f"{formula}|{phase}"
+
+
+def is_species_store(path):
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def compile_species_store(source_path, store_path, chunk_size=DEFAULT_CHUNK_ROWS, report=None):
+    """
+    Compile a JSON species database or a Thermodata.xlsx workbook into a store directory.
+
+    A JSON database is written a validated chunk at a time: each chunk's columns are
+    appended to the store's files before the next chunk is read, so the whole table is
+    never held in memory. The key index is then built from the formula, phase and T1
+    columns alone.
+
+    Args:
+        source_path (str): The .json database or .xlsx workbook to compile.
+        store_path (str): Directory to write; it is created if needed, and a store
+            already there is replaced once the new one is complete.
+        chunk_size (int): Records read and validated at a time.
+        report (ValidationReport, optional): Filled with what validation found.
+
+    Returns:
+        int: Number of species rows written.
+
+    Raises:
+        ValueError: If the source could not be parsed.
+    """
+    report = ValidationReport() if report is None else report
+    os.makedirs(store_path, exist_ok=True)
+    # The old generation stays untouched, and in use, until the new manifest replaces it
+    generation_path = tempfile.mkdtemp(prefix=GENERATION_PREFIX, dir=store_path)
+
+    # Formula and phase strings are interned into one table and stored as codes
+    strings = []
+    codes = {}
+
+    def intern(value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(strings)
+            strings.append(value)
+        return code
+
+    columns = {name: _ColumnWriter(generation_path, name, np.float64) for name in NUMERIC_COLUMNS.values()}
+    columns["formula"] = _ColumnWriter(generation_path, "formula", np.int32)
+    columns["phase"] = _ColumnWriter(generation_path, "phase", np.int32)
+    try:
+        if source_path.lower().endswith((".xlsx", ".xls")):
+            data = parse_thermodata_workbook(source_path, report)
+            if data is None:
+                raise ValueError("the workbook could not be read")
+            chunks = [data]
+        else:
+            chunks = iter_species_chunks(source_path, report, chunk_size)
+
+        rows = 0
+        for chunk in chunks:
+            for column, name in NUMERIC_COLUMNS.items():
+                columns[name].append(chunk[column].to_numpy(dtype=np.float64))
+            formulas = chunk["Formula"].astype(str).str.strip()
+            columns["formula"].append(np.array([intern(formula) for formula in formulas], dtype=np.int32))
+            columns["phase"].append(np.array([intern(phase) for phase in chunk["Phase"]], dtype=np.int32))
+            rows += len(chunk)
+    except (OSError, ValueError) as e:
+        for writer in columns.values():
+            writer.discard()
+        shutil.rmtree(generation_path, ignore_errors=True)
+        raise ValueError(f"Could not parse species database '{source_path}': {e}") from e
+
+    for writer in columns.values():
+        writer.finish()
+
+    index = _key_index(
+        np.load(os.path.join(generation_path, "formula.npy"), mmap_mode="r"),
+        np.load(os.path.join(generation_path, "phase.npy"), mmap_mode="r"),
+        np.load(os.path.join(generation_path, "t1.npy"), mmap_mode="r"),
+        strings,
+    )
+    for name, array in zip(INDEX_FILES, index):
+        np.save(os.path.join(generation_path, f"{name}.npy"), array)
+
+    manifest = {
+        "format": STORE_FORMAT,
+        "generation": os.path.basename(generation_path),
+        "rows": rows,
+        "source": os.path.abspath(source_path),
+        "columns": NUMERIC_COLUMNS,
+        "strings": strings,
+    }
+    # The manifest is written last and renamed into place, so it is never seen half written;
+    # its modification time marks the store as complete
+    manifest_path = os.path.join(store_path, MANIFEST_NAME)
+    partial_path = manifest_path + ".partial"
+    with open(partial_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file)
+    os.replace(partial_path, manifest_path)
+
+    # Stores opened on an older generation keep their mappings after its files are unlinked
+    for name in os.listdir(store_path):
+        if name.startswith(GENERATION_PREFIX) and name != manifest["generation"]:
+            shutil.rmtree(os.path.join(store_path, name), ignore_errors=True)
+    _remove_format_2_files(store_path)
+    return rows
+
+
+def _remove_format_2_files(store_path):
+    """Delete the column files a format 2 store kept directly in the store directory."""
+    for name in STORE_FILES:
+        path = os.path.join(store_path, f"{name}.npy")
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+class _ColumnWriter:
+    """Appends chunks of one column to a raw file and turns it into a .npy file at the end."""
+
+    # Values copied from the raw file at a time when finishing
+    COPY_VALUES = 1 << 20
+
+    def __init__(self, generation_path, name, dtype):
+        self.path = os.path.join(generation_path, f"{name}.npy")
+        self.raw_path = self.path + ".partial"
+        self.dtype = np.dtype(dtype)
+        self.size = 0
+        self.file = open(self.raw_path, "wb")
+
+    def append(self, values):
+        np.ascontiguousarray(values, dtype=self.dtype).tofile(self.file)
+        self.size += len(values)
+
+    def finish(self):
+        self.file.close()
+        if not self.size:
+            np.save(self.path, np.empty(0, dtype=self.dtype))
+        else:
+            target = np.lib.format.open_memmap(self.path, mode="w+", dtype=self.dtype, shape=(self.size,))
+            with open(self.raw_path, "rb") as raw_file:
+                for start in range(0, self.size, self.COPY_VALUES):
+                    count = min(self.COPY_VALUES, self.size - start)
+                    target[start:start + count] = np.fromfile(raw_file, dtype=self.dtype, count=count)
+            target.flush()
+            del target
+        os.remove(self.raw_path)
+
+    def discard(self):
+        self.file.close()
+        os.remove(self.raw_path)
+
+
+def _key_index(formula_codes, phase_codes, t1, strings):
+    """
+    Resolve the (formula, phase) precedence of SpeciesIndex from the code columns alone.
+
+    Rows whose formula carries its own phase suffix (e.g. "Al(g)") win over bare rows of
+    the same phase; the first winning row in the database is the record's row, and the
+    winning rows ordered by T1, the first of each T1 kept, are its Cp segments.
+
+    Returns:
+        tuple: (index_keys, index_rows, segment_offsets, segment_rows) arrays, with
+        segment_rows[segment_offsets[i]:segment_offsets[i + 1]] the segments of key i.
+    """
+    pairs, inverse = np.unique(
+        np.stack([np.asarray(formula_codes), np.asarray(phase_codes)], axis=1).reshape(-1, 2),
+        axis=0, return_inverse=True,
+    )
+    inverse = inverse.reshape(-1)
+    keys = {}
+    pair_key = np.empty(len(pairs), dtype=np.int64)
+    pair_suffixed = np.empty(len(pairs), dtype=bool)
+    for position, (formula_code, phase_code) in enumerate(pairs):
+        formula, phase = strings[formula_code], strings[phase_code]
+        suffix = f"({phase})"
+        pair_suffixed[position] = formula.endswith(suffix) and len(formula) > len(suffix)
+        if pair_suffixed[position]:
+            formula = formula[: -len(suffix)].strip()
+        pair_key[position] = keys.setdefault(species_key(formula, phase), len(keys))
+
+    names = np.array(list(keys), dtype=str) if keys else np.array([], dtype="<U1")
+    rank = np.empty(len(keys), dtype=np.int64)
+    rank[np.argsort(names, kind="stable")] = np.arange(len(keys))
+
+    row_key = pair_key[inverse]
+    row_suffixed = pair_suffixed[inverse]
+    winner = np.zeros(len(keys), dtype=bool)
+    np.logical_or.at(winner, row_key, row_suffixed)
+    rows = np.flatnonzero(row_suffixed == winner[row_key])
+    row_rank = rank[row_key[rows]]
+
+    # rows is ascending, so a stable sort by key leaves each key's first row in front
+    by_key = np.argsort(row_rank, kind="stable")
+    starts = np.flatnonzero(np.diff(row_rank[by_key], prepend=-1))
+    index_rows = rows[by_key][starts]
+
+    by_segment = np.lexsort((rows, np.asarray(t1)[rows], row_rank))
+    segment_rank = row_rank[by_segment]
+    segment_t1 = np.asarray(t1)[rows][by_segment]
+    first = np.ones(len(by_segment), dtype=bool)
+    first[1:] = (segment_rank[1:] != segment_rank[:-1]) | (segment_t1[1:] != segment_t1[:-1])
+    counts = np.bincount(segment_rank[first], minlength=len(keys))
+
+    return (
+        np.sort(names),
+        index_rows.astype(np.int32),
+        np.concatenate([[0], np.cumsum(counts, dtype=np.int64)]).astype(np.int32),
+        rows[by_segment][first].astype(np.int32),
+    )
+
+
+class SpeciesStore:
+    """
+    Read-only view of one generation of a compiled store.
+
+    Every column is memory-mapped when the store is opened, so the string table and the
+    columns always come from the same compile, whatever happens to the directory later.
+    """
+
+    # Times to re-read the manifest when a recompile removes the generation being opened
+    OPEN_ATTEMPTS = 3
+
+    def __init__(self, store_path):
+        self.store_path = store_path
+        for attempt in range(self.OPEN_ATTEMPTS):
+            with open(os.path.join(store_path, MANIFEST_NAME), encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+            if manifest.get("format") != STORE_FORMAT:
+                raise ValueError(f"Unsupported species store format in '{store_path}': {manifest.get('format')}")
+            generation_path = os.path.join(store_path, manifest["generation"])
+            try:
+                self._columns = {
+                    name: np.load(os.path.join(generation_path, f"{name}.npy"), mmap_mode="r") for name in STORE_FILES
+                }
+                break
+            except FileNotFoundError:
+                if attempt == self.OPEN_ATTEMPTS - 1:
+                    raise
+        self.rows = manifest["rows"]
+        self.strings = manifest["strings"]
+
+    def column(self, name):
+        """Return a read-only memory-mapped column, e.g. "h298", "formula" or "index_keys"."""
+        return self._columns[name]
+
+    def formula(self, row):
+        return self.strings[self.column("formula")[row]]
+
+    def phase(self, row):
+        return self.strings[self.column("phase")[row]]
+
+    def to_dataframe(self, rows=None):
+        """Rebuild processed database rows as a DataFrame (all rows when rows is None)."""
+        import pandas as pd
+
+        selection = slice(None) if rows is None else np.asarray(rows, dtype=np.intp)
+        strings = np.array(self.strings, dtype=object)
+        frame = {
+            "Formula": strings[self.column("formula")[selection]],
+            "Phase": strings[self.column("phase")[selection]],
+        }
+        for column, name in NUMERIC_COLUMNS.items():
+            frame[column] = np.array(self.column(name)[selection])
+        columns = ["Formula", "MW (g/mol)", "Phase", "T1 (K)", "T2 (K)", "H 298 (kcal/mol)",
+                   "S 298 (cal/mol*K)", "A", "B", "C", "D", "Density (g/cm3)"]
+        return pd.DataFrame(frame)[columns]
+
+
+class StoreSpeciesIndex:
+    """
+    SpeciesIndex counterpart backed by a store's sorted key index.
+
+    Lookups binary-search the memory-mapped key array and read only the record columns of
+    the matching row, so nothing is built up front.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._records = {}
+
+    def lookup(self, formula, phase):
+        """Return the SpeciesRecord for a formula and phase, or None if it is not in the store."""
+        # Imported here to keep the module free of a cycle with species_repository
+        from data_process_file.species_repository import CpSegment, SpeciesRecord
+
+        formula = formula.strip()
+        cache_key = (formula, phase)
+        if cache_key in self._records:
+            return self._records[cache_key]
+
+        keys = self.store.column("index_keys")
+        key = species_key(formula, phase)
+        position = int(np.searchsorted(keys, key))
+        record = None
+        if position < len(keys) and keys[position] == key:
+            row = int(self.store.column("index_rows")[position])
+            values = [float(self.store.column(name)[row]) for name in RECORD_COLUMNS]
+            offsets = self.store.column("segment_offsets")
+            segments = tuple(
+                CpSegment(*(float(self.store.column(name)[segment_row]) for name in SEGMENT_COLUMNS), segment_row)
+                for segment_row in (
+                    int(value) for value in self.store.column("segment_rows")[offsets[position]:offsets[position + 1]]
+                )
+            )
+            record = SpeciesRecord(self.store.formula(row), self.store.phase(row), *values, row, segments)
+        self._records[cache_key] = record
+        return record
+
+    def lookup_phases(self, formula):
+        """Return the SpeciesRecord of every phase of a formula, in database order."""
+        formula = formula.strip()
+        keys = self.store.column("index_keys")
+        # Keys of one formula are contiguous: "Al|g", "Al|l", "Al|s" sort before "Al}"
+        first = int(np.searchsorted(keys, species_key(formula, "")))
+        last = int(np.searchsorted(keys, formula + "}"))
+        phases = [str(key).split("|", 1)[1] for key in keys[first:last]]
+        records = [self.lookup(formula, phase) for phase in phases]
+        return tuple(sorted(records, key=lambda record: record.row))
+
+    def keys(self):
+        """Return the (formula, phase) pair of every species in the store, in key order."""
+        return [tuple(str(key).rsplit("|", 1)) for key in self.store.column("index_keys")]
+
+    def __len__(self):
+        return len(self.store.column("index_keys"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a species database into a memory-mapped store.")
+    parser.add_argument("source", help="species database (.json) or Thermodata workbook (.xlsx)")
+    parser.add_argument("store", help="output store directory, e.g. species.smkdb")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"records validated and written at a time (default: {DEFAULT_CHUNK_ROWS})")
+    args = parser.parse_args(argv)
+
+    report = ValidationReport()
+    try:
+        rows = compile_species_store(args.source, args.store, args.chunk_size, report)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    if report.issues:
+        print(report.summary())
+    print(f"Wrote {rows} species rows to {args.store}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
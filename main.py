@@ -1,20 +1,87 @@
+import time
+
+# Taken before any other import so the startup report covers the whole launch
+_launch_time = time.perf_counter()
+
+import argparse
+import sys
 import tkinter as tk
 from tkinter import ttk
 from User_interface_file.ui_plot_area import create_ui
+from data_process_file import instrumentation
+
+# Modules that must not be imported before the window is on screen
+HEAVY_MODULES = ["numpy", "pandas", "matplotlib", "sympy", "openpyxl"]
+
+
+def load_theme(root, style, theme):
+    # Each forest theme is sourced the first time it is selected, not at startup
+    if f"forest-{theme}" not in style.theme_names():
+        root.tk.call("source", f"forest-{theme}.tcl")
+    style.theme_use(f"forest-{theme}")
+
 
+def report_startup(root, budget_ms=None):
+    """
+    Print the time from launch to the first mapped window and any heavy module already loaded.
+
+    With a budget the window is closed right after the measurement and the process exits
+    with status 1 when the budget is exceeded or a heavy module was imported too early.
+    For a per-module breakdown run with python -X importtime.
+    """
+
+    def on_map(event):
+        if event.widget is not root:
+            return
+        root.unbind("<Map>")
+        root.update_idletasks()
+        elapsed_ms = (time.perf_counter() - _launch_time) * 1000
+        loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+        print(f"Time to first window: {elapsed_ms:.0f} ms")
+        print(f"Heavy modules loaded before the window: {', '.join(loaded) or 'none'}")
+
+        if budget_ms is not None:
+            over_budget = elapsed_ms > budget_ms
+            if over_budget:
+                print(f"Startup budget of {budget_ms:.0f} ms exceeded")
+            root.destroy()
+            sys.exit(1 if over_budget or loaded else 0)
+
+    root.bind("<Map>", on_map, add="+")
 
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Ellingham diagram calculator")
+    parser.add_argument("--theme", choices=["light", "dark"], default="light", help="window theme (default: light)")
+    parser.add_argument("--startup-report", action="store_true", help="print the time to first window")
+    parser.add_argument(
+        "--startup-budget", type=float, metavar="MS",
+        help="measure startup, close the window and exit with status 1 if it took longer than MS milliseconds",
+    )
+    parser.add_argument(
+        "--instrument", choices=instrumentation.REPORT_FORMATS,
+        help="print call counts and times of each calculation and plotting stage when the window closes",
+    )
+    parser.add_argument(
+        "--instrument-memory", action="store_true",
+        help="with --instrument, also record the tracemalloc peak of each stage (slower)",
+    )
+    args = parser.parse_args()
+
+    if args.instrument:
+        instrumentation.enable(memory=args.instrument_memory)
+        instrumentation.report_at_exit(args.instrument)
+
     root = tk.Tk()
 
     style = ttk.Style(root)
-    root.tk.call("source", "forest-light.tcl")
-    root.tk.call("source", "forest-dark.tcl") 
-    style.theme_use("forest-light")
+    load_theme(root, style, args.theme)
     root.title("Specifications")
     root.geometry("1370x911")  # Set the initial window size
     root.resizable(False, False) # Disable window resizing
     root.configure(bg="White")  # Set the background color
     create_ui(root)
-    root.mainloop()
\ No newline at end of file
+    if args.startup_report or args.startup_budget is not None:
+        report_startup(root, args.startup_budget)
+    root.mainloop()
@@ -0,0 +1,40 @@
+"""
+Shared fixtures for the tests.
+
+Run from the repository root:
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from benchmarks.synthetic_data import write_species_database  # noqa: E402
+from data_process_file.species_repository import clear_species_repositories  # noqa: E402
+from tests.species_rows import OXIDE_ROWS  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_repositories():
+    """Keep repositories parsed by one test out of the next."""
+    clear_species_repositories()
+    yield
+    clear_species_repositories()
+
+
+@pytest.fixture
+def write_database(tmp_path):
+    """Return a function writing rows (OXIDE_ROWS by default) as a JSON database under tmp_path."""
+    def write(rows=OXIDE_ROWS, name="species.json"):
+        return write_species_database(str(tmp_path / name), rows)
+
+    return write
+
+
+@pytest.fixture
+def species_database(write_database):
+    """Path of a JSON species database holding OXIDE_ROWS."""
+    return write_database()
@@ -0,0 +1,37 @@
+"""Species database rows shared by the tests."""
+
+
+def species_row(formula, phase, h298, s298, a=0.0, b=0.0, c=0.0, d=0.0, t1=298, t2=3000):
+    """Return one row in the species database schema."""
+    return {
+        "Formula": formula,
+        "MW (g/mol)": 100.0,
+        "Melting P. (K)": 0,
+        "Boiling P. (K)": 0,
+        "T1 (K)": t1,
+        "T2 (K)": t2,
+        "Phase": phase,
+        "H 298 (kcal/mol)": h298,
+        "S 298 (cal/mol*K)": s298,
+        "A": a,
+        "B": b,
+        "C": c,
+        "D": d,
+        "Density (g/cm3)": 1.0,
+    }
+
+
+# Rounded tabulated values; Al(l) is Al(s) plus the enthalpy and entropy of fusion
+OXIDE_ROWS = [
+    species_row("Al", "s", 0.0, 6.769, 4.94, 2.96),
+    species_row("Al", "l", 2.56, 9.511, 4.94, 2.96),
+    species_row("O2", "g", 0.0, 49.005, 7.16, 1.0, -0.4),
+    species_row("Al2O3", "s", -400.5, 12.17, 27.49, 2.82, -8.38),
+    species_row("C", "s", 0.0, 1.372, 0.026, 9.307, -0.354),
+    species_row("CO", "g", -26.417, 47.214, 6.79, 0.98, -0.11),
+    species_row("CO2", "g", -94.051, 51.072, 10.57, 2.1, -2.06),
+    species_row("Zn", "s", 0.0, 9.95, 5.35, 2.4),
+    species_row("ZnO", "s", -83.24, 10.43, 11.71, 1.22, -2.18),
+    species_row("Fe", "s", 0.0, 6.52, 4.18, 5.92),
+    species_row("FeO", "s", -65.02, 14.52, 12.62, 1.49, -0.76),
+]
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from calculation_file_module.adaptive_sampling import sample_reaction
+from calculation_file_module.calculation_engine_properties import find_reaction_phase_transitions
+from calculation_file_module.species_cache import default_species_cache
+from data_process_file.species_repository import get_species_repository
+
+REACTION = "4Al(*) + 3O2(g) = 2Al2O3(s)"
+# 2.56 kcal/mol over 2.742 cal/mol*K of fusion
+AL_MELTING_POINT = 2560 / 2.742
+
+
+@pytest.fixture
+def species_index(species_database):
+    return get_species_repository(species_database).index
+
+
+@pytest.mark.parametrize("max_points", [60, 1000])
+def test_points_gather_around_the_melting_point(species_index, max_points):
+    results = sample_reaction(species_index, REACTION, 298, 3000, max_points=max_points)
+    temperatures = results.temperatures
+
+    assert temperatures.size <= max_points
+    assert np.all(np.diff(temperatures) > 0)
+    near = np.abs(temperatures - AL_MELTING_POINT) < 100
+    # The 200 K around the melting point are 7% of the range
+    assert near.sum() > 0.25 * temperatures.size
+    assert np.diff(temperatures[near]).min() < np.diff(temperatures[~near]).min()
+
+
+def test_melting_point_is_reported_once(species_database, species_index):
+    results = sample_reaction(species_index, REACTION, 298, 3000)
+    uniform = find_reaction_phase_transitions(species_database, REACTION, np.linspace(298, 3000, 5000))
+
+    [transition] = results.transitions[0]
+    assert (transition.formula, transition.from_phase, transition.to_phase) == ("Al", "s", "l")
+    assert transition.temperature == pytest.approx(uniform[0].temperature, abs=1e-6)
+
+
+def test_refinement_passes_stay_out_of_the_shared_cache(species_index):
+    default_species_cache.clear()
+
+    results = sample_reaction(species_index, REACTION, 298, 3000)
+
+    assert results.temperatures.size > 17
+    # Al(*), O2(g) and Al2O3(s) on the starting grid only
+    assert len(default_species_cache) == 3
@@ -0,0 +1,71 @@
+import numpy as np
+
+from calculation_file_module import background_calculation
+from calculation_file_module.background_calculation import (
+    CANCELLED,
+    EQUILIBRIUM,
+    FAILED,
+    FINISHED,
+    REACTION,
+    CalculationJob,
+)
+
+REACTIONS = ["2C(s) + O2(g) = 2CO(g)", "Pt(s) + O2(g) = PtO2(s)", "2Zn(s) + O2(g) = 2ZnO(s)"]
+TEMPERATURES = np.linspace(400, 2000, 9)
+ENDINGS = (FINISHED, CANCELLED, FAILED)
+
+
+def messages(job):
+    """Drain job.queue the way the window's poll does, up to the message ending the stream."""
+    received = []
+    while not received or received[-1][0] not in ENDINGS:
+        received.append(job.queue.get(timeout=30))
+    job._thread.join(timeout=30)
+    assert job.queue.empty() and not job.is_alive()
+    return received
+
+
+def test_every_reaction_is_posted_in_order(species_database):
+    received = messages(CalculationJob(species_database, REACTIONS, TEMPERATURES).start())
+
+    assert [(kind, position) for kind, position, _ in received] == [
+        (REACTION, 0), (EQUILIBRIUM, 0), (REACTION, 1), (REACTION, 2), (EQUILIBRIUM, 2), (FINISHED, None)
+    ]
+    assert received[0][2].labels == ["2 C (s) + 1 O2 (g) = 2 CO (g)"]
+    assert received[2][2].labels == [None]
+    assert isinstance(received[1][2], list)
+
+
+def test_cancel_stops_at_the_next_step(monkeypatch, species_database):
+    job = CalculationJob(species_database, REACTIONS, TEMPERATURES)
+    calculate = background_calculation.calculate_reactions_batch_with_index
+
+    def cancel_during_first_reaction(*args):
+        job.cancel()
+        return calculate(*args)
+
+    monkeypatch.setattr(background_calculation, "calculate_reactions_batch_with_index", cancel_during_first_reaction)
+
+    received = messages(job.start())
+
+    assert [(kind, position) for kind, position, _ in received] == [(REACTION, 0), (CANCELLED, None)]
+
+
+def test_cancel_before_start_posts_only_cancelled(species_database):
+    job = CalculationJob(species_database, REACTIONS, TEMPERATURES)
+    job.cancel()
+
+    assert messages(job.start()) == [(CANCELLED, None, None)]
+
+
+def test_failures_end_the_stream(monkeypatch, tmp_path, species_database):
+    (kind, _, message), = messages(CalculationJob(str(tmp_path / "missing.json"), REACTIONS, TEMPERATURES).start())
+    assert kind == FAILED and "missing.json" in message
+
+    def broken(*args):
+        raise RuntimeError("engine broke")
+
+    monkeypatch.setattr(background_calculation, "calculate_reactions_batch_with_index", broken)
+    assert messages(CalculationJob(species_database, REACTIONS, TEMPERATURES).start()) == [
+        (FAILED, None, "engine broke")
+    ]
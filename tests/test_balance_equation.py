@@ -0,0 +1,37 @@
+import pytest
+
+from data_process_file.equation_processor import (
+    BalanceError,
+    balance_equation,
+    build_element_matrix,
+    solve_stoichiometry,
+)
+
+
+@pytest.mark.parametrize("equation, reactants, products", [
+    ("Al(s) + O2(g) = Al2O3(s)", ["4 Al (s)", "3 O2 (g)"], ["2 Al2O3 (s)"]),
+    ("C(s) + O2(g) = CO(g)", ["2 C (s)", "1 O2 (g)"], ["2 CO (g)"]),
+    ("Fe2O3(s) + CO(g) = Fe(s) + CO2(g)", ["1 Fe2O3 (s)", "3 CO (g)"], ["2 Fe (s)", "3 CO2 (g)"]),
+    ("C3H8(g) + O2(g) = CO2(g) + H2O(g)", ["1 C3H8 (g)", "5 O2 (g)"], ["3 CO2 (g)", "4 H2O (g)"]),
+    ("KMnO4 + HCl = KCl + MnCl2 + H2O + Cl2",
+     ["2 KMnO4", "16 HCl"], ["2 KCl", "2 MnCl2", "8 H2O", "5 Cl2"]),
+])
+def test_known_equations(equation, reactants, products):
+    assert balance_equation(equation) == (reactants, products)
+
+
+def test_coefficients_are_the_smallest_integers():
+    assert solve_stoichiometry(build_element_matrix(["Al", "O2"], ["Al2O3"])) == [4, 3, 2]
+
+
+def test_given_coefficients_replace_the_solved_ones():
+    assert balance_equation("Zn(s) + O2(g) = ZnO(s)", [4, 2, 4]) == (["4 Zn (s)", "2 O2 (g)"], ["4 ZnO (s)"])
+
+
+@pytest.mark.parametrize("equation, message", [
+    ("Al(s) = O2(g)", "cannot be balanced"),
+    ("H2 + O2 = H2O + H2O2", "ambiguous"),
+])
+def test_unbalanceable_equations_raise(equation, message):
+    with pytest.raises(BalanceError, match=message):
+        balance_equation(equation)
@@ -0,0 +1,53 @@
+import io
+
+import pandas as pd
+
+from calculation_file_module import batch_cli
+from calculation_file_module.result_store import RESULT_COLUMNS
+
+REACTIONS = """# Oxides
+4Al(s) + 3O2(g) = 2Al2O3(s)
+2C(s) + O2(g) = 2CO(g), 2Zn(s) + O2(g) = 2ZnO(s)
+"""
+
+
+def test_writes_every_reaction_at_every_temperature(tmp_path, capsys, species_database):
+    reactions = tmp_path / "reactions.txt"
+    reactions.write_text(REACTIONS, encoding="utf-8")
+    output = tmp_path / "results.csv"
+
+    status = batch_cli.main([str(reactions), "-t", "500,1000", "-d", species_database, "-o", str(output),
+                             "--chunk-size", "2"])
+
+    assert status == 0
+    assert "Wrote 3 reactions at 2 temperatures; 0 failed" in capsys.readouterr().err
+    table = pd.read_csv(output)
+    assert list(table.columns) == RESULT_COLUMNS
+    assert table["Reaction"].tolist() == [reaction for reaction in [
+        "4Al(s) + 3O2(g) = 2Al2O3(s)", "2C(s) + O2(g) = 2CO(g)", "2Zn(s) + O2(g) = 2ZnO(s)"
+    ] for _ in range(2)]
+    assert table["Temperature (K)"].tolist() == [500, 1000] * 3
+    assert table["Delta G"].notna().all()
+
+
+def test_stdout_carries_only_the_table_when_a_reaction_fails(monkeypatch, capsys, species_database):
+    monkeypatch.setattr("sys.stdin", io.StringIO("Pt(s) + O2(g) = PtO2(s)\n2C(s) + O2(g) = 2CO(g)\n"))
+
+    status = batch_cli.main(["-t", "298:1000:3", "-d", species_database])
+
+    assert status == 1
+    captured = capsys.readouterr()
+    table = pd.read_csv(io.StringIO(captured.out))
+    assert list(table.columns) == RESULT_COLUMNS
+    assert table["Reaction"].unique().tolist() == ["2C(s) + O2(g) = 2CO(g)"]
+    assert "Calculation failed for 'Pt(s) + O2(g) = PtO2(s)'" in captured.err
+
+
+def test_database_failing_in_a_worker_exits_with_an_error(monkeypatch, capsys, species_database):
+    monkeypatch.setattr("sys.stdin", io.StringIO("2C(s) + O2(g) = 2CO(g)\n"))
+    monkeypatch.setattr(batch_cli, "iter_reaction_chunks_parallel", lambda *args: iter([None]))
+
+    status = batch_cli.main(["-t", "500", "-d", species_database])
+
+    assert status == 1
+    assert "Could not load species database" in capsys.readouterr().err
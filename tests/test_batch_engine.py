@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from calculation_file_module.batch_engine import calculate_reactions_batch
+from calculation_file_module.calculation_engine_properties import calculate_species_properties, perform_calculations
+from data_process_file.species_repository import get_species_repository
+
+MELTING = "Al(s) = Al(l)"
+TEMPERATURES = np.linspace(300, 1500, 7)
+
+
+def test_single_species_equation_is_product_minus_reactant(species_database):
+    index = get_species_repository(species_database).index
+    solid = calculate_species_properties(index.lookup("Al", "s"), TEMPERATURES)
+    liquid = calculate_species_properties(index.lookup("Al", "l"), TEMPERATURES)
+
+    results = calculate_reactions_batch(species_database, [MELTING, "2Zn(s) + O2(g) = 2ZnO(s)"], TEMPERATURES)
+
+    assert results.labels[0] == "1 Al (s) = 1 Al (l)"
+    for name, position in [("delta_G", 0), ("enthalpy", 2), ("entropy", 3)]:
+        np.testing.assert_allclose(getattr(results, name)[0], liquid[position] - solid[position], err_msg=name)
+    assert perform_calculations(species_database, TEMPERATURES[4], MELTING)[0] == pytest.approx(results.delta_G[0][4])
+
+
+def test_duplicate_and_failed_reactions_keep_their_rows(species_database):
+    results = calculate_reactions_batch(
+        species_database, ["2C(s) + O2(g) = 2CO(g)", "Pt(s) + O2(g) = PtO2(s)", "2C(s) + O2(g) = 2CO(g)"], TEMPERATURES
+    )
+
+    assert results.labels[1] is None and np.isnan(results.delta_G[1]).all()
+    np.testing.assert_array_equal(results.delta_G[0], results.delta_G[2])
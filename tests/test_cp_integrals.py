@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from calculation_file_module import calculation_engine_properties
+from calculation_file_module.batch_engine import calculate_reactions_batch
+from calculation_file_module.calculation_engine_properties import calculate_species_properties, compare_species_integrals
+from calculation_file_module.species_cache import SpeciesFunctionCache
+from data_process_file.species_repository import get_species_repository
+
+TEMPERATURES = np.linspace(300, 1500, 5)
+
+
+@pytest.mark.parametrize("enabled, comparisons", [(True, 3), (False, 0)])
+def test_batch_engine_compares_species_integrals(monkeypatch, species_database, enabled, comparisons):
+    compared = []
+    compare = calculation_engine_properties.compare_species_integrals
+
+    def recording_compare(record, *args):
+        compared.append(record.formula)
+        return compare(record, *args)
+
+    monkeypatch.setattr(calculation_engine_properties, "COMPARE_CP_INTEGRALS", enabled)
+    monkeypatch.setattr("calculation_file_module.species_cache.compare_species_integrals", recording_compare)
+
+    results = calculate_reactions_batch(
+        species_database, ["2Zn(s) + O2(g) = 2ZnO(s)"], TEMPERATURES, SpeciesFunctionCache()
+    )
+
+    assert results.labels[0] is not None
+    assert sorted(compared) == ["O2", "Zn", "ZnO"][:comparisons]
+
+
+def test_closed_form_agrees_with_the_summation(species_database):
+    record = get_species_repository(species_database).index.lookup("O2", "g")
+    _, _, enthalpy, entropy = calculate_species_properties(record, TEMPERATURES)
+
+    assert compare_species_integrals(record, TEMPERATURES, enthalpy, entropy)
+    assert not compare_species_integrals(record, TEMPERATURES, enthalpy + 1, entropy)
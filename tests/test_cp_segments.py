@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+import pytest
+
+from calculation_file_module.calculation_engine_properties import calculate_species_properties
+from data_process_file.species_repository import get_species_repository
+from tests.species_rows import species_row
+
+H298, S298 = -2.0, 6.5
+# Database coefficients of the two ranges; the engine uses them divided by 1000
+LOW = (5.0, 2.0, -1.0, 0.5)
+HIGH = (8.0, 1.0, -3.0, 0.2)
+BOUNDARY = 1000.0
+
+
+def scaled(coefficients):
+    return [value / 1000 for value in coefficients]
+
+
+def enthalpy_antiderivative(coefficients, t):
+    """Antiderivative of the engine's heat capacity term."""
+    a, b, c, d = scaled(coefficients)
+    return (a * (t - 298) ** 2 / 2 + b * 1e-3 / 2 * (t ** 3 / 3 - 298 ** 2 * t)
+            + c * 1e5 * (t / 298 - math.log(t)) + d * 1e-6 / 3 * (t ** 4 / 4 - 298 ** 3 * t))
+
+
+def entropy_antiderivative(coefficients, t):
+    """Antiderivative of the engine's heat capacity term divided by T."""
+    a, b, c, d = scaled(coefficients)
+    return (a * (t - 298 * math.log(t)) + b * 1e-3 / 2 * (t ** 2 / 2 - 298 ** 2 * math.log(t))
+            + c * 1e5 * (math.log(t) / 298 + 1 / t) + d * 1e-6 / 3 * (t ** 3 / 3 - 298 ** 3 * math.log(t)))
+
+
+@pytest.fixture
+def two_range_species(write_database):
+    path = write_database([
+        species_row("Fe", "s", H298, S298, *LOW, t1=298, t2=BOUNDARY),
+        species_row("Fe", "s", H298, S298, *HIGH, t1=BOUNDARY, t2=3000),
+    ])
+    return get_species_repository(path).index.lookup("Fe", "s")
+
+
+def test_properties_are_continuous_at_the_boundary(two_range_species):
+    assert [segment.t1 for segment in two_range_species.segments] == [298, BOUNDARY]
+    gibbs, heat_capacity, enthalpy, entropy = calculate_species_properties(
+        two_range_species, np.array([BOUNDARY - 1e-7, BOUNDARY, BOUNDARY + 1e-7])
+    )
+    for name, values in [("gibbs", gibbs), ("heat capacity", heat_capacity), ("enthalpy", enthalpy),
+                         ("entropy", entropy)]:
+        np.testing.assert_allclose(values, values[1], rtol=0, atol=1e-6, err_msg=name)
+
+
+@pytest.mark.parametrize("temperature", [500.0, 1500.0, 2800.0])
+def test_properties_match_the_integral_over_both_ranges(two_range_species, temperature):
+    if temperature <= BOUNDARY:
+        enthalpy = H298 + enthalpy_antiderivative(LOW, temperature) - enthalpy_antiderivative(LOW, 298)
+        entropy = S298 + entropy_antiderivative(LOW, temperature) - entropy_antiderivative(LOW, 298)
+    else:
+        enthalpy = (H298 + enthalpy_antiderivative(LOW, BOUNDARY) - enthalpy_antiderivative(LOW, 298)
+                    + enthalpy_antiderivative(HIGH, temperature) - enthalpy_antiderivative(HIGH, BOUNDARY))
+        entropy = (S298 + entropy_antiderivative(LOW, BOUNDARY) - entropy_antiderivative(LOW, 298)
+                   + entropy_antiderivative(HIGH, temperature) - entropy_antiderivative(HIGH, BOUNDARY))
+
+    _, _, calculated_enthalpy, calculated_entropy = calculate_species_properties(
+        two_range_species, np.array([temperature])
+    )
+
+    assert calculated_enthalpy[0] == pytest.approx(enthalpy, rel=1e-9)
+    assert calculated_entropy[0] == pytest.approx(entropy, rel=1e-9)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from calculation_file_module.batch_engine import calculate_reactions_batch
+from calculation_file_module.ellingham_analysis import EllinghamIndex, oxygen_coefficient
+
+ALUMINA = "4Al(s) + 3O2(g) = 2Al2O3(s)"
+CARBON_MONOXIDE = "2C(s) + O2(g) = 2CO(g)"
+BOUDOUARD = "C(s) + CO2(g) = 2CO(g)"
+
+TEMPERATURES = np.linspace(298, 3000, 28)
+# Straight-line Ellingham fits in kJ per mole of O2
+ALUMINA_PER_O2 = -1120 + 0.214 * TEMPERATURES
+CARBON_MONOXIDE_PER_O2 = -221 - 0.179 * TEMPERATURES
+# (-1120 + 221) / (-0.179 - 0.214)
+CROSSING = 899 / 0.393
+
+
+def test_oxygen_coefficient():
+    assert oxygen_coefficient(ALUMINA) == 3
+    assert oxygen_coefficient(CARBON_MONOXIDE) == 1
+    assert oxygen_coefficient("2CO(g) + O2(g) = 2CO2(g)") == 1
+    assert oxygen_coefficient(BOUDOUARD) is None
+
+
+def test_curves_are_compared_per_mole_of_oxygen():
+    # As calculated, the alumina line is for 3 O2 and would only cross carbon at 3823 K
+    index = EllinghamIndex([
+        (ALUMINA, TEMPERATURES, 3 * ALUMINA_PER_O2),
+        (CARBON_MONOXIDE, TEMPERATURES, CARBON_MONOXIDE_PER_O2),
+        (BOUDOUARD, TEMPERATURES, 40 - 0.04 * TEMPERATURES),
+    ])
+
+    assert len(index) == 2 and BOUDOUARD not in index
+    assert index.delta_G(ALUMINA, 1000) == pytest.approx(-1120 + 214)
+    (crossing,) = index.crossings
+    assert crossing.temperature == pytest.approx(CROSSING)
+    assert (crossing.stable_below, crossing.stable_above) == (ALUMINA, CARBON_MONOXIDE)
+    assert index.most_stable(1500) == ALUMINA
+    assert index.most_stable(2500) == CARBON_MONOXIDE
+    (agent,) = index.reducing_agents(ALUMINA, 298, 3000)
+    assert agent.equation == CARBON_MONOXIDE
+    assert (agent.temperature_from, agent.temperature_to) == pytest.approx((CROSSING, 3000))
+
+
+def test_index_from_engine_results(species_database):
+    results = calculate_reactions_batch(species_database, [ALUMINA, CARBON_MONOXIDE], TEMPERATURES)
+
+    index = EllinghamIndex.from_results(results)
+
+    np.testing.assert_allclose(
+        [index.delta_G(ALUMINA, temperature) for temperature in TEMPERATURES], results.delta_G[0] / 3
+    )
+    np.testing.assert_allclose(
+        [index.delta_G(CARBON_MONOXIDE, temperature) for temperature in TEMPERATURES], results.delta_G[1]
+    )
+
+
+def test_sweep_finds_every_pairwise_crossing():
+    rng = np.random.default_rng(0)
+    intercepts = rng.uniform(-1200, -100, 30)
+    slopes = rng.uniform(-0.3, 0.3, 30)
+    curves = [(f"line {number}", TEMPERATURES, intercept + slope * TEMPERATURES)
+              for number, (intercept, slope) in enumerate(zip(intercepts, slopes))]
+    # Two straight lines cross where their intercepts and slopes balance
+    expected = sorted(
+        temperature
+        for first in range(len(curves)) for second in range(first + 1, len(curves))
+        for temperature in [(intercepts[second] - intercepts[first]) / (slopes[first] - slopes[second])]
+        if TEMPERATURES[0] < temperature < TEMPERATURES[-1]
+    )
+
+    index = EllinghamIndex(curves, normalize=False)
+
+    assert len(index) == len(curves)
+    assert sorted(crossing.temperature for crossing in index.crossings) == pytest.approx(expected)
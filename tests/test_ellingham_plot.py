@@ -0,0 +1,44 @@
+import logging
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from calculation_file_module.calculation_plot_file import annotate_ellingham, ellingham_plot, plot_ellingham_diagram
+from calculation_file_module.ellingham_analysis import EllinghamIndex
+
+ALUMINA = "4Al(*) + 3O2(g) = 2Al2O3(s)"
+CARBON_MONOXIDE = "2C(s) + O2(g) = 2CO(g)"
+
+
+def test_plotting_logs_instead_of_printing(capsys, caplog, species_database):
+    canvas = FigureCanvasAgg(Figure())
+
+    with caplog.at_level(logging.INFO, logger="calculation_file_module.calculation_plot_file"):
+        points = plot_ellingham_diagram(
+            species_database, [ALUMINA, CARBON_MONOXIDE, "Ti(s) + O2(g) = TiO2(s)"], 298, 3000, 200, canvas,
+            adaptive=True, annotate=True,
+        )
+
+    assert capsys.readouterr().out == ""
+    assert list(points) == [ALUMINA, CARBON_MONOXIDE]
+    messages = [(record.levelname, record.getMessage()) for record in caplog.records]
+    assert ("ERROR", "Error: Calculation failed for 'Ti(s) + O2(g) = TiO2(s)'. Skipping...") in messages
+    info = [message for level, message in messages if level == "INFO"]
+    assert any(message.endswith(f": {points[ALUMINA]} points") for message in info)
+    assert any("Al changes from (s) to (l)" in message for message in info)
+
+
+def test_envelope_changes_are_logged(capsys, caplog):
+    temperatures = np.linspace(298, 3000, 28)
+    index = EllinghamIndex([
+        ("4Al(s) + 3O2(g) = 2Al2O3(s)", temperatures, 3 * (-1120 + 0.214 * temperatures)),
+        ("2C(s) + O2(g) = 2CO(g)", temperatures, -221 - 0.179 * temperatures),
+    ])
+
+    with caplog.at_level(logging.INFO, logger="calculation_file_module.calculation_plot_file"):
+        annotate_ellingham(ellingham_plot(FigureCanvasAgg(Figure())), index)
+
+    assert capsys.readouterr().out == ""
+    [message] = caplog.messages
+    assert message == "Most stable above 2287.5 K: 2C(s) + O2(g) = 2CO(g) (was 4Al(s) + 3O2(g) = 2Al2O3(s))"
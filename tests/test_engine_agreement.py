@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from calculation_file_module.batch_engine import calculate_reactions_batch
+from calculation_file_module.calculation_engine_properties import perform_calculations, perform_calculations_sweep
+
+EQUATIONS = [
+    "4Al(*) + 3O2(g) = 2Al2O3(s)",
+    "2C(s) + O2(g) = 2CO(g)",
+    "2Zn(s) + O2(g) = 2ZnO(s)",
+    "Al(*)",
+]
+# Either side of the Al melting point
+TEMPERATURES = np.linspace(300, 2500, 12)
+PROPERTIES = ["delta_G", "heat_capacity", "enthalpy", "entropy"]
+
+
+@pytest.mark.parametrize("row, equation", list(enumerate(EQUATIONS)))
+def test_scalar_sweep_and_batch_agree(species_database, row, equation):
+    batch = calculate_reactions_batch(species_database, EQUATIONS, TEMPERATURES)
+    sweep = perform_calculations_sweep(species_database, TEMPERATURES, equation)
+    scalar = np.array([perform_calculations(species_database, temperature, equation)[:4]
+                       for temperature in TEMPERATURES], dtype=float).T
+
+    assert batch.labels[row] is not None
+    for position, name in enumerate(PROPERTIES):
+        batch_values = getattr(batch, name)[row]
+        np.testing.assert_allclose(np.broadcast_to(sweep[position], TEMPERATURES.shape), batch_values,
+                                   rtol=1e-9, atol=1e-9, err_msg=name)
+        np.testing.assert_allclose(scalar[position], batch_values, rtol=1e-9, atol=1e-9, err_msg=name)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from calculation_file_module.calculation_engine_properties import perform_calculations, perform_calculations_sweep
+from calculation_file_module.equilibrium_solver import DEFAULT_TOLERANCE, find_equilibrium_temperatures
+from tests.species_rows import species_row
+
+EQUATION = "X(s) + Y(g) = XY(g)"
+
+
+@pytest.fixture
+def equilibrium_database(write_database):
+    # Zero heat capacities are scaled to 1e-6, so Delta G stays close to 12 - 0.01 T
+    # and crosses zero once, a little above 1200 K
+    return write_database([
+        species_row("X", "s", 0.0, 2.0),
+        species_row("Y", "g", 0.0, 3.0),
+        species_row("XY", "g", 12.0, 5.01),
+    ])
+
+
+@pytest.mark.parametrize("method", ["brent", "newton"])
+def test_root_is_where_delta_g_changes_sign(equilibrium_database, method):
+    (root,) = find_equilibrium_temperatures(equilibrium_database, EQUATION, 298, 3000, method=method)
+
+    below = perform_calculations(equilibrium_database, root.temperature - DEFAULT_TOLERANCE, EQUATION)[0]
+    above = perform_calculations(equilibrium_database, root.temperature + DEFAULT_TOLERANCE, EQUATION)[0]
+    assert 1200 < root.temperature < 1250
+    assert below > 0 > above
+    assert root.spontaneous_above
+
+    temperatures = np.linspace(298, 3000, 27_021)
+    delta_G = perform_calculations_sweep(equilibrium_database, temperatures, EQUATION)[0]
+    (change,) = np.flatnonzero(np.diff(np.sign(delta_G)))
+    assert temperatures[change] <= root.temperature <= temperatures[change + 1]
+
+
+def test_range_without_a_root(equilibrium_database):
+    assert find_equilibrium_temperatures(equilibrium_database, EQUATION, 298, 1000) == []
+
+
+def test_unknown_method_raises(equilibrium_database):
+    with pytest.raises(ValueError, match="Unknown method"):
+        find_equilibrium_temperatures(equilibrium_database, EQUATION, 298, 3000, method="secant")
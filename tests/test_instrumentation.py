@@ -0,0 +1,73 @@
+import io
+import itertools
+import json
+
+import pytest
+
+from data_process_file import instrumentation
+from data_process_file.instrumentation import collected, instrumented, span
+
+
+@pytest.fixture
+def clean_instrumentation():
+    was_enabled = instrumentation.is_enabled()
+    instrumentation.disable()
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+    if was_enabled:
+        instrumentation.enable()
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Make every perf_counter call advance the clock by one second."""
+    ticks = itertools.count()
+    monkeypatch.setattr(instrumentation.time, "perf_counter", lambda: float(next(ticks)))
+
+
+@instrumented("test.work")
+def work(value):
+    return value * 2
+
+
+def test_spans_do_nothing_while_off(clean_instrumentation):
+    assert span("test.block") is span("test.other")
+    with span("test.block"):
+        assert work(2) == 4
+
+    assert collected() == {}
+    assert instrumentation.format_table() == "No instrumented stages ran."
+
+
+def test_totals_add_up(clean_instrumentation, fake_clock):
+    instrumentation.enable()
+    for _ in range(3):
+        with span("test.outer"):
+            work(1)
+            work(2)
+
+    stats = collected()
+
+    # Each span reads the clock twice; an outer span also spans its two inner ones
+    assert stats["test.work"] == {"calls": 6, "total_s": 6.0, "mean_s": 1.0, "max_s": 1.0, "peak_memory_bytes": None}
+    assert stats["test.outer"]["calls"] == 3
+    assert stats["test.outer"]["total_s"] == 3 * 5.0
+    assert stats["test.outer"]["max_s"] == 5.0
+    assert list(stats) == ["test.outer", "test.work"]
+
+    stream = io.StringIO()
+    instrumentation.report("json", stream)
+    assert json.loads(stream.getvalue()) == {"memory": False, "stages": stats}
+
+
+def test_disable_keeps_the_totals_until_reset(clean_instrumentation):
+    instrumentation.enable()
+    work(1)
+    instrumentation.disable()
+    work(1)
+
+    assert collected()["test.work"]["calls"] == 1
+    instrumentation.reset()
+    assert collected() == {}
@@ -0,0 +1,31 @@
+import numpy as np
+
+from calculation_file_module.batch_engine import calculate_reactions_batch
+from calculation_file_module.parallel_engine import calculate_reactions_parallel
+
+REACTIONS = [
+    "4Al(*) + 3O2(g) = 2Al2O3(s)",
+    "2C(s) + O2(g) = 2CO(g)",
+    "Pt(s) + O2(g) = PtO2(s)",
+    "2Zn(s) + O2(g) = 2ZnO(s)",
+    "C(s) + O2(g) = CO2(g)",
+    "2Fe(s) + O2(g) = 2FeO(s)",
+    "C(s) + CO2(g) = 2CO(g)",
+]
+TEMPERATURES = np.linspace(400, 2400, 9)
+
+
+def test_two_workers_match_the_serial_batch_in_order(species_database):
+    serial = calculate_reactions_batch(species_database, REACTIONS, TEMPERATURES)
+
+    parallel = calculate_reactions_parallel(species_database, REACTIONS, TEMPERATURES, workers=2, chunk_size=2)
+
+    assert parallel.equations == serial.equations
+    assert parallel.labels == serial.labels and parallel.labels[2] is None
+    assert parallel.transitions == serial.transitions
+    for name in ["delta_G", "heat_capacity", "enthalpy", "entropy"]:
+        np.testing.assert_array_equal(getattr(parallel, name), getattr(serial, name), err_msg=name)
+
+
+def test_missing_database_gives_none(tmp_path):
+    assert calculate_reactions_parallel(str(tmp_path / "missing.json"), REACTIONS, TEMPERATURES, workers=2) is None
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from calculation_file_module.calculation_engine_properties import (
+    find_reaction_phase_transitions,
+    select_stable_phase,
+)
+from data_process_file.species_repository import PhaseChoice, get_species_repository
+
+# 2.56 kcal/mol over 2.742 cal/mol*K of fusion
+AL_MELTING_POINT = 2560 / 2.742
+
+
+def test_aluminium_melts_at_its_melting_point(species_database):
+    transitions = find_reaction_phase_transitions(
+        species_database, "4Al(*) + 3O2(g) = 2Al2O3(s)", np.linspace(298, 2000, 200)
+    )
+
+    assert [(t.formula, t.from_phase, t.to_phase) for t in transitions] == [("Al", "s", "l")]
+    assert transitions[0].temperature == pytest.approx(AL_MELTING_POINT, abs=1.0)
+
+
+def test_stable_phase_follows_the_melting_point(species_database):
+    choice = PhaseChoice("Al", get_species_repository(species_database).index.lookup_phases("Al"))
+    phases = [record.phase for record in choice.records]
+
+    *_, stable = select_stable_phase(choice, np.array([300.0, 900.0, 950.0, 1500.0]))
+
+    assert [phases[position] for position in stable] == ["s", "s", "l", "l"]
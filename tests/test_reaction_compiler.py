@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from calculation_file_module.batch_engine import calculate_reactions_batch
+from calculation_file_module.calculation_engine_properties import (
+    calculate_heat_capacity,
+    evaluate_reaction_constants,
+    perform_calculations,
+)
+from calculation_file_module.reaction_compiler import compile_reaction
+from data_process_file.species_repository import get_species_repository
+
+ZINC_OXIDATION = "2Zn(s) + O2(g) = 2ZnO(s)"
+
+
+def test_constants_weight_every_coefficient_by_stoichiometry(species_database):
+    _, constants = compile_reaction(ZINC_OXIDATION).resolve(get_species_repository(species_database).index)
+
+    assert constants.delta_h == pytest.approx(2 * -83.24)
+    assert constants.delta_s == pytest.approx(2 * 10.43 - 2 * 9.95 - 49.005)
+    assert constants.delta_a == pytest.approx((2 * 11.71 - 2 * 5.35 - 7.16) / 1000)
+    assert constants.delta_b == pytest.approx((2 * 1.22 - 2 * 2.4 - 1.0) / 1000)
+    # Zero coefficients count as 1e-6 each
+    assert constants.delta_c == pytest.approx((2 * -2.18 + 0.4) / 1000 - 2e-6)
+    assert constants.delta_d == pytest.approx(-1e-6)
+
+
+def test_heat_capacity_uses_the_reaction_deltas(species_database):
+    _, constants = compile_reaction(ZINC_OXIDATION).resolve(get_species_repository(species_database).index)
+
+    delta_G, heat_capacity, _, _, _ = evaluate_reaction_constants(constants, 1000.0)
+
+    assert heat_capacity == pytest.approx(calculate_heat_capacity(*constants[2:], 1000.0))
+    assert heat_capacity == pytest.approx(1.438656, rel=1e-6)
+    assert delta_G == pytest.approx(47877.750162, rel=1e-9)
+
+
+def test_missing_species_fails_the_whole_reaction(species_database):
+    repository = get_species_repository(species_database)
+
+    with pytest.raises(ValueError, match="'QO' with state 's' not found"):
+        compile_reaction("2Q(s) + O2(g) = 2QO(s)").resolve(repository.index)
+    assert perform_calculations(species_database, 1000.0, "2Q(s) + O2(g) = 2QO(s)") is None
+
+    results = calculate_reactions_batch(species_database, ["2Q(s) + O2(g) = 2QO(s)", ZINC_OXIDATION], [500.0, 1000.0])
+    assert results.labels[0] is None
+    assert np.isnan(results.delta_G[0]).all()
+    assert results.labels[1] is not None
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calculation_file_module.batch_engine import calculate_reactions_batch
+from calculation_file_module.result_export import ResultWriter, export_batches, load_npz_results
+from calculation_file_module.result_store import RESULT_COLUMNS, SessionResultStore, export_results_file
+
+REACTIONS = ["2Zn(s) + O2(g) = 2ZnO(s)", "2C(s) + O2(g) = 2CO(g)"]
+TEMPERATURES = np.linspace(400, 1600, 7)
+
+
+@pytest.fixture
+def results(species_database):
+    return calculate_reactions_batch(species_database, REACTIONS, TEMPERATURES)
+
+
+def test_result_writer_needs_a_write_method():
+    with pytest.raises(TypeError):
+        ResultWriter()
+
+
+def test_every_format_has_the_same_columns(tmp_path, results):
+    store = SessionResultStore()
+    store.add_batch(results)
+    workbook = export_results_file(store.results(), str(tmp_path / "results.xlsx"))
+    table = export_results_file(store.results(), str(tmp_path / "results.csv"))
+
+    from_workbook = pd.read_excel(workbook)
+    from_table = pd.read_csv(table)
+
+    assert list(from_workbook.columns) == list(from_table.columns) == RESULT_COLUMNS
+    assert not any("kJ" in column for column in RESULT_COLUMNS)
+    pd.testing.assert_frame_equal(from_workbook, from_table, check_dtype=False)
+
+
+def test_npz_round_trip(tmp_path, results):
+    path = str(tmp_path / "results.npz")
+    assert export_batches([results], path) == len(REACTIONS) * TEMPERATURES.size
+
+    (loaded,) = load_npz_results(path)
+
+    assert loaded.equations == results.equations
+    np.testing.assert_array_equal(loaded.delta_G, results.delta_G)
+
+
+@pytest.mark.parametrize("name", ["results.csv", "results.tsv", "results.npz", "results.parquet", "results.xlsx"])
+def test_path_objects_are_written(tmp_path, results, name):
+    if name.endswith(".parquet"):
+        pytest.importorskip("pyarrow")
+    store = SessionResultStore()
+    store.add_batch(results)
+
+    path = export_results_file(store.results(), tmp_path / name)
+
+    assert (tmp_path / name).stat().st_size > 0 and path == tmp_path / name
+
+
+def test_xls_is_not_accepted(tmp_path, results):
+    store = SessionResultStore()
+    store.add_batch(results)
+
+    with pytest.raises(ValueError, match="export format"):
+        export_results_file(store.results(), str(tmp_path / "results.xls"))
@@ -0,0 +1,38 @@
+import numpy as np
+
+from calculation_file_module.species_cache import SpeciesFunctionCache, species_property_matrices
+from data_process_file.species_repository import get_species_repository
+
+
+def records(species_database, *keys):
+    index = get_species_repository(species_database).index
+    return [index.lookup(formula, phase) for formula, phase in keys]
+
+
+def test_columns_of_several_grids_are_kept(species_database):
+    species = records(species_database, ("O2", "g"), ("ZnO", "s"))
+    cache = SpeciesFunctionCache()
+    plot_grid = np.linspace(298, 2000, 50)
+    pass_grid = np.linspace(298, 2000, 17)
+
+    cache.matrices(species, plot_grid)
+    cache.matrices(species, pass_grid)
+    gibbs, *_ = cache.matrices(species, plot_grid)
+
+    assert (cache.misses, cache.hits) == (4, 2)
+    np.testing.assert_array_equal(gibbs, species_property_matrices(species, plot_grid)[0])
+
+
+def test_least_recently_used_grid_is_dropped(species_database):
+    species = records(species_database, ("O2", "g"), ("ZnO", "s"))
+    cache = SpeciesFunctionCache(max_species=4)
+    grids = [np.linspace(298, 2000, points) for points in (10, 20, 30)]
+
+    cache.matrices(species, grids[0])
+    cache.matrices(species, grids[1])
+    cache.matrices(species, grids[2])
+    assert len(cache) == 4
+
+    cache.matrices(species, grids[2])
+    cache.matrices(species, grids[0])
+    assert (cache.misses, cache.hits) == (8, 2)
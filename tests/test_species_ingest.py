@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from data_process_file.data_processor_module import preprocess_data, validate_data
+from data_process_file.species_ingest import ValidationReport, clean_species_table, ingest_species_database
+from tests.species_rows import OXIDE_ROWS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7])
+def test_chunked_ingest_matches_a_single_chunk(write_database, chunk_size):
+    # The repeats fall in later chunks than the rows they duplicate
+    path = write_database(OXIDE_ROWS + OXIDE_ROWS[:4] + OXIDE_ROWS[8:])
+    whole_report, chunked_report = ValidationReport(), ValidationReport()
+
+    whole = ingest_species_database(path, chunk_size=len(OXIDE_ROWS) * 2, report=whole_report)
+    chunked = ingest_species_database(path, chunk_size=chunk_size, report=chunked_report)
+
+    assert len(whole) == len(OXIDE_ROWS)
+    pd.testing.assert_frame_equal(chunked, whole)
+    assert (chunked_report.rows_read, chunked_report.rows_kept) == (whole_report.rows_read, whole_report.rows_kept)
+
+
+def test_deprecated_validate_and_preprocess_still_clean_a_table():
+    frame = pd.DataFrame(OXIDE_ROWS + [dict(OXIDE_ROWS[0], Phase="x"), dict(OXIDE_ROWS[-1], A="n/a")])
+
+    with pytest.warns(DeprecationWarning):
+        report = validate_data(frame)
+    with pytest.warns(DeprecationWarning):
+        data = preprocess_data(frame)
+
+    assert {issue.code for issue in report.issues} == {"invalid_phase", "non_numeric"}
+    # Both extra rows repeat a (Formula, Phase) already in the table
+    pd.testing.assert_frame_equal(data, clean_species_table(pd.DataFrame(OXIDE_ROWS)))
+    with pytest.warns(DeprecationWarning), pytest.raises(ValueError, match="Formula"):
+        validate_data(frame.drop(columns="Formula"))
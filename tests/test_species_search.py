@@ -0,0 +1,72 @@
+import itertools
+
+import pytest
+
+from data_process_file.species_repository import get_species_repository
+from data_process_file.species_search import SpeciesSearchIndex, did_you_mean, format_suggestions, missing_species
+
+KEYS = [("Al", "s"), ("Al", "l"), ("Al2O3", "s"), ("Al2O3", "l"), ("AlCl3", "s"), ("C", "s"), ("CO", "g"),
+        ("CO2", "g"), ("Cu", "s"), ("Cu2O", "s"), ("CuO", "s"), ("Fe", "s"), ("FeO", "s"), ("Fe2O3", "s")]
+
+
+@pytest.fixture
+def search():
+    return SpeciesSearchIndex(KEYS)
+
+
+def levenshtein(first, second):
+    row = list(range(len(second) + 1))
+    for position, character in enumerate(first, 1):
+        previous, row[0] = row[0], position
+        for column, other in enumerate(second, 1):
+            previous, row[column] = row[column], min(row[column] + 1, row[column - 1] + 1, previous + (character != other))
+    return row[-1]
+
+
+def test_prefix_completion(search):
+    assert search.complete("al2") == [("Al2O3", "s"), ("Al2O3", "l")]
+    assert search.complete("Al") == [("Al", "s"), ("Al", "l"), ("Al2O3", "s"), ("Al2O3", "l"), ("AlCl3", "s")]
+    assert search.complete("al2o3(l") == [("Al2O3", "l")]
+    assert search.complete("Cu", limit=2) == [("Cu", "s"), ("Cu2O", "s")]
+    assert search.complete("Zn") == [] and search.complete("  ") == []
+
+
+def test_one_edit_typo(search):
+    assert search.similar("Al2O4") == [(1, "Al2O3")]
+    assert search.similar("FeO3") == [(1, "Fe2O3"), (1, "FeO"), (2, "Fe")]
+    assert search.similar("feo")[0] == (0, "FeO")
+
+
+@pytest.mark.parametrize("formula", ["Al2O4", "Cu3O", "CO3", "Fe3O4", "AlCl", "Xx"])
+def test_similar_matches_a_full_levenshtein_scan(search, formula):
+    names = {name for name, _ in KEYS}
+    expected = sorted((levenshtein(formula.lower(), name.lower()), name) for name in names
+                      if levenshtein(formula.lower(), name.lower()) <= 2 and name != formula)
+
+    assert search.similar(formula, limit=len(names)) == expected
+
+
+def test_no_match(search):
+    assert search.similar("Ti3N4") == []
+    assert search.complete("Ti") == []
+
+
+def test_did_you_mean(species_database):
+    index = get_species_repository(species_database).index
+
+    assert did_you_mean(index, "Al2O3", "g") == ["Al2O3(s)"]
+    assert did_you_mean(index, "ZnO2", "s") == ["ZnO(s)", "CO2(g)", "O2(g)"]
+    assert did_you_mean(index, "Zm", "*")[0] == "Zn(*)"
+    assert did_you_mean(index, "Ti3N4", "s") == []
+    assert format_suggestions([]) == ""
+    assert format_suggestions(["ZnO(s)"]) == " Did you mean ZnO(s)?"
+    assert format_suggestions(["A(s)", "B(s)", "C(s)"]) == " Did you mean A(s), B(s) or C(s)?"
+
+
+def test_missing_species_in_the_order_typed(species_database):
+    index = get_species_repository(species_database).index
+
+    missing = missing_species(index, ["2Zn(s) + O2(g) = 2ZnO2(s)", "Ti(s) + O2(g) = TiO2(s)", "Al(*) + O2(g) = Al2O3(s)"])
+
+    assert [(formula, phase) for formula, phase, _ in missing] == [("ZnO2", "s"), ("Ti", "s"), ("TiO2", "s")]
+    assert missing[0][2][0] == "ZnO(s)"
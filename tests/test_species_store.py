@@ -0,0 +1,88 @@
+import os
+
+import pandas as pd
+
+from data_process_file.data_processor_module import parse_database_chemical_speacies
+from data_process_file.species_ingest import ValidationReport
+from data_process_file.species_repository import SpeciesIndex
+from data_process_file.species_store import (
+    GENERATION_PREFIX,
+    MANIFEST_NAME,
+    SpeciesStore,
+    StoreSpeciesIndex,
+    compile_species_store,
+)
+from tests.species_rows import OXIDE_ROWS, species_row
+
+
+def test_overwriting_a_store_replaces_its_manifest(tmp_path, write_database):
+    store_path = str(tmp_path / "species.smkdb")
+    compile_species_store(write_database(), store_path)
+
+    rows = compile_species_store(write_database(OXIDE_ROWS[:3], "few.json"), store_path)
+
+    assert rows == 3
+    assert SpeciesStore(store_path).rows == 3
+    assert [name for name in os.listdir(store_path) if name.startswith(MANIFEST_NAME)] == [MANIFEST_NAME]
+
+
+def test_open_store_keeps_its_generation_across_a_recompile(tmp_path, write_database):
+    store_path = str(tmp_path / "species.smkdb")
+    compile_species_store(write_database(), store_path)
+    old_store = SpeciesStore(store_path)
+    old_index = StoreSpeciesIndex(old_store)
+
+    compile_species_store(write_database([species_row("Zn", "s", 1.0, 2.0)], "zinc.json"), store_path)
+
+    # The old view still pairs its own string table with its own columns
+    assert old_store.rows == len(OXIDE_ROWS)
+    assert old_index.lookup("Al2O3", "s").h298 == -400.5
+    assert old_store.to_dataframe()["Formula"].tolist() == [row["Formula"] for row in OXIDE_ROWS]
+    new_index = StoreSpeciesIndex(SpeciesStore(store_path))
+    assert len(new_index) == 1 and new_index.lookup("Zn", "s").h298 == 1.0
+    assert len([name for name in os.listdir(store_path) if name.startswith(GENERATION_PREFIX)]) == 1
+
+
+def test_streamed_store_matches_the_in_memory_index(tmp_path, write_database):
+    rows = OXIDE_ROWS + [
+        species_row("Al(g)", "g", 78.8, 39.3),
+        species_row("Al", "g", 1.0, 1.0),
+        species_row("Fe", "s", 0.0, 6.52, 5.0, 1.0, t1=1000),
+        species_row("Fe", "s", 9.0, 9.0, t1=1000),
+    ] + OXIDE_ROWS[:2]
+    path = write_database(rows)
+    index = SpeciesIndex.from_dataframe(parse_database_chemical_speacies(path, ValidationReport()))
+
+    store_path = str(tmp_path / "species.smkdb")
+    assert compile_species_store(path, store_path, chunk_size=3) == len(rows) - 2
+    store_index = StoreSpeciesIndex(SpeciesStore(store_path))
+
+    assert sorted(store_index.keys()) == sorted(index.keys())
+    for formula, phase in index.keys():
+        assert store_index.lookup(formula, phase) == index.lookup(formula, phase)
+    assert store_index.lookup("Al", "g").h298 == 78.8
+    assert [segment.t1 for segment in store_index.lookup("Fe", "s").segments] == [298, 1000]
+
+
+def test_parsing_without_a_report_does_not_print(capsys, caplog, write_database):
+    path = write_database(OXIDE_ROWS + OXIDE_ROWS[:1])
+
+    data = parse_database_chemical_speacies(path)
+
+    assert len(data) == len(OXIDE_ROWS)
+    assert capsys.readouterr().out == ""
+    assert "1 duplicate_row" in caplog.text
+
+
+def test_store_round_trips_the_parsed_rows(tmp_path, write_database):
+    path = write_database()
+    store_path = str(tmp_path / "species.smkdb")
+    compile_species_store(path, store_path)
+
+    parsed = parse_database_chemical_speacies(path, ValidationReport())
+    stored = SpeciesStore(store_path).to_dataframe()
+
+    pd.testing.assert_frame_equal(stored, parsed[stored.columns].reset_index(drop=True), check_dtype=False)
+    pd.testing.assert_frame_equal(
+        SpeciesStore(store_path).to_dataframe([2, 0]), stored.iloc[[2, 0]].reset_index(drop=True)
+    )
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(*args):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, timeout=120)
+
+
+def test_importing_the_window_loads_no_heavy_module():
+    result = run_python("-c", "import sys, main; print(','.join(m for m in main.HEAVY_MODULES if m in sys.modules))")
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+@pytest.mark.skipif(not os.environ.get("DISPLAY"), reason="needs a display to open the window")
+def test_first_window_loads_no_heavy_module():
+    result = run_python("main.py", "--startup-budget", "60000")
+
+    assert "Heavy modules loaded before the window: none" in result.stdout
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from data_process_file.data_processor_module import parse_thermodata_workbook
+from data_process_file.species_ingest import ValidationReport
+
+WORKBOOK_COLUMNS = ["Name", "Formula", "State", "Mol Mass", "H°298", "S°298", "a", "b", "C mean", "Temperature Range"]
+
+# Rows as Thermodata.xlsx has them
+WORKBOOK_ROWS = [
+    ["Aluminium", "Al", "sol", 27.0, None, 28.3, 33.0, -20.7, 28.5, "298 - 933"],
+    [None, "Al", "liq", None, 10711.0, 11.5, 31.7, None, None, "933 - 2790"],
+    ["Zinc", "Zn", "sol", 65.4, None, 41.6, 22.2, 10.5, 27.1, "298 - 693"],
+    [None, "Zn", "liq", None, 7322.0, 10.6, 31.4, None, None, "693 - 1180"],
+    [None, "Zn", "gas", None, 130415.0, 161.0, 20.8, None, None, "1180 - 2000"],
+    ["Heat of Fusion", "H2O", "sol", None, 5980.0, None, None, None, None, "273 -5000"],
+    ["Water", "H2O", "liq", 18.0, -285830.0, 69.9, 59.7, 23.0, 75.5, "298 - 373"],
+]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = str(tmp_path / "Thermodata.xlsx")
+    pd.DataFrame(WORKBOOK_ROWS, columns=WORKBOOK_COLUMNS).to_excel(path, index=False)
+    return path
+
+
+def values(data, formula, phase):
+    row = data[(data["Formula"] == formula) & (data["Phase"] == phase)].iloc[0]
+    return row["H 298 (kcal/mol)"], row["S 298 (cal/mol*K)"]
+
+
+def test_liquid_rows_add_the_fusion_values_to_the_solid(workbook):
+    data = parse_thermodata_workbook(workbook, ValidationReport())
+
+    assert values(data, "Al", "s") == pytest.approx((0.0, 28.3 / 4.184))
+    assert values(data, "Al", "l") == pytest.approx((10711 / 4184, (28.3 + 11.5) / 4.184))
+    assert values(data, "Zn", "l") == pytest.approx((7322 / 4184, (41.6 + 10.6) / 4.184))
+
+
+def test_gas_and_standalone_rows_keep_their_values(workbook):
+    data = parse_thermodata_workbook(workbook, ValidationReport())
+
+    assert values(data, "Zn", "g") == pytest.approx((130415 / 4184, 161.0 / 4.184))
+    assert values(data, "H2O", "l") == pytest.approx((-285830 / 4184, 69.9 / 4.184))